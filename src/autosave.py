@@ -0,0 +1,124 @@
+# src/autosave.py
+"""
+Background autosave.
+
+`request()` takes a cheap snapshot on the game thread (shallow copies of the
+player's containers, since entry dicts are never mutated after they are added;
+flags are copied deeply because they nest mutable dicts) and
+returns immediately. A single writer thread serializes the newest snapshot and
+writes it with `atomic_write`, so a crash mid-save leaves the previous file
+intact. Requests that arrive while a write is in progress, or within
+`min_interval` of the last write, are coalesced: only the latest state is
+written. `flush()` / `close()` block until everything requested is on disk.
+"""
+import copy
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from . import metrics
+from .fileio import atomic_write
+from .seed import to_record
+
+AUTOSAVE_NAME = "autosave.json"
+
+
+def snapshot_player(player) -> Dict:
+    """Save-shaped copy of the player that later mutations cannot reach."""
+    flags = getattr(player, 'flags', {}) or {}
+    return {
+        'name': getattr(player, 'name', 'Player'),
+        'inventory': [to_record(s) for s in getattr(player, 'inventory', [])],
+        'chronicle': [to_record(e) for e in getattr(player.chronicle, 'entries', [])],
+        'relationships': dict(getattr(player, 'relationships', {}) or {}),
+        # nested containers too (relationship_flags is {npc: {flag: bool}}): the writer thread
+        # must never serialize a dict the game is still changing
+        'flags': copy.deepcopy(flags),
+        'saved_at': datetime.utcnow().isoformat(),
+    }
+
+
+class AutosaveService:
+    def __init__(self, path: str, min_interval: float = 0.5):
+        self.path = path
+        self.min_interval = min_interval
+        self.requests = 0           # snapshots handed in
+        self.writes = 0             # files actually written
+        self.last_error: Optional[Exception] = None
+        self._pending: Optional[Dict] = None
+        self._requested = 0         # sequence number of the newest request
+        self._written = 0           # sequence number of the newest snapshot on disk
+        self._cond = threading.Condition()
+        self._closed = False
+        self._flushers = 0          # callers blocked in flush(); skips the coalescing delay
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def request(self, player):
+        """Queue the player's current state; never blocks on I/O."""
+        self.request_snapshot(snapshot_player(player))
+
+    def request_snapshot(self, snapshot: Dict):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("autosave service is closed")
+            self._pending = snapshot
+            self.requests += 1
+            self._requested += 1
+            self._cond.notify_all()
+
+    def _run(self):
+        last = 0.0
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                # let a burst of requests settle, unless someone is waiting on flush/close
+                while not self._closed and not self._flushers:
+                    delay = last + self.min_interval - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                snapshot, self._pending = self._pending, None
+                seq = self._requested
+            try:
+                with metrics.timer("autosave.write"):
+                    atomic_write(self.path, json.dumps(snapshot, ensure_ascii=False, indent=2))
+                self.writes += 1
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"[Autosave] Failed to write {self.path}: {e}")
+            last = time.monotonic()
+            with self._cond:
+                self._written = seq
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every request so far has been written (or failed). False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._requested
+            self._flushers += 1
+            self._cond.notify_all()
+            try:
+                while self._written < target and self._thread.is_alive():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flushers -= 1
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Write any pending snapshot, then stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
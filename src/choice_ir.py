@@ -0,0 +1,219 @@
+# src/choice_ir.py
+"""
+Choice IR: both scene formats compiled into one instruction list per choice.
+
+  data/scenes.json       {"action": "pickup_seed" | "anchor_minigame" | "text", ...}
+  data/scenes/*.json     {"effects": {"add_seed", "relationship", "encounter_monster",
+                                      "memory_cost_preview"}}
+
+`compile_choice` runs once per choice when a scene is loaded: seed and monster
+ids are resolved against the content indexes, unknown references are reported
+as problems, and every step becomes an (handler, arg) pair with its argument
+already bound. `execute` then just calls the handlers in order, so applying a
+choice does no dict dispatch and both formats share one code path.
+
+    python -m src.choice_ir          # compile every scene, exit 1 on problems
+"""
+import argparse
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import metrics
+from .console import get_console
+
+Op = Tuple[Callable, object]
+Program = Tuple[Op, ...]
+
+
+class ExecContext:
+    """
+    Everything a choice may touch; managers are optional, as in Scene.apply_effects.
+    Handlers only read these attributes, so any object that has them (Game) works too.
+    """
+    __slots__ = ("player", "payoff_manager", "relationship_manager", "memory_manager", "console", "rng")
+
+    def __init__(self, player, payoff_manager=None, relationship_manager=None, memory_manager=None, console=None,
+                 rng=None):
+        self.player = player
+        self.payoff_manager = payoff_manager
+        self.relationship_manager = relationship_manager
+        self.memory_manager = memory_manager
+        self.console = console
+        self.rng = rng
+
+
+# ---------------- handlers: (ctx, arg) ----------------
+def _op_add_seed(ctx, seed):
+    ctx.player.add_seed(seed)
+    if ctx.payoff_manager:
+        ctx.payoff_manager.check_and_trigger(ctx.player)
+
+
+def _op_say(ctx, text):
+    get_console(ctx.console).write(text)
+
+
+def _op_anchor(ctx, minigame):
+    if ctx.rng is not None:
+        minigame(ctx.player, console=ctx.console, rng=ctx.rng)
+    else:
+        minigame(ctx.player, console=ctx.console)
+
+
+def _op_relationship(ctx, deltas):
+    rm = ctx.relationship_manager
+    if not rm:
+        return
+    rels = ctx.player.relationships
+    if hasattr(rm, 'apply_deltas'):
+        # one batch: thresholds checked once per NPC, one summary line
+        rm.apply_deltas(deltas)
+    else:
+        for name, delta in deltas:
+            rm.change_affinity(name, delta)
+    # also persist to player.relationships for compatibility
+    for name, _ in deltas:
+        rels[name] = rm.affinities.get(name, 0)
+
+
+def _op_encounter(ctx, arg):
+    from .monster import Monster
+    mdata, drop_seeds = arg
+    for d in Monster(mdata, rng=ctx.rng).fight(ctx.player, console=ctx.console):
+        seed = drop_seeds.get(d)
+        if seed:
+            _op_add_seed(ctx, seed)
+
+
+def _op_memory_preview(ctx, _):
+    if ctx.memory_manager:
+        ctx.memory_manager.preview_removable()
+
+
+# ops that read player input (mini-game answers, combat commands)
+INTERACTIVE_OPS = frozenset((_op_anchor, _op_encounter))
+
+
+# ---------------- compiler ----------------
+def compile_effects(effects: Dict, seeds_index: Dict, monsters_index: Dict,
+                    problems: List[str], where: str = "") -> List[Op]:
+    """Ops for a declarative effects dict, in the order Scene.apply_effects applied them."""
+    ops: List[Op] = []
+    if not effects:
+        return ops
+    sid = effects.get("add_seed")
+    if sid:
+        seed = seeds_index.get(sid)
+        if seed:
+            ops.append((_op_add_seed, seed))
+        else:
+            problems.append(f"{where}: unknown seed {sid}")
+    rel = effects.get("relationship")
+    if rel:
+        ops.append((_op_relationship, tuple(rel.items())))
+    mid = effects.get("encounter_monster")
+    if mid:
+        mdata = monsters_index.get(mid) if monsters_index else None
+        if mdata:
+            drops = {}
+            for d in mdata.get("drops", []) or []:
+                if d in seeds_index:
+                    drops[d] = seeds_index[d]
+                else:
+                    problems.append(f"{where}: monster {mid} drops unknown seed {d}")
+            ops.append((_op_encounter, (mdata, drops)))
+        else:
+            problems.append(f"{where}: unknown monster {mid}")
+    if effects.get("memory_cost_preview"):
+        ops.append((_op_memory_preview, None))
+    return ops
+
+
+def compile_choice(choice: Dict, seeds_index: Dict, monsters_index: Optional[Dict] = None,
+                   anchor: Optional[Callable] = None, where: str = "") -> Tuple[Program, List[str]]:
+    """Compile one choice of either format. Returns (ops, problems)."""
+    problems: List[str] = []
+    ops: List[Op] = []
+    action = choice.get("action")
+    if action == "pickup_seed":
+        seed = seeds_index.get(choice.get("seed_id"))
+        if seed:
+            ops.append((_op_add_seed, seed))
+        else:
+            problems.append(f"{where}: unknown seed {choice.get('seed_id')}")
+            ops.append((_op_say, "[Scene] No such seed."))
+    elif action == "anchor_minigame":
+        if anchor is None:
+            problems.append(f"{where}: anchor_minigame needs a Scene")
+        else:
+            ops.append((_op_anchor, anchor))
+    elif action == "text":
+        ops.append((_op_say, "\n" + choice.get("text", "(no text)")))
+    elif action is not None:
+        problems.append(f"{where}: unhandled action {action}")
+        ops.append((_op_say, f"\n[Scene] Unhandled action: {action}"))
+    ops.extend(compile_effects(choice.get("effects") or {}, seeds_index, monsters_index or {}, problems, where))
+    return tuple(ops), problems
+
+
+def compile_scene(scene_data: Dict, seeds_index: Dict, monsters_index: Optional[Dict] = None,
+                  anchor: Optional[Callable] = None) -> Tuple[List[Program], List[str]]:
+    """One program per choice, in choice order, plus every problem found."""
+    programs, problems = [], []
+    sid = scene_data.get("id", "?")
+    for idx, choice in enumerate(scene_data.get("choices", []) or []):
+        ops, probs = compile_choice(choice, seeds_index, monsters_index, anchor, where=f"{sid}#{idx + 1}")
+        programs.append(ops)
+        problems.extend(probs)
+    return programs, problems
+
+
+def execute(program: Program, ctx: ExecContext, timer: Optional[str] = None):
+    """
+    Run a program. With `timer` (and metrics enabled) the time spent in its ops is
+    recorded as one sample, leaving out ops that wait on the player (see INTERACTIVE_OPS).
+    """
+    if timer is None or not metrics.enabled():
+        for handler, arg in program:
+            handler(ctx, arg)
+        return
+    spent = 0.0
+    for handler, arg in program:
+        if handler in INTERACTIVE_OPS:
+            handler(ctx, arg)
+            continue
+        started = time.perf_counter()
+        handler(ctx, arg)
+        spent += time.perf_counter() - started
+    metrics.observe(timer, spent)
+
+
+def main(argv=None):
+    import json
+    from .content import load_content, index_by
+    parser = argparse.ArgumentParser(description="Compile every scene's choices and report bad references.")
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(__file__), "..", "data"))
+    args = parser.parse_args(argv)
+    data_dir = os.path.normpath(args.data)
+    content = load_content(data_dir)
+    seeds = index_by(content["files"].get("seeds.json"))
+    monsters = index_by(content["files"].get("monsters.json"))
+    scenes = [s for s in content["files"].get("scenes.json") or [] if isinstance(s, dict)]
+    for meta in content["scene_manifest"].values():
+        with open(os.path.join(data_dir, meta["path"]), "r", encoding="utf-8") as f:
+            scenes.append(json.load(f))
+    count, problems = 0, []
+    for data in scenes:
+        # legacy minigames bind to a Scene at load; any callable validates here
+        programs, probs = compile_scene(data, seeds, monsters, anchor=lambda player, console=None: None)
+        count += sum(len(p) for p in programs)
+        problems.extend(probs)
+    for p in problems:
+        print(f"[ChoiceIR] ERROR {p}")
+    print(f"[ChoiceIR] {len(scenes)} scene(s), {count} op(s), {len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,19 @@
 # src/chronicle.py
-from typing import List, Dict
+from .containers import IdList
+from .seed import ChronicleEntry, Seed
 
 class Chronicle:
     """Stores mirrored lore entries (seeds that matter)."""
+    __slots__ = ("entries",)
+
     def __init__(self):
-        self.entries: List[Dict] = []
+        self.entries = IdList()     # ordered {"id", "desc"} entries, O(1) lookup by id
 
     def add_entry(self, seed):
-        # seed is a dict-like with id and desc
-        existing = any(e['id'] == seed['id'] for e in self.entries)
-        if not existing:
-            self.entries.append({"id": seed['id'], "desc": seed.get('desc', '')})
+        # seed is a dict-like with id and desc; table seeds share one entry object
+        if seed['id'] not in self.entries:
+            entry = seed.entry if isinstance(seed, Seed) else ChronicleEntry(seed['id'], seed.get('desc', ''))
+            self.entries.add(entry)
             print(f"\n[Chronicle] Mirrored seed {seed['id']}: added to Chronicle.")
         else:
             print(f"\n[Chronicle] {seed['id']} already in Chronicle.")
@@ -0,0 +1,229 @@
+# src/combat_sim.py
+"""
+Batch Monte Carlo combat simulator for balancing monsters.json.
+
+Plays `Monster.fight` without a console: every round the player attacks with
+probability `attack` and otherwise tries to flee, using the Monster class's
+own rules (PLAYER_DAMAGE, ENEMY_DAMAGE, FLEE_CHANCE, all drops on a kill).
+With NumPy installed, fights are simulated in vectorized batches; otherwise a
+pure-Python loop gives the same distributions, just slower.
+
+    python -m src.combat_sim --fights 1000000 --attack 1.0 --attack 0.7
+    python -m src.combat_sim --monster M_Wisps --no-numpy --json wisps.json
+"""
+import argparse
+import json
+import os
+import random
+from collections import Counter
+from typing import Dict, List, Optional
+
+from .content import load_content, index_by
+from .monster import Monster
+from .rng import SessionRNG
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+WIN, FLED, TIMEOUT = 0, 1, 2
+
+
+def _dist(hist: Dict[int, int]) -> Dict:
+    """mean / percentiles / max of a {value: count} histogram."""
+    total = sum(hist.values())
+    if not total:
+        return {"n": 0}
+    values = sorted(hist)
+    marks = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+    out = {"n": total, "mean": sum(v * c for v, c in hist.items()) / total, "min": values[0], "max": values[-1]}
+    seen, pending = 0, sorted(marks.items(), key=lambda kv: kv[1])
+    for v in values:
+        seen += hist[v]
+        while pending and seen >= pending[0][1] * total:
+            out[pending.pop(0)[0]] = v
+    return out
+
+
+class CombatResult:
+    """Aggregated outcome of many fights against one monster under one policy."""
+    def __init__(self, monster: Dict, attack: float):
+        self.monster = monster
+        self.attack = attack
+        self.fights = 0
+        self.outcomes = Counter()        # WIN / FLED / TIMEOUT -> fights
+        self.flee_attempts = 0
+        self.rounds = Counter()          # rounds per fight
+        self.turns_to_kill = Counter()   # player attacks in fights that were won
+        self.damage_taken = Counter()    # enemy damage per fight
+
+    def merge_hist(self, name: str, hist: Dict[int, int]):
+        getattr(self, name).update(hist)
+
+    def report(self) -> Dict:
+        n = self.fights or 1
+        wins = self.outcomes[WIN]
+        fled = self.outcomes[FLED]
+        return {
+            "monster": self.monster.get("id"),
+            "hp": self.monster.get("hp", 30),
+            "attack": self.attack,
+            "fights": self.fights,
+            "win_rate": wins / n,
+            "flee_rate": fled / n,
+            "timeout_rate": self.outcomes[TIMEOUT] / n,
+            "flee_success": fled / self.flee_attempts if self.flee_attempts else None,
+            "drop_rates": {d: wins / n for d in self.monster.get("drops", []) or []},
+            "rounds": _dist(self.rounds),
+            "turns_to_kill": _dist(self.turns_to_kill),
+            "damage_taken": _dist(self.damage_taken),
+        }
+
+
+def simulate_python(monster: Dict, fights: int, attack: float, seed: Optional[int] = None,
+                    max_rounds: int = 1000, result: Optional[CombatResult] = None) -> CombatResult:
+    rng = random.Random(seed)
+    rand, randint = rng.random, rng.randint
+    p_lo, p_hi = Monster.PLAYER_DAMAGE
+    e_lo, e_hi = Monster.ENEMY_DAMAGE
+    flee_chance = Monster.FLEE_CHANCE
+    max_hp = monster.get("hp", 30)
+    res = result or CombatResult(monster, attack)
+    outcomes, rounds_h, kill_h, dmg_h = res.outcomes, res.rounds, res.turns_to_kill, res.damage_taken
+    flee_attempts = 0
+    for _ in range(fights):
+        hp, rounds, attacks, taken, outcome = max_hp, 0, 0, 0, TIMEOUT
+        while rounds < max_rounds:
+            rounds += 1
+            if rand() < attack:
+                attacks += 1
+                hp -= randint(p_lo, p_hi)
+                if hp <= 0:
+                    outcome = WIN
+                    break
+            else:
+                flee_attempts += 1
+                if rand() < flee_chance:
+                    outcome = FLED
+                    break
+            taken += randint(e_lo, e_hi)
+        outcomes[outcome] += 1
+        rounds_h[rounds] += 1
+        dmg_h[taken] += 1
+        if outcome == WIN:
+            kill_h[attacks] += 1
+    res.fights += fights
+    res.flee_attempts += flee_attempts
+    return res
+
+
+def simulate_numpy(monster: Dict, fights: int, attack: float, seed: Optional[int] = None,
+                   max_rounds: int = 1000, batch: int = 1_000_000,
+                   result: Optional[CombatResult] = None) -> CombatResult:
+    rng = np.random.default_rng(seed)
+    p_lo, p_hi = Monster.PLAYER_DAMAGE
+    e_lo, e_hi = Monster.ENEMY_DAMAGE
+    max_hp = monster.get("hp", 30)
+    res = result or CombatResult(monster, attack)
+    done = 0
+    while done < fights:
+        n = min(batch, fights - done)
+        hp = np.full(n, max_hp, dtype=np.int64)
+        rounds = np.zeros(n, dtype=np.int64)
+        attacks = np.zeros(n, dtype=np.int64)
+        taken = np.zeros(n, dtype=np.int64)
+        outcome = np.full(n, TIMEOUT, dtype=np.int8)
+        live = np.arange(n)
+        flee_attempts = 0
+        for _ in range(max_rounds):
+            if live.size == 0:
+                break
+            rounds[live] += 1
+            attacking = rng.random(live.size) < attack
+            hitters = live[attacking]
+            attacks[hitters] += 1
+            hp[hitters] -= rng.integers(p_lo, p_hi + 1, size=hitters.size)
+            killed = hp[hitters] <= 0
+            outcome[hitters[killed]] = WIN
+            runners = live[~attacking]
+            flee_attempts += runners.size
+            escaped = rng.random(runners.size) < Monster.FLEE_CHANCE
+            outcome[runners[escaped]] = FLED
+            # everyone still in the fight takes the enemy's swing
+            hit = np.concatenate((hitters[~killed], runners[~escaped]))
+            taken[hit] += rng.integers(e_lo, e_hi + 1, size=hit.size)
+            live = np.sort(hit)
+        res.merge_hist("outcomes", {k: int(v) for k, v in enumerate(np.bincount(outcome, minlength=3))})
+        for name, values in (("rounds", rounds), ("damage_taken", taken), ("turns_to_kill", attacks[outcome == WIN])):
+            counts = np.bincount(values)
+            nz = np.nonzero(counts)[0]
+            res.merge_hist(name, dict(zip(nz.tolist(), counts[nz].tolist())))
+        res.fights += n
+        res.flee_attempts += flee_attempts
+        done += n
+    return res
+
+
+def simulate(monster: Dict, fights: int, attack: float = 1.0, seed: Optional[int] = None,
+             max_rounds: int = 1000, use_numpy: bool = True) -> CombatResult:
+    """Simulate `fights` encounters with `monster` (a monsters.json entry)."""
+    if not 0.0 <= attack <= 1.0:
+        raise ValueError("attack probability must be within [0, 1]")
+    if use_numpy and np is not None:
+        return simulate_numpy(monster, fights, attack, seed, max_rounds)
+    return simulate_python(monster, fights, attack, seed, max_rounds)
+
+
+def _fmt(d: Dict) -> str:
+    if not d.get("n"):
+        return "-"
+    return f"{d['mean']:.2f} (p50 {d['p50']}, p90 {d['p90']}, max {d['max']})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo combat balance for monsters.json.")
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(__file__), "..", "data"))
+    parser.add_argument("--monster", action="append", help="monster id (default: all)")
+    parser.add_argument("--fights", type=int, default=100_000)
+    parser.add_argument("--attack", type=float, action="append",
+                        help="probability of attacking each round (else flee); repeatable, default 1.0")
+    parser.add_argument("--max-rounds", type=int, default=1000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no-numpy", action="store_true", help="force the pure-Python engine")
+    parser.add_argument("--json", dest="json_out", help="write the full report to this file")
+    args = parser.parse_args(argv)
+
+    monsters = index_by(load_content(os.path.normpath(args.data))["files"].get("monsters.json"), "id")
+    wanted = args.monster or sorted(monsters)
+    missing = [m for m in wanted if m not in monsters]
+    if missing:
+        parser.error(f"unknown monster(s): {', '.join(missing)}")
+    engine = "python" if args.no_numpy or np is None else "numpy"
+    master = SessionRNG(args.seed)
+    print(f"[CombatSim] {args.fights} fight(s) per monster/policy, {engine} engine, seed {master.seed_value}")
+    reports: List[Dict] = []
+    for mid in wanted:
+        for attack in args.attack or [1.0]:
+            # one child stream per (monster, policy): adding a monster does not shift the others
+            seed = master.spawn(mid, attack).getrandbits(64)
+            rep = simulate(monsters[mid], args.fights, attack, seed, args.max_rounds,
+                           use_numpy=engine == "numpy").report()
+            reports.append(rep)
+            print(f"\n{mid} (HP {rep['hp']}), attack {attack:.2f}:")
+            print(f"  win {rep['win_rate']:.3%}  fled {rep['flee_rate']:.3%}  timeout {rep['timeout_rate']:.3%}"
+                  + (f"  flee success/attempt {rep['flee_success']:.3%}" if rep['flee_success'] is not None else ""))
+            print(f"  rounds        {_fmt(rep['rounds'])}")
+            print(f"  turns to kill {_fmt(rep['turns_to_kill'])}")
+            print(f"  damage taken  {_fmt(rep['damage_taken'])}")
+            for drop, rate in rep["drop_rates"].items():
+                print(f"  drop {drop}: {rate:.3%}")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"engine": engine, "fights": args.fights, "seed": master.seed_value,
+                       "reports": reports}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+# src/console.py
+"""
+Console I/O backends used by the game loop, scenes and combat.
+
+`Console` is the interactive terminal (real input(), screen clears and toast
+pauses); its output is buffered by a `TerminalRenderer` and written once per
+frame. `HeadlessConsole` reads from a scripted input source and
+writes to an optional sink with every delay and clear disabled, so automated
+runs are bounded by game logic rather than sleeping.
+"""
+import contextlib
+import io
+import time
+from typing import Iterable, List, Optional, TextIO
+
+from .renderer import TerminalRenderer
+
+
+class Console:
+    """Interactive terminal console."""
+    headless = False
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.renderer = TerminalRenderer(stream)
+
+    def read(self, prompt: str = "") -> str:
+        # the prompt rides along with the pending frame: one write per screen
+        self.renderer.write(prompt)
+        self.renderer.flush()
+        line = input()
+        self.renderer.input_echoed()
+        return line
+
+    def write(self, *parts, sep: str = " ", end: str = "\n"):
+        self.renderer.write(sep.join(str(p) for p in parts) + end)
+
+    def clear(self):
+        self.renderer.clear()
+
+    def header(self, lines: List[str]):
+        """Fresh screen topped by `lines`; unchanged header lines are not redrawn."""
+        self.renderer.header(lines)
+
+    def flush(self):
+        self.renderer.flush()
+
+    def pause(self, seconds: float):
+        self.renderer.flush()
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def clock(self) -> float:
+        return time.monotonic()
+
+    def capture(self):
+        """Context in which stray print() calls (managers, models) reach this console."""
+        return self.renderer.capture()
+
+
+class HeadlessConsole(Console):
+    """
+    Scripted console for automated runs.
+    inputs: any iterable of lines (list, generator, open file).
+    sink:   file-like object receiving all output, or None to discard it.
+    Raises EOFError once the scripted input is exhausted, like input() at EOF.
+    """
+    headless = True
+
+    def __init__(self, inputs: Iterable[str] = (), sink: Optional[TextIO] = None):
+        self._inputs = iter(inputs)
+        self.sink = sink
+        self.consumed = 0
+
+    @classmethod
+    def from_file(cls, path: str, sink: Optional[TextIO] = None) -> "HeadlessConsole":
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        return cls(lines, sink=sink)
+
+    def read(self, prompt: str = "") -> str:
+        if prompt and self.sink is not None:
+            self.sink.write(prompt)
+        try:
+            line = next(self._inputs)
+        except StopIteration:
+            raise EOFError("scripted input exhausted")
+        self.consumed += 1
+        line = str(line).rstrip("\r\n")
+        if self.sink is not None:
+            self.sink.write(line + "\n")
+            if hasattr(self.sink, 'flush'):
+                self.sink.flush()
+        return line
+
+    def write(self, *parts, sep: str = " ", end: str = "\n"):
+        if self.sink is not None:
+            self.sink.write(sep.join(str(p) for p in parts) + end)
+
+    def clear(self):
+        pass
+
+    def header(self, lines: List[str]):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self.sink is not None and hasattr(self.sink, 'flush'):
+            self.sink.flush()
+
+    def pause(self, seconds: float):
+        pass
+
+    def clock(self) -> float:
+        # virtual clock: headless answers are instantaneous and reproducible
+        return 0.0
+
+    def capture(self):
+        return contextlib.redirect_stdout(self.sink if self.sink is not None else _NullWriter())
+
+
+class _NullWriter(io.TextIOBase):
+    def write(self, s):
+        return len(s)
+
+
+# Process-wide default used when callers do not pass a console explicitly.
+DEFAULT_CONSOLE = Console()
+
+
+def get_console(console: Optional[Console] = None) -> Console:
+    return console if console is not None else DEFAULT_CONSOLE
@@ -0,0 +1,133 @@
+# src/containers.py
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class IdList:
+    """
+    Ordered collection of id-keyed items (seed dicts, Chronicle entries).
+
+    Iterates in insertion order like the plain lists it replaces, so display and
+    saves are unchanged, but contains/add/get/remove are O(1) and bulk removal
+    is O(k). Adding an id that is already present is a no-op.
+
+    Watchers (callables taking ("+" | "-", item)) are told about every add and
+    removal; the journaled save uses them to record changes as they happen.
+    """
+    __slots__ = ("_items", "generation", "watchers")
+
+    def __init__(self, items: Iterable[Dict] = ()):
+        self._items: Dict[str, Dict] = {}
+        self.generation = 0     # bumped on every removal; plain appends leave it alone
+        self.watchers: List = []
+        for item in items:
+            self.add(item)
+
+    @staticmethod
+    def _key(item) -> Optional[str]:
+        return item.get('id') if hasattr(item, 'get') else item
+
+    # ---- list-like read access ----
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._items.values())
+
+    def __reversed__(self) -> Iterator[Dict]:
+        return reversed(self._items.values())
+
+    def __contains__(self, item) -> bool:
+        return self._key(item) in self._items
+
+    def __getitem__(self, index):
+        # positional access is O(n); prefer get()/newest() on hot paths
+        return list(self._items.values())[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, IdList):
+            return list(self._items.values()) == list(other._items.values())
+        if isinstance(other, list):
+            return list(self._items.values()) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IdList({list(self._items.values())!r})"
+
+    def get(self, item_id: str, default=None):
+        return self._items.get(item_id, default)
+
+    def ids(self):
+        """Live, set-like view of the ids (O(1) membership, supports & | -)."""
+        return self._items.keys()
+
+    def newest(self, n: int) -> List[Dict]:
+        """The last n items added, oldest first. O(n) regardless of total size."""
+        if n <= 0:
+            return []
+        tail = list(islice(reversed(self._items.values()), n))
+        tail.reverse()
+        return tail
+
+    def to_list(self) -> List[Dict]:
+        return list(self._items.values())
+
+    # ---- mutation ----
+    def add(self, item: Dict) -> bool:
+        key = self._key(item)
+        if key in self._items:
+            return False
+        self._items[key] = item
+        for w in self.watchers:
+            w("+", item)
+        return True
+
+    # list compatibility for callers that still append
+    append = add
+
+    def extend(self, items: Iterable[Dict]):
+        for item in items:
+            self.add(item)
+
+    def remove(self, item_id: str):
+        """Remove by id; returns the removed item or None."""
+        item = self._items.pop(self._key(item_id), None)
+        if item is not None:
+            self.generation += 1
+            for w in self.watchers:
+                w("-", item)
+        return item
+
+    def remove_many(self, item_ids: Iterable[str]) -> List[Dict]:
+        """Remove every listed id that is present; returns the removed items."""
+        removed = []
+        pop = self._items.pop
+        for item_id in item_ids:
+            item = pop(item_id, None)
+            if item is not None:
+                removed.append(item)
+        if removed:
+            self.generation += 1
+            for w in self.watchers:
+                for item in removed:
+                    w("-", item)
+        return removed
+
+    def clear(self):
+        if self._items:
+            removed = list(self._items.values()) if self.watchers else ()
+            self._items.clear()
+            self.generation += 1
+            for w in self.watchers:
+                for item in removed:
+                    w("-", item)
+
+
+def id_set(items):
+    """Set-like view of the ids in an IdList or a plain list of id-keyed dicts."""
+    if isinstance(items, IdList):
+        return items.ids()
+    return {e['id'] for e in items}
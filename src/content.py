@@ -0,0 +1,174 @@
+# src/content.py
+"""
+Content compiler: packs every JSON file under data/ into one versioned bundle.
+
+The bundle holds the parsed content plus a manifest of (mtime_ns, size) for
+each source file and a SHA-256 content hash. Scene files are not stored
+parsed: the bundle only keeps a scene manifest (id -> path, title, chapter,
+seed/monster refs) and `SceneIndex` (src/scene_loader.py) reads each scene
+on first use; the refs feed `ContentGraph` (src/content_graph.py). `load_content` reads it in a
+single read and rebuilds it transparently when any source file is added,
+removed or changed, so short-lived game processes skip JSON parsing.
+
+    python -m src.content            # (re)compile data/ and print a summary
+    python -m src.content --force
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+from typing import Dict, List, Optional, Tuple
+
+from . import metrics
+from .fileio import atomic_write
+
+BUNDLE_MAGIC = b"SHCB"
+BUNDLE_VERSION = 3
+BUNDLE_NAME = ".content.bundle"
+
+Ref = Tuple[int, str, str]      # (choice index, "seed" | "monster", target id)
+
+
+def scene_refs(scene_data: Dict) -> List[Ref]:
+    """Seed and monster references made by each choice of a scene (either scene format)."""
+    refs = []
+    for idx, choice in enumerate(scene_data.get("choices", []) or []):
+        if choice.get("action") == "pickup_seed" and choice.get("seed_id"):
+            refs.append((idx, "seed", choice["seed_id"]))
+        effects = choice.get("effects") or {}
+        if effects.get("add_seed"):
+            refs.append((idx, "seed", effects["add_seed"]))
+        if effects.get("encounter_monster"):
+            refs.append((idx, "monster", effects["encounter_monster"]))
+    return refs
+
+
+def source_files(data_dir: str) -> List[str]:
+    """Relative paths of every content file: data/*.json and data/scenes/*.json."""
+    rel = []
+    for sub in ("", "scenes"):
+        folder = os.path.join(data_dir, sub)
+        if not os.path.isdir(folder):
+            continue
+        for entry in os.scandir(folder):
+            if entry.is_file() and entry.name.endswith(".json"):
+                rel.append(f"{sub}/{entry.name}" if sub else entry.name)
+    return sorted(rel)
+
+
+def build_manifest(data_dir: str) -> Dict[str, tuple]:
+    manifest = {}
+    for rel in source_files(data_dir):
+        st = os.stat(os.path.join(data_dir, rel))
+        manifest[rel] = (st.st_mtime_ns, st.st_size)
+    return manifest
+
+
+@metrics.timed("content.compile")
+def compile_content(data_dir: str) -> Dict:
+    """
+    Parse every source file. Unparseable files are kept as None and reported in 'errors'.
+    Scene files only contribute a manifest entry keyed by their declared id (or file name).
+    """
+    manifest = build_manifest(data_dir)
+    digest = hashlib.sha256()
+    files, scenes, errors = {}, {}, {}
+    for rel in manifest:
+        with open(os.path.join(data_dir, rel), "rb") as f:
+            raw = f.read()
+        digest.update(rel.encode("utf-8") + b"\0" + raw + b"\0")
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except Exception as e:
+            data = None
+            errors[rel] = str(e)
+            print(f"[Content] Failed to parse {rel}: {e}")
+        if not rel.startswith("scenes/"):
+            files[rel] = data
+        elif isinstance(data, dict):
+            sid = data.get("id") or os.path.splitext(os.path.basename(rel))[0]
+            scenes[sid] = {"path": rel, "title": data.get("title", sid), "chapter": data.get("chapter"),
+                           "refs": scene_refs(data)}
+
+    return {
+        "version": BUNDLE_VERSION,
+        "manifest": manifest,
+        "hash": digest.hexdigest(),
+        "files": files,
+        "scene_manifest": scenes,
+        "errors": errors,
+    }
+
+
+def _read_bundle(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "rb") as f:
+            buf = f.read()
+    except OSError:
+        return None
+    head = len(BUNDLE_MAGIC) + 2
+    if buf[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+        return None
+    if int.from_bytes(buf[len(BUNDLE_MAGIC):head], "big") != BUNDLE_VERSION:
+        return None
+    try:
+        return pickle.loads(buf[head:])
+    except Exception:
+        return None
+
+
+def write_bundle(content: Dict, path: str):
+    """Write atomically so concurrent game processes never see a torn bundle."""
+    blob = BUNDLE_MAGIC + BUNDLE_VERSION.to_bytes(2, "big") + pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)
+    # the bundle is a cache that is rebuilt if lost, so skip the fsyncs
+    atomic_write(path, blob, durable=False)
+
+
+@metrics.timed("content.load")
+def load_content(data_dir: str, bundle_path: Optional[str] = None, rebuild: bool = False) -> Dict:
+    """
+    Return the compiled content for data_dir, using the bundle when it is current.
+    Falls back to compiling in memory if the bundle cannot be written.
+    """
+    bundle_path = bundle_path or os.path.join(data_dir, BUNDLE_NAME)
+    if not rebuild:
+        content = _read_bundle(bundle_path)
+        if content is not None and content.get("manifest") == build_manifest(data_dir):
+            return content
+    content = compile_content(data_dir)
+    try:
+        write_bundle(content, bundle_path)
+    except OSError as e:
+        print(f"[Content] Could not write bundle {bundle_path}: {e}")
+    return content
+
+
+def index_by(items, key_field: str = "id") -> Dict:
+    """Turn a content list into {key: item}; dict-shaped files are returned as-is."""
+    if isinstance(items, dict):
+        return items
+    idx = {}
+    for item in items or []:
+        key = item.get(key_field)
+        if key:
+            idx[key] = item
+    return idx
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile data/ into a content bundle.")
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(__file__), "..", "data"))
+    parser.add_argument("--out", help="bundle path (default: <data>/.content.bundle)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the bundle is current")
+    args = parser.parse_args(argv)
+    data_dir = os.path.normpath(args.data)
+    content = load_content(data_dir, args.out, rebuild=args.force)
+    print(f"[Content] {len(content['files'])} file(s), {len(content['scene_manifest'])} scene(s), hash {content['hash'][:16]}")
+    for rel, err in content["errors"].items():
+        print(f"[Content] ERROR {rel}: {err}")
+    return 1 if content["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+# src/content_graph.py
+"""
+Content graph: scene choices -> seeds / monsters -> drop seeds -> payoffs.
+
+Reachability is computed once when the graph is built, so the engine can ask
+in O(1) (per missing seed) whether a locked payoff is still attainable without
+replaying the game. Also usable as a content CI check:
+
+    python -m src.content_graph          # exit 1 on dangling refs / impossible canonical payoffs
+"""
+import argparse
+import os
+from collections import deque
+from typing import Dict, List, Set, Tuple
+
+from .content import Ref, load_content, index_by, scene_refs
+
+
+def mirrors_on_pickup(seed: Dict) -> bool:
+    # same rule as Player.add_seed
+    return bool(seed.get("mirror_on_pickup") or seed.get("essential_for_payoff"))
+
+
+class ContentGraph:
+    def __init__(self, seeds: Dict[str, Dict], monsters: Dict[str, Dict], payoffs: Dict[str, Dict],
+                 scenes: Dict[str, List[Ref]]):
+        self.seeds = seeds
+        self.monsters = monsters
+        self.payoffs = payoffs
+        self.scenes = scenes
+
+        # adjacency: node -> successors; nodes are ("scene"|"choice"|"monster"|"seed", id)
+        edges: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        root = ("root", "")
+        for sid, refs in scenes.items():
+            edges.setdefault(root, []).append(("scene", sid))
+            for idx, kind, target in refs:
+                choice = ("choice", f"{sid}#{idx}")
+                edges.setdefault(("scene", sid), []).append(choice)
+                edges.setdefault(choice, []).append((kind, target))
+        for mid, mdata in monsters.items():
+            for drop in mdata.get("drops", []) or []:
+                edges.setdefault(("monster", mid), []).append(("seed", drop))
+        self.edges = edges
+
+        # where each seed can come from (for hints)
+        self.seed_sources: Dict[str, List[str]] = {}
+        for sid, refs in scenes.items():
+            for idx, kind, target in refs:
+                if kind == "seed":
+                    self.seed_sources.setdefault(target, []).append(f"{sid}#{idx + 1}")
+                else:
+                    for drop in (monsters.get(target) or {}).get("drops", []) or []:
+                        self.seed_sources.setdefault(drop, []).append(f"{sid}#{idx + 1} ({target})")
+
+        # reachability from the main menu (every listed scene can be entered directly)
+        reached = {root}
+        queue = deque([root])
+        while queue:
+            for nxt in edges.get(queue.popleft(), ()):
+                if nxt not in reached:
+                    reached.add(nxt)
+                    queue.append(nxt)
+        self.reachable_monsters: Set[str] = {n for k, n in reached if k == "monster" and n in monsters}
+        self.obtainable: Set[str] = {n for k, n in reached if k == "seed" and n in seeds}
+        self.mirrorable: Set[str] = {sid for sid in self.obtainable if mirrors_on_pickup(seeds[sid])}
+
+        # payoff -> required seeds that can never reach the Chronicle through play
+        self.blocking: Dict[str, frozenset] = {}
+        for pid, pdata in payoffs.items():
+            self.blocking[pid] = frozenset(pdata.get("required_seeds", [])) - self.mirrorable
+        self.feasible: Dict[str, bool] = {pid: not b for pid, b in self.blocking.items()}
+
+    @classmethod
+    def from_content(cls, content: Dict, include_legacy: bool = False) -> "ContentGraph":
+        """
+        Build from a compiled content bundle. Game only serves data/scenes/, so the legacy
+        data/scenes.json list (action/seed_id format) is opt-in.
+        """
+        files = content["files"]
+        scenes = {sid: meta.get("refs", []) for sid, meta in content.get("scene_manifest", {}).items()}
+        if include_legacy:
+            for data in files.get("scenes.json") or []:
+                if isinstance(data, dict) and data.get("id") and data["id"] not in scenes:
+                    scenes[data["id"]] = scene_refs(data)
+        return cls(index_by(files.get("seeds.json"), "id"),
+                   index_by(files.get("monsters.json"), "id"),
+                   files.get("payoffs.json") or {},
+                   scenes)
+
+    # ---------------- runtime queries ----------------
+    def is_attainable(self, pid: str, chronicle_ids=()) -> bool:
+        """True if the payoff can still fire: every unobtainable requirement is already mirrored."""
+        blocking = self.blocking.get(pid)
+        if blocking is None:
+            return False
+        return not blocking or all(sid in chronicle_ids for sid in blocking)
+
+    def sources(self, seed_id: str) -> List[str]:
+        """Human-readable places a seed can be obtained ("scene#choice" or "scene#choice (monster)")."""
+        return list(self.seed_sources.get(seed_id, []))
+
+    # ---------------- build-time checks ----------------
+    def report(self) -> Dict:
+        dangling_seeds = sorted({t for refs in self.scenes.values() for _, k, t in refs
+                                 if k == "seed" and t not in self.seeds}
+                                | {d for m in self.monsters.values() for d in m.get("drops", []) or []
+                                   if d not in self.seeds})
+        dangling_monsters = sorted({t for refs in self.scenes.values() for _, k, t in refs
+                                    if k == "monster" and t not in self.monsters})
+        return {
+            "impossible_payoffs": {pid: sorted(b) for pid, b in self.blocking.items() if b},
+            "impossible_canonical": sorted(pid for pid, b in self.blocking.items()
+                                           if b and self.payoffs[pid].get("canonical")),
+            "unobtainable_seeds": sorted(set(self.seeds) - self.obtainable),
+            "unencountered_monsters": sorted(set(self.monsters) - self.reachable_monsters),
+            "dangling_seed_refs": dangling_seeds,
+            "dangling_monster_refs": dangling_monsters,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check content reachability (seeds -> payoffs).")
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(__file__), "..", "data"))
+    parser.add_argument("--include-legacy", action="store_true",
+                        help="also count choices in data/scenes.json (not served by Game)")
+    args = parser.parse_args(argv)
+    graph = ContentGraph.from_content(load_content(os.path.normpath(args.data)),
+                                      include_legacy=args.include_legacy)
+    rep = graph.report()
+    for pid, missing in rep["impossible_payoffs"].items():
+        tag = "ERROR" if pid in rep["impossible_canonical"] else "WARN"
+        print(f"[Graph] {tag} payoff {pid} can never fire: needs {', '.join(missing)}")
+    for key in ("unobtainable_seeds", "unencountered_monsters"):
+        if rep[key]:
+            print(f"[Graph] WARN {key.replace('_', ' ')}: {', '.join(rep[key])}")
+    for key in ("dangling_seed_refs", "dangling_monster_refs"):
+        if rep[key]:
+            print(f"[Graph] ERROR {key.replace('_', ' ')}: {', '.join(rep[key])}")
+    failed = rep["impossible_canonical"] or rep["dangling_seed_refs"] or rep["dangling_monster_refs"]
+    print("[Graph] FAIL" if failed else "[Graph] OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
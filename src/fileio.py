@@ -0,0 +1,42 @@
+# src/fileio.py
+import os
+import tempfile
+from typing import Union
+
+
+def _fsync_dir(folder: str):
+    """Make a rename durable; directories cannot be opened for fsync on every platform."""
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, data: Union[str, bytes], mode: int = 0o644, durable: bool = True):
+    """
+    Replace `path` with `data` so readers (and a crash) see either the old file or the
+    new one, never a torn write: temp file in the same folder, fsync, os.replace.
+    """
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix="." + os.path.basename(path) + "-", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data.encode("utf-8") if isinstance(data, str) else data)
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if durable:
+        _fsync_dir(folder)
@@ -0,0 +1,277 @@
+# src/forkserver.py
+"""
+Pre-forked session launcher (POSIX only).
+
+The parent process imports the engine, loads the content bundle and builds
+the shared seed table once, moves everything it allocated into the GC's
+permanent generation (`gc.freeze()`), then forks a pool of spare workers.
+Each spare is already warm: it blocks in accept() on the shared listening
+socket, plays one session with `Game(content=...)` over the connection and
+exits. Parsed content is shared copy-on-write; freezing keeps the collector
+from writing to (and so copying) those pages in every child. The parent only
+reaps workers and tops the idle pool back up to --spares.
+
+    python -m src.forkserver --port 4000 --spares 8
+    nc localhost 4000
+
+Use `python -m src.server` where fork() is unavailable (Windows).
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import selectors
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Dict, Optional, Set
+
+from .console import Console
+from .content import load_content
+from .renderer import HOME, CLEAR_SCREEN
+from .rng import SessionRNG
+from .seed import shared_seed_table
+from .server import NAME_PROMPT, clean_line, player_folder
+
+
+class _ConsoleWriter(io.TextIOBase):
+    def __init__(self, console: "SocketConsole"):
+        self.console = console
+
+    def write(self, s):
+        self.console.write(s, end="")
+        return len(s)
+
+
+class SocketConsole(Console):
+    """Blocking console over one client socket; output is sent once per screen."""
+
+    def __init__(self, conn: socket.socket, idle_timeout: float = 900.0, max_pause: float = 1.0):
+        self.conn = conn
+        conn.settimeout(idle_timeout)
+        self.rfile = conn.makefile("rb")
+        self.max_pause = max_pause
+        self._buf = []
+
+    def read(self, prompt: str = "") -> str:
+        self._buf.append(prompt)
+        self.flush()
+        try:
+            line = self.rfile.readline(4096)
+        except socket.timeout:
+            with contextlib.suppress(OSError):
+                self.conn.sendall(b"\r\n[Server] Idle timeout, goodbye.\r\n")
+            raise EOFError("idle timeout")
+        if not line:
+            raise EOFError("connection closed")
+        return clean_line(line)
+
+    def write(self, *parts, sep: str = " ", end: str = "\n"):
+        self._buf.append(sep.join(str(p) for p in parts) + end)
+
+    def clear(self):
+        self._buf.append(HOME + CLEAR_SCREEN)
+
+    def header(self, lines):
+        self.clear()
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self._buf:
+            data, self._buf = "".join(self._buf), []
+            # sendall blocks while the client is not reading: that is the backpressure
+            self.conn.sendall(data.replace("\n", "\r\n").encode("utf-8", "replace"))
+
+    def pause(self, seconds: float):
+        self.flush()
+        if seconds > 0:
+            time.sleep(min(seconds, self.max_pause))
+
+    def capture(self):
+        # one session per process, so plain stdout redirection is enough
+        return contextlib.redirect_stdout(_ConsoleWriter(self))
+
+
+class ForkServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 4000, spares: int = 4, max_workers: int = 256,
+                 idle_timeout: float = 900.0, saves_root: Optional[str] = None, data_dir: Optional[str] = None,
+                 autosave: bool = False, scene_cache_size: int = 32, max_pause: float = 1.0,
+                 seed: Optional[int] = None):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("fork() is not available on this platform; use python -m src.server")
+        root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+        self.host = host
+        self.port = port
+        self.spares = max(1, spares)
+        self.max_workers = max(self.spares, max_workers)
+        self.idle_timeout = idle_timeout
+        self.saves_root = saves_root or os.path.join(root, 'saves', 'sessions')
+        self.data_dir = data_dir or os.path.join(root, 'data')
+        self.autosave = autosave
+        self.scene_cache_size = scene_cache_size
+        self.max_pause = max_pause
+        self.rng = SessionRNG(seed)
+        self.content: Optional[Dict] = None
+        self.sock: Optional[socket.socket] = None
+        self.idle: Set[int] = set()
+        self.busy: Set[int] = set()
+        self.spawned = 0
+        self._status_r = self._status_w = None
+        self._stopping = False
+
+    def log(self, msg: str):
+        sys.stderr.write(f"[ForkServer] {msg}\n")
+        sys.stderr.flush()
+
+    # ---------------- parent ----------------
+    def warm(self):
+        """Everything a session needs that does not depend on the player, done once."""
+        gc.disable()
+        from . import game  # noqa: F401  (imports every engine module)
+        self.content = load_content(self.data_dir)
+        shared_seed_table(self.content)
+        gc.collect()
+        # objects from here on stay in the permanent generation: collections in the
+        # parent or any worker never write to (and so never copy) the shared pages
+        gc.freeze()
+        gc.enable()
+
+    def start(self):
+        self.warm()
+        self.sock = socket.create_server((self.host, self.port), backlog=512)
+        self.port = self.sock.getsockname()[1]
+        self._status_r, self._status_w = os.pipe()
+        os.set_blocking(self._status_r, False)
+        self.log(f"listening on {self.host}:{self.port} ({self.spares} warm spares, max {self.max_workers} "
+                 f"workers, content {self.content.get('hash', '')[:12]})")
+        self._replenish()
+
+    def serve_forever(self):
+        self.start()
+        sel = selectors.DefaultSelector()
+        sel.register(self._status_r, selectors.EVENT_READ)
+        try:
+            while not self._stopping:
+                for _ in sel.select(timeout=0.5):
+                    self._read_status()
+                self._reap()
+                self._replenish()
+        finally:
+            sel.close()
+            self.stop()
+
+    def stop(self):
+        self._stopping = True
+        # spares that already took a connection report it on the status pipe; never signal those
+        self._read_status()
+        for pid in list(self.idle):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self._reap()
+        if self.busy:
+            self.log(f"{len(self.busy)} session(s) still running; they exit on their own")
+
+    def _read_status(self):
+        try:
+            data = os.read(self._status_r, 65536)
+        except BlockingIOError:
+            return
+        for token in data.split():
+            pid = int(token)
+            self.idle.discard(pid)
+            self.busy.add(pid)
+
+    def _reap(self):
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.idle.discard(pid)
+            self.busy.discard(pid)
+
+    def _replenish(self):
+        while (not self._stopping and len(self.idle) < self.spares
+               and len(self.idle) + len(self.busy) < self.max_workers):
+            self.spawned += 1
+            serial = self.spawned
+            # a Ctrl-C landing in fork's at-fork hooks is swallowed there; hold it until fork returns
+            signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT})
+            try:
+                pid = os.fork()
+                if pid == 0:
+                    self._worker(serial)     # never returns
+                self.idle.add(pid)
+            finally:
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
+
+    # ---------------- worker ----------------
+    def _worker(self, serial: int):
+        status = 0
+        try:
+            # sessions outlive a Ctrl-C aimed at the parent; idle spares are stopped with SIGTERM
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.close(self._status_r)
+            conn, _ = self.sock.accept()
+            # a spare signalled before the parent read its status line must not kill a live session
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            os.write(self._status_w, f"{os.getpid()}\n".encode())
+            self.sock.close()
+            self._play(conn, serial)
+        except BaseException:
+            status = 1
+            # os._exit skips the usual exit handling, so report the failure here
+            with contextlib.suppress(Exception):
+                self.log(f"worker {os.getpid()} (session {serial}) failed:\n{traceback.format_exc().rstrip()}")
+        finally:
+            os._exit(status)
+
+    def _play(self, conn: socket.socket, serial: int):
+        from .game import Game
+        console = SocketConsole(conn, self.idle_timeout, self.max_pause)
+        try:
+            name = player_folder(console.read(NAME_PROMPT), serial)
+            game = Game(console=console, scene_cache_size=self.scene_cache_size, autosave=self.autosave,
+                        seed=self.rng.spawn("session", serial).getrandbits(64),
+                        saves_dir=os.path.join(self.saves_root, name), content=self.content)
+            game.run()
+        except (EOFError, OSError):
+            pass
+        finally:
+            with contextlib.suppress(OSError):
+                conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve sessions from a pool of pre-forked, pre-warmed workers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--spares", type=int, default=4, help="idle warm workers kept waiting for a connection")
+    parser.add_argument("--max-workers", type=int, default=256, help="cap on concurrent session processes")
+    parser.add_argument("--idle-timeout", type=float, default=900.0, help="seconds without input before disconnect")
+    parser.add_argument("--saves", help="root folder for per-player saves (default: saves/sessions)")
+    parser.add_argument("--autosave", action="store_true", help="autosave every session after each choice")
+    parser.add_argument("--seed", type=int, help="master seed; worker N plays with spawn('session', N)")
+    args = parser.parse_args(argv)
+    server = ForkServer(args.host, args.port, args.spares, args.max_workers, args.idle_timeout,
+                        saves_root=args.saves, autosave=args.autosave, seed=args.seed)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.log("stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
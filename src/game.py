@@ -7,15 +7,22 @@ Features:
  - Toast messages (console boxed notices)
  - Confirm prompts for destructive actions
  - Improved pagination and menus with shortcuts
- - Defensive fallbacks so it runs if some modules are missing
+ - Headless mode: injectable input source / output sink, no clears or toast delays
 
 Drop into stasis-hunters/src/game.py (overwrite) and run from project root:
     python -m src.game
+    python -m src.game --headless --script inputs.txt --output none
+    python -m src.game --no-autosave
+    python -m src.game --sqlite
+    python -m src.game --codec binary
+    python -m src.game --seed 42
+    python -m src.game --record session.replay   (replay: python -m src.replay session.replay)
+    python -m src.game --profile [--cprofile game.pstats]
 """
 import os
-import json
+import sys
 import glob
-import time
+import argparse
 from typing import Dict, Any
 from datetime import datetime
 
@@ -31,58 +38,52 @@ RED = CSI + "31m"
 BLUE = CSI + "34m"
 CYAN = CSI + "36m"
 
-# Defensive imports (handles missing modules more gracefully)
-try:
-    from .player import Player
-except Exception:
-    Player = None
-
-try:
-    from .scene import Scene
-except Exception:
-    Scene = None
-
-try:
-    from .payoff_manager import PayoffManager
-except Exception:
-    PayoffManager = None
-
-try:
-    from .relationship import RelationshipManager
-except Exception:
-    RelationshipManager = None
-
-try:
-    from .memory_cost import MemoryCostManager
-except Exception:
-    MemoryCostManager = None
-
-try:
-    from .ui_helpers import paginate_lines as ui_paginate, choice_menu as ui_choice_menu
-except Exception:
-    ui_paginate = None
-    ui_choice_menu = None
+from . import metrics
+from .console import Console, HeadlessConsole, get_console
+from .content import load_content, index_by
+from .scene_loader import SceneIndex
+from .journal import SaveJournal, JOURNAL_EXT
+from .fileio import atomic_write
+from .autosave import AutosaveService, AUTOSAVE_NAME
+from .save_manager import player_state_from_save
+from .save_store import SaveStore, STORE_NAME
+from .save_codec import get_codec, decode_save, EXTENSIONS as SAVE_EXTENSIONS
+from .choice_ir import compile_choice, execute
+from .rng import SessionRNG
+from .seed import shared_seed_table, to_record
+from .replay import RecordingConsole
+from .containers import IdList
+from .player import Player
+from .scene import Scene
+from .payoff_manager import PayoffManager
+from .relationship import RelationshipManager, RelationshipTriggers
+from .memory_cost import MemoryCostManager
+from .content_graph import ContentGraph
+from .ui_helpers import paginate_lines as paginate
+
+LOAD_PAGE_SIZE = 10     # saves per page in the load menu, newest first
 
 
 # -------------------- UI Utilities --------------------
-def clear_screen():
-    # Simple clear - works on Windows and *nix shells
-    os.system('cls' if os.name == 'nt' else 'clear')
+def clear_screen(console=None):
+    # Clearing is delegated to the console (no-op when headless)
+    get_console(console).clear()
 
 
-def toast(msg: str, title: str = "NOTICE", wait: float = 0.8):
+def toast(msg: str, title: str = "NOTICE", wait: float = 0.8, console=None):
     """Pretty boxed toast message. Non-blocking aside from short wait."""
+    console = get_console(console)
     lines = msg.splitlines() or [msg]
     width = max(len(l) for l in lines) + 4
     border = "+" + "-" * width + "+"
-    print(CYAN + border)
-    print(f"| {title.center(width - 2)} |")
-    print("|" + "-" * width + "|")
+    console.write(CYAN + border)
+    console.write(f"| {title.center(width - 2)} |")
+    console.write("|" + "-" * width + "|")
     for l in lines:
-        print("| " + l.ljust(width - 2) + " |")
-    print(border + RESET)
-    # short pause to mimic ephemeral toast (tweakable)
-    time.sleep(wait)
+        console.write("| " + l.ljust(width - 2) + " |")
+    console.write(border + RESET)
+    # short pause to mimic ephemeral toast (tweakable; skipped when headless)
+    console.pause(wait)
 
 
 def status_bar(player) -> str:
@@ -92,16 +93,17 @@ def status_bar(player) -> str:
     return f"{BOLD}{name}{RESET}  |  Inv: {inv_count}  |  Chronicle: {chron}"
 
 
-def heading(text: str):
-    print(BOLD + text + RESET)
+def heading(text: str, console=None):
+    get_console(console).write(BOLD + text + RESET)
 
 
-def confirm(prompt: str, default: bool = False) -> bool:
+def confirm(prompt: str, default: bool = False, console=None) -> bool:
+    console = get_console(console)
     yes = "Y" if default else "y"
     no = "n" if default else "N"
     s = f"{prompt} [{yes}/{no}]: "
     while True:
-        r = input(s).strip().lower()
+        r = console.read(s).strip().lower()
         if r == "" and default:
             return True
         if r == "" and not default:
@@ -110,54 +112,17 @@ def confirm(prompt: str, default: bool = False) -> bool:
             return True
         if r in ("n", "no"):
             return False
-        print("Please answer y or n.")
-
-
-def paginate_lines(lines, page_size=6):
-    """Fallback paginator - prints a heading and pages through."""
-    if not lines:
-        print("(none)")
-        return
-    for i in range(0, len(lines), page_size):
-        clear_screen()
-        for l in lines[i:i + page_size]:
-            print(l)
-        if i + page_size < len(lines):
-            inp = input("-- more -- (Enter to continue, q to quit) -- ").strip().lower()
-            if inp == 'q':
-                break
-
-
-def choice_menu(options):
-    """Fallback choice menu. options = list of (key, text). returns chosen key or control codes."""
-    for idx, (key, text) in enumerate(options, start=1):
-        print(f"{idx}) {text}")
-    print("q) quit  s) save  m) main menu")
-    while True:
-        c = input("> ").strip().lower()
-        if c in ("q", "s", "m"):
-            return c
-        try:
-            i = int(c)
-            if 1 <= i <= len(options):
-                return options[i - 1][0]
-        except Exception:
-            pass
-        print("Invalid choice.")
-
-
-# Choose which helpers to use (prefer project's ui_helpers if available)
-paginate = ui_paginate if ui_paginate else paginate_lines
-menu_choice = ui_choice_menu if ui_choice_menu else choice_menu
+        console.write("Please answer y or n.")
 
 
 # -------------------- Minimal Player Fallback --------------------
 class MinimalPlayer:
-    """Fallback player if src/player.py is missing. Lightweight and JSON serializable."""
+    """Fallback player for save data Player.from_dict rejects. Lightweight and JSON serializable."""
     def __init__(self, name="Player"):
         self.name = name
-        self.inventory = []     # list of seed dicts
-        self.chronicle = type('C', (), {'entries': []})()
+        self.inventory = IdList()     # ordered seed dicts, O(1) lookup by id
+        self.chronicle = type('C', (), {})()
+        self.chronicle.entries = IdList()
         self.relationships = {}
         self.flags = {}
 
@@ -170,8 +135,8 @@ class MinimalPlayer:
     def to_dict(self):
         return {
             'name': getattr(self, 'name', 'Player'),
-            'inventory': self.inventory,
-            'chronicle': getattr(self.chronicle, 'entries', []),
+            'inventory': [to_record(s) for s in self.inventory],
+            'chronicle': [to_record(e) for e in getattr(self.chronicle, 'entries', [])],
             'relationships': self.relationships,
             'flags': self.flags,
         }
@@ -179,98 +144,138 @@ class MinimalPlayer:
     @classmethod
     def from_dict(cls, data: Dict):
         p = cls(name=data.get('name', 'Player'))
-        p.inventory = data.get('inventory', [])
-        p.chronicle.entries = data.get('chronicle', [])
+        p.inventory = IdList(data.get('inventory', []))
+        p.chronicle.entries = IdList(data.get('chronicle', []))
         p.relationships = data.get('relationships', {})
         p.flags = data.get('flags', {})
         return p
 
 
+def shared_scene_index(content: Dict, data_dir: str, max_scenes: int = 1024, warm_workers: int = 4) -> SceneIndex:
+    """
+    One SceneIndex for many Games (a server's sessions): each scene is parsed and compiled
+    once and warmed on one pool. Scenes get no session RNG; Game plays them with its own.
+    """
+    seeds = shared_seed_table(content)
+    monsters = index_by(content['files'].get('monsters.json'), key_field='id')
+
+    def build(data):
+        try:
+            return Scene(data, seeds, monsters)
+        except Exception:
+            return data
+    return SceneIndex(data_dir, content['scene_manifest'], build, max_scenes=max_scenes, warm_workers=warm_workers)
+
+
 # -------------------- Game --------------------
 class Game:
-    def __init__(self):
+    def __init__(self, console: Console = None, scene_cache_size: int = 256, save_mode: str = 'json',
+                 autosave: bool = False, save_codec: str = 'json', seed: int = None, saves_dir: str = None,
+                 content: Dict = None, data_dir: str = None, scenes: SceneIndex = None):
+        # all prompts, output, clears and toast pauses go through the console;
+        # pass a HeadlessConsole for scripted, zero-wait runs
+        self.console = get_console(console)
+        # every random roll of this session (mini-games, combat) comes from this stream
+        self.rng = SessionRNG(seed)
         self.root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
-        self.data_dir = os.path.join(self.root, 'data')
-        self.saves_dir = os.path.join(self.root, 'saves')
+        self.data_dir = data_dir or os.path.join(self.root, 'data')
+        self.saves_dir = saves_dir or os.path.join(self.root, 'saves')
         os.makedirs(self.saves_dir, exist_ok=True)
-
-        # content indexes
-        self.seeds_index = self._load_json_index('seeds.json', key_field='id')
-        self.scenes_index = self._load_scenes(os.path.join(self.data_dir, 'scenes'))
+        # 'json' rewrites a full save file; 'journal' appends changes to <slot>.journal;
+        # 'sqlite' keeps every slot as a row of saves/saves.db
+        self.save_mode = save_mode
+        self.journal = None
+        self.store = SaveStore(os.path.join(self.saves_dir, STORE_NAME)) if save_mode == 'sqlite' else None
+        # background writer for saves/autosave.json, fed after every choice
+        self.autosave = AutosaveService(os.path.join(self.saves_dir, AUTOSAVE_NAME)) if autosave else None
+        # called with the save names about to be listed, read or written (replay.RecordingConsole)
+        self.save_observer = None
+
+        # content indexes (one compiled bundle, rebuilt automatically when data/ changes);
+        # a server passes one already-loaded bundle, shared read-only by every session
+        self.content = content if content is not None else load_content(self.data_dir)
+        self._content_graph = None
+        # immutable Seed flyweights, one table per bundle shared by every session
+        self.seeds_index = shared_seed_table(self.content)
         self.monsters_index = self._load_json_index('monsters.json', key_field='id')
+        self.scene_cache_size = scene_cache_size
+        # a server passes one shared_scene_index() for all sessions; it owns (and closes) that index
+        self._owns_scenes = scenes is None
+        self.scenes_index = scenes if scenes is not None else self._load_scenes()
+        # file saves: 'json' (.json) or 'binary' (.sav, seeds resolved against seeds_index)
+        self.save_codec = get_codec(save_codec, self.seeds_index)
 
         # Managers
-        self.payoff_manager = PayoffManager(self.data_dir) if PayoffManager else None
-        self.relationship_manager = RelationshipManager() if RelationshipManager else None
+        self.payoff_manager = PayoffManager(self.data_dir, payoffs=self.content['files'].get('payoffs.json'))
+        # threshold events from data/relationships.json, compiled once; the manager needs the player
+        self.relationship_triggers = RelationshipTriggers(self.content['files'].get('relationships.json'))
+        self.relationship_manager = None
         self.memory_manager = None  # created after player exists
 
         # Player
-        if Player:
-            try:
-                self.player = Player()
-            except Exception:
-                self.player = MinimalPlayer()
-        else:
-            self.player = MinimalPlayer()
+        self.player = Player()
 
         # ensure flags container exists
         if not hasattr(self.player, 'flags'):
             self.player.flags = {}
 
-        # memory manager requires player
-        self.memory_manager = MemoryCostManager(self.player) if MemoryCostManager else None
-
-        # wire seeds_index into scene objects
-        for sid, scene in self.scenes_index.items():
-            if hasattr(scene, 'seeds_index'):
-                scene.seeds_index = self.seeds_index
+        # memory and relationship managers require the player
+        self.memory_manager = MemoryCostManager(self.player)
+        self.relationship_manager = self._relationship_manager_for(self.player)
 
         # UI state
         self.breadcrumb = ["Main Menu"]
         # small welcome toast
-        toast("Phase 2 systems active (payoffs, relationships, memory cost, monsters).", "Welcome", wait=0.6)
+        self._toast("Phase 2 systems active (payoffs, relationships, memory cost, monsters).", "Welcome", wait=0.6)
+
+    def _toast(self, msg: str, title: str = "NOTICE", wait: float = 0.8):
+        toast(msg, title, wait=wait, console=self.console)
+
+    def _touch_saves(self, names):
+        if self.save_observer is not None:
+            self.save_observer(self, names)
 
     # --------------------- Loading helpers ---------------------
     def _load_json_index(self, filename, key_field='id'):
-        path = os.path.join(self.data_dir, filename)
-        if not os.path.exists(path):
-            return {}
+        return index_by(self.content['files'].get(filename), key_field=key_field)
+
+    def _load_scenes(self):
+        """Scenes are read lazily from data/scenes/ and kept in a bounded LRU."""
+        return SceneIndex(self.data_dir, self.content['scene_manifest'], self._build_scene,
+                          max_scenes=self.scene_cache_size)
+
+    @metrics.timed("scene.build")
+    def _build_scene(self, data):
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                arr = json.load(f)
-                if isinstance(arr, dict):
-                    return arr
-                idx = {}
-                for item in arr:
-                    key = item.get(key_field)
-                    if key:
-                        idx[key] = item
-                return idx
-        except Exception as e:
-            print(f"[Game] Failed to load {filename}: {e}")
-            return {}
-
-    def _load_scenes(self, scenes_dir):
-        scenes = {}
-        if not os.path.isdir(scenes_dir):
-            return scenes
-        for fpath in glob.glob(os.path.join(scenes_dir, '*.json')):
-            try:
-                with open(fpath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    sid = data.get('id') or os.path.splitext(os.path.basename(fpath))[0]
-                    if Scene:
-                        try:
-                            scene_obj = Scene(data)
-                            setattr(scene_obj, 'seeds_index', self.seeds_index)
-                            scenes[sid] = scene_obj
-                        except Exception:
-                            scenes[sid] = data
-                    else:
-                        scenes[sid] = data
-            except Exception as e:
-                print(f"[Game] Failed to load scene {fpath}: {e}")
-        return scenes
+            return Scene(data, self.seeds_index, self.monsters_index, rng=self.rng)
+        except Exception:
+            return data
+
+    def _relationship_manager_for(self, player):
+        """Manager over the player's own affinity dict; fired events and NPC flags live in player.flags."""
+        if not hasattr(player, 'flags'):
+            player.flags = {}
+        return RelationshipManager.from_player_data(
+            {'relationships': getattr(player, 'relationships', {}), 'flags': player.flags},
+            triggers=self.relationship_triggers)
+
+    @property
+    def content_graph(self):
+        """Reachability graph over the loaded content, built on first use."""
+        if self._content_graph is None:
+            self._content_graph = ContentGraph.from_content(self.content)
+        return self._content_graph
+
+    def new_game(self):
+        """Start over with a fresh player and rewire the managers to it."""
+        self.player = Player()
+        if self.journal:
+            # a fresh game never appends to the previous game's journal
+            self.journal.detach()
+            self.journal = None
+        if self.memory_manager:
+            self.memory_manager.player = self.player
+        self.relationship_manager = self._relationship_manager_for(self.player)
 
     # --------------------- Save / Load ---------------------
     def _save_payload(self):
@@ -279,158 +284,304 @@ class Game:
         else:
             payload = {
                 'name': getattr(self.player, 'name', 'Player'),
-                'inventory': getattr(self.player, 'inventory', []),
-                'chronicle': getattr(self.player.chronicle, 'entries', []),
+                'inventory': [to_record(s) for s in getattr(self.player, 'inventory', [])],
+                'chronicle': [to_record(e) for e in getattr(self.player.chronicle, 'entries', [])],
                 'relationships': getattr(self.player, 'relationships', {}),
                 'flags': getattr(self.player, 'flags', {}),
-                'saved_at': datetime.utcnow().isoformat()
             }
+        payload['saved_at'] = datetime.utcnow().isoformat()
         return payload
 
     def save_game(self, filename=None):
-        filename = filename or f"save_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.json"
+        if self.save_mode == 'journal':
+            return self._save_journal(filename)
+        if self.store is not None:
+            return self._save_store(filename)
+        filename = filename or f"save_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}"
+        if not os.path.splitext(filename)[1]:
+            filename += self.save_codec.extension
         path = os.path.join(self.saves_dir, filename)
+        self._touch_saves([filename])
         if os.path.exists(path):
-            if not confirm(f"Overwrite existing save {filename}?", default=False):
-                toast("Save canceled.", "Save")
+            if not confirm(f"Overwrite existing save {filename}?", default=False, console=self.console):
+                self._toast("Save canceled.", "Save")
+                return
+        try:
+            with metrics.timer("save.write"):
+                atomic_write(path, self.save_codec.encode(self._save_payload()))
+            self._toast(f"Saved to {filename}", "Save", wait=0.9)
+        except Exception as e:
+            self.console.write(f"[Save] Failed to save: {e}")
+
+    def _save_journal(self, filename=None):
+        """Journal mode: append only what changed since the last save to <slot>.journal."""
+        slot = os.path.splitext(filename)[0] if filename else (self.journal.slot if self.journal else 'journal')
+        try:
+            if self.journal is None or self.journal.slot != slot:
+                journal = SaveJournal(self.saves_dir, slot)
+                self._touch_saves([slot + JOURNAL_EXT])
+                if journal.exists():
+                    if not confirm(f"Overwrite existing save {slot}{JOURNAL_EXT}?", default=False, console=self.console):
+                        self._toast("Save canceled.", "Save")
+                        return
+                if self.journal:
+                    self.journal.detach()
+                with metrics.timer("save.write"):
+                    journal.attach(self.player)
+                    journal.compact()
+                self.journal = journal
+                self._toast(f"Saved to {slot}{JOURNAL_EXT} (snapshot)", "Save", wait=0.9)
+                return
+            with metrics.timer("save.write"):
+                n = self.journal.commit(self.player)
+            self._toast(f"Saved to {slot}{JOURNAL_EXT} (+{n} change(s))", "Save", wait=0.9)
+        except Exception as e:
+            self.console.write(f"[Save] Failed to save: {e}")
+
+    def _save_store(self, filename=None):
+        """SQLite mode: upsert the slot row (metadata columns + payload)."""
+        slot = os.path.splitext(filename)[0] if filename else f"save_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}"
+        self._touch_saves([slot])
+        if slot in self.store:
+            if not confirm(f"Overwrite existing save {slot}?", default=False, console=self.console):
+                self._toast("Save canceled.", "Save")
                 return
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(self._save_payload(), f, ensure_ascii=False, indent=2)
-            toast(f"Saved to {filename}", "Save", wait=0.9)
+            with metrics.timer("save.write"):
+                payload = self._save_payload()
+                payload.setdefault('saved_at', datetime.utcnow().isoformat())
+                self.store.put(slot, payload)
+            self._toast(f"Saved to slot {slot}", "Save", wait=0.9)
         except Exception as e:
-            print(f"[Save] Failed to save: {e}")
+            self.console.write(f"[Save] Failed to save: {e}")
 
     def load_game(self, filename):
         path = os.path.join(self.saves_dir, filename)
-        if not os.path.exists(path):
-            toast("Save file not found.", "Load", wait=0.8)
+        self._touch_saves([filename])
+        in_store = self.store is not None and filename in self.store
+        if not in_store and not os.path.exists(path):
+            self._toast("Save file not found.", "Load", wait=0.8)
             return
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if Player and hasattr(Player, 'from_dict'):
+            with metrics.timer("save.load"):
+                data, journal = self._read_save(filename, path, in_store)
                 try:
-                    self.player = Player.from_dict(data)
+                    self.player = Player.from_dict(data, seeds=self.seeds_index)
                 except Exception:
                     self.player = MinimalPlayer.from_dict(data)
-            else:
-                self.player = MinimalPlayer.from_dict(data)
             # rewire managers
             if self.memory_manager:
                 self.memory_manager.player = self.player
-            if self.relationship_manager and hasattr(RelationshipManager, 'from_player_data'):
-                self.relationship_manager = RelationshipManager.from_player_data({'relationships': getattr(self.player, 'relationships', {})})
-            toast("Load successful.", "Load", wait=0.6)
+            self.relationship_manager = self._relationship_manager_for(self.player)
+            # keep appending to the loaded slot when journaling
+            if self.journal:
+                self.journal.detach()
+                self.journal = None
+            if journal is not None and self.save_mode == 'journal':
+                journal.attach(self.player)
+                self.journal = journal
+            self._toast("Load successful.", "Load", wait=0.6)
         except Exception as e:
-            print(f"[Load] Failed to load save: {e}")
-
-    def list_saves(self):
-        files = sorted(glob.glob(os.path.join(self.saves_dir, '*.json')))
-        return [os.path.basename(p) for p in files]
+            self.console.write(f"[Load] Failed to load save: {e}")
+
+    def _read_save(self, filename, path, in_store):
+        """(player state, journal or None) for a slot of any save mode and codec."""
+        if in_store:
+            return player_state_from_save(self.store.get(filename)), None
+        if filename.endswith(JOURNAL_EXT):
+            journal = SaveJournal(self.saves_dir, filename[:-len(JOURNAL_EXT)])
+            data = journal.load()
+            if data is None:
+                raise ValueError("journal slot has no snapshot")
+            return data, journal
+        # any codec: the format is sniffed from the file header
+        with open(path, 'rb') as f:
+            return player_state_from_save(decode_save(f.read(), self.seeds_index)), None
+
+    def list_saves(self, limit=None, offset=0):
+        """Loadable saves, newest first; `limit`/`offset` select one page."""
+        if self.store is not None:
+            # straight from the slot index
+            names = [info.slot for info in self.store.list(limit=limit, offset=offset)]
+        else:
+            files = [(os.stat(p).st_mtime_ns, os.path.basename(p))
+                     for ext in SAVE_EXTENSIONS + (JOURNAL_EXT,)
+                     for p in glob.glob(os.path.join(self.saves_dir, '*' + ext))]
+            files.sort(key=lambda f: (-f[0], f[1]))
+            end = None if limit is None else offset + limit
+            names = [name for _, name in files[offset:end]]
+        self._touch_saves(names)
+        return names
+
+    def load_menu(self):
+        """Pick a save to load, LOAD_PAGE_SIZE at a time (n/p switch pages)."""
+        offset = 0
+        while True:
+            if self.store is not None:
+                # metadata comes from indexed columns; no payload is read until selection
+                infos = self.store.list(limit=LOAD_PAGE_SIZE + 1, offset=offset)
+                self._touch_saves([info.slot for info in infos])
+                more = len(infos) > LOAD_PAGE_SIZE
+                infos = infos[:LOAD_PAGE_SIZE]
+                saves = [info.slot for info in infos]
+                labels = [f"{info.slot}  ({info.player_name}, {info.chronicle_count} chronicle, "
+                          f"{info.payoff_count} payoffs, {info.saved_at[:19]})" for info in infos]
+            else:
+                saves = self.list_saves(LOAD_PAGE_SIZE + 1, offset)
+                more = len(saves) > LOAD_PAGE_SIZE
+                saves = labels = saves[:LOAD_PAGE_SIZE]
+            if not saves:
+                self._toast("No saves available.", "Load")
+                return
+            for i, s in enumerate(labels, start=offset + 1):
+                self.console.write(f"{i}) {s}")
+            pages = (["n) next page"] if more else []) + (["p) previous page"] if offset else [])
+            if pages:
+                self.console.write("   ".join(pages))
+            sel = self.console.read('> ').strip().lower()
+            if sel == 'n' and more:
+                offset += LOAD_PAGE_SIZE
+                continue
+            if sel == 'p' and offset:
+                offset -= LOAD_PAGE_SIZE
+                continue
+            try:
+                idx = int(sel) - 1 - offset
+                if not (0 <= idx < len(saves)):
+                    self._toast("Invalid save selection.", "Load")
+                    return
+                self.load_game(saves[idx])
+            except Exception:
+                self._toast("Invalid selection.", "Load")
+            return
 
     # --------------------- Gameplay helpers ---------------------
     def _render_header(self):
-        clear_screen()
-        print(BOLD + "Stasis Hunters".center(70) + RESET)
-        print(self._breadcrumb_line())
-        print("-" * 70)
-        print(status_bar(self.player))
-        print("-" * 70)
+        # the console redraws only the lines that changed since the last header
+        self.console.header([
+            BOLD + "Stasis Hunters".center(70) + RESET,
+            self._breadcrumb_line(),
+            "-" * 70,
+            status_bar(self.player),
+            "-" * 70,
+        ])
 
     def _breadcrumb_line(self):
         return " > ".join(self.breadcrumb)
 
     def list_scenes(self):
-        lines = []
-        for sid, scene in sorted(self.scenes_index.items()):
-            title = getattr(scene, 'title', scene.get('title') if isinstance(scene, dict) else sid)
-            lines.append(f"{sid}: {title}")
-        heading("Available Scenes")
-        paginate(lines)
+        # titles come from the scene manifest, so listing never loads scene files
+        lines = [f"{sid}: {self.scenes_index.title(sid)}" for sid in sorted(self.scenes_index)]
+        heading("Available Scenes", console=self.console)
+        paginate(lines, console=self.console)
 
     def show_inventory(self):
         inv = getattr(self.player, 'inventory', [])
         if not inv:
-            print("[Inventory] (empty)")
+            self.console.write("[Inventory] (empty)")
             return
         lines = [f"{i+1}) {s.get('id','?')} - {s.get('desc','') or s.get('name','')}" for i, s in enumerate(inv)]
-        heading("Inventory")
-        paginate(lines)
+        heading("Inventory", console=self.console)
+        paginate(lines, console=self.console)
 
     def show_chronicle(self):
         entries = getattr(self.player.chronicle, 'entries', [])
         if not entries:
-            print("[Chronicle] (no mirrored fragments)")
+            self.console.write("[Chronicle] (no mirrored fragments)")
             return
         lines = [f"{i+1}) {e.get('id')} - {e.get('desc','')}" for i, e in enumerate(entries)]
-        heading("Chronicle")
-        paginate(lines)
+        heading("Chronicle", console=self.console)
+        paginate(lines, console=self.console)
 
     def show_relationships(self):
         rels = getattr(self.player, 'relationships', {})
         if not rels:
-            print('[Relationships] (none)')
+            self.console.write('[Relationships] (none)')
             return
         lines = [f"{name}: {val}" for name, val in rels.items()]
-        heading("Relationships")
-        paginate(lines)
+        heading("Relationships", console=self.console)
+        paginate(lines, console=self.console)
 
     def memory_preview(self):
         if not self.memory_manager:
-            toast("Memory manager not available.", "Memory")
+            self._toast("Memory manager not available.", "Memory")
             return
         self.memory_manager.preview_removable()
 
     def memory_apply(self):
         if not self.memory_manager:
-            toast("Memory manager not available.", "Memory")
+            self._toast("Memory manager not available.", "Memory")
             return
         removable = self.memory_manager.preview_removable()
         if not removable:
-            toast("Nothing removable.", "Memory")
+            self._toast("Nothing removable.", "Memory")
             return
-        print("Enter comma-separated IDs to remove (or blank to cancel):")
-        ids = input('> ').strip()
+        self.console.write("Enter comma-separated IDs to remove (or blank to cancel):")
+        ids = self.console.read('> ').strip()
         if not ids:
-            toast("Canceled memory removal.", "Memory")
+            self._toast("Canceled memory removal.", "Memory")
             return
         remove_ids = [s.strip() for s in ids.split(',') if s.strip()]
-        if not confirm(f"Confirm removal of {len(remove_ids)} item(s)?", default=False):
-            toast("Removal canceled.", "Memory")
+        if not confirm(f"Confirm removal of {len(remove_ids)} item(s)?", default=False, console=self.console):
+            self._toast("Removal canceled.", "Memory")
             return
         res = self.memory_manager.apply_removal(remove_ids)
-        toast(f"Removed: {res.get('removed')}  Blocked: {res.get('blocked')}", "Memory", wait=1.0)
+        self._toast(f"Removed: {res.get('removed')}  Blocked: {res.get('blocked')}", "Memory", wait=1.0)
+        self.request_autosave()
 
     def check_payoffs(self):
         if not self.payoff_manager:
-            toast("Payoff manager not available.", "Payoff")
+            self._toast("Payoff manager not available.", "Payoff")
             return
         newly = self.payoff_manager.check_and_trigger(self.player)
         if not newly:
-            toast("No new payoffs unlocked.", "Payoff", wait=0.6)
+            self._toast("No new payoffs unlocked.", "Payoff", wait=0.6)
+            self.show_payoff_hints()
             return
         for p in newly:
             title = p.get('title')
             desc = p.get('desc', '')
-            toast(f"{title}\n{desc}", "Payoff Unlocked", wait=1.0)
+            self._toast(f"{title}\n{desc}", "Payoff Unlocked", wait=1.0)
+
+    def show_payoff_hints(self):
+        """List locked payoffs with where their missing seeds can be found."""
+        graph = self.content_graph
+        locked = self.payoff_manager.list_locked(self.player, graph=graph)
+        if not locked:
+            return
+        lines = []
+        for p in locked:
+            if not p.get('attainable', True):
+                lines.append(f"{p['id']} {p.get('title')}: out of reach")
+                continue
+            hints = []
+            for sid in sorted(p['missing']):
+                where = graph.sources(sid) if graph else []
+                hints.append(f"{sid} ({', '.join(where[:2])})" if where else sid)
+            lines.append(f"{p['id']} {p.get('title')}: missing {', '.join(hints)}")
+        heading("Locked payoffs", console=self.console)
+        paginate(lines, console=self.console)
 
     def enter_scene(self, sid):
         scene = self.scenes_index.get(sid)
         if not scene:
-            toast("Scene not found.", "Scene")
+            self._toast("Scene not found.", "Scene")
             return
+        # prefetch the rest of this chapter while the player reads
+        chapter = self.scenes_index.chapter(sid)
+        if chapter is not None:
+            self.scenes_index.warm_chapter(chapter)
         # bracket UI state for breadcrumbs
         self.breadcrumb.append(getattr(scene, 'title', sid))
         self._render_header()
         # description
         desc = getattr(scene, 'description', scene.get('description') if isinstance(scene, dict) else '')
         if desc:
-            paginate(desc.splitlines())
+            paginate(desc.splitlines(), console=self.console)
         # choices
         choices = getattr(scene, 'choices', scene.get('choices') if isinstance(scene, dict) else [])
         if not choices:
-            toast("No choices available in this scene.", "Scene")
+            self._toast("No choices available in this scene.", "Scene")
             self.breadcrumb.pop()
             return
         # present choices with shortcuts
@@ -438,170 +589,218 @@ class Game:
         for idx, ch in enumerate(choices, start=1):
             opts.append((idx, ch.get('text', f'Choice {idx}')))
         while True:
-            print("\nChoices:")
+            self.console.write("\nChoices:")
             for idx, ch in enumerate(choices, start=1):
-                print(f"{idx}) {ch.get('text')}")
-            print("b) back    m) main menu")
-            sel = input('> ').strip().lower()
+                self.console.write(f"{idx}) {ch.get('text')}")
+            self.console.write("b) back    m) main menu")
+            sel = self.console.read('> ').strip().lower()
             if sel in ('b', 'm'):
                 break
             try:
                 i = int(sel) - 1
-                if not (0 <= i < len(choices)):
-                    toast("Invalid choice.", "Input")
-                    continue
-                choice = choices[i]
-                effects = choice.get('effects')
-                if hasattr(scene, 'apply_effects'):
-                    scene.apply_effects(effects or {}, self.player,
-                                         payoff_manager=self.payoff_manager,
-                                         relationship_manager=self.relationship_manager,
-                                         memory_manager=self.memory_manager,
-                                         monsters_index=self.monsters_index)
-                else:
-                    self._apply_effects_minimal(effects or {})
-                # persist relationship manager affinities back to player, if present
-                if self.relationship_manager and hasattr(self.relationship_manager, 'affinities'):
-                    self.player.relationships = self.relationship_manager.affinities
-                # run payoff check defensively
-                if self.payoff_manager:
-                    self.payoff_manager.check_and_trigger(self.player)
-                toast("Choice applied.", "Scene")
             except ValueError:
-                toast("Please enter a number for choices.", "Input")
+                self._toast("Please enter a number for choices.", "Input")
+                continue
+            if not (0 <= i < len(choices)):
+                self._toast("Invalid choice.", "Input")
+                continue
+            self.apply_choice(scene, choices[i])
+            self._toast("Choice applied.", "Scene")
         # exit breadcrumbs
         self.breadcrumb.pop()
 
-    def _apply_effects_minimal(self, effects: Dict[str, Any]):
-        sid = effects.get('add_seed')
-        if sid and sid in self.seeds_index:
-            seed = self.seeds_index[sid]
-            if hasattr(self.player, 'add_seed'):
-                self.player.add_seed(seed)
-            else:
-                self.player.inventory.append(seed)
-            toast(f"Added seed {sid}", "Effect")
-        rel = effects.get('relationship')
-        if rel and self.relationship_manager:
-            for name, delta in rel.items():
-                self.relationship_manager.change_affinity(name, delta)
-                self.player.relationships[name] = self.relationship_manager.affinities.get(name, 0)
-            toast("Relationship updated.", "Effect")
-        mid = effects.get('encounter_monster')
-        if mid and self.monsters_index and mid in self.monsters_index:
-            try:
-                from .monster import Monster as _Monster
-                m = _Monster(self.monsters_index[mid])
-                drops = m.fight(self.player)
-                for d in drops:
-                    s = self.seeds_index.get(d)
-                    if s:
-                        if hasattr(self.player, 'add_seed'):
-                            self.player.add_seed(s)
-                        else:
-                            self.player.inventory.append(s)
-                toast(f"Encounter resolved. Drops: {drops}", "Combat")
-            except Exception as e:
-                print(f"[Encounter] Error: {e}")
+    def apply_choice(self, scene, choice: Dict[str, Any]):
+        """Apply one scene choice's effects to the current player (no prompts of its own)."""
+        if hasattr(scene, 'program_for'):
+            program = scene.program_for(choice)
+        else:
+            # raw-dict scene (Scene unavailable): same compiler, just not cached
+            program = compile_choice(choice, self.seeds_index, self.monsters_index)[0]
+        # Game has every ExecContext attribute, so it is its own execution context;
+        # the timer leaves out ops that wait on the player (mini-game, combat)
+        execute(program, self, timer="choice.apply")
+        # persist relationship manager affinities back to player, if present
+        if self.relationship_manager and hasattr(self.relationship_manager, 'affinities'):
+            self.player.relationships = self.relationship_manager.affinities
+        # run payoff check defensively
+        if self.payoff_manager:
+            self.payoff_manager.check_and_trigger(self.player)
+        self.request_autosave()
+
+    def request_autosave(self):
+        """Hand a snapshot to the autosave thread; the write happens off the game loop."""
+        if self.autosave:
+            self.autosave.request(self.player)
+
+    def close(self):
+        """Flush and stop background work (autosave writer, scene warming)."""
+        if self.autosave:
+            self.autosave.close()
+        if self._owns_scenes:
+            self.scenes_index.close()
+        if self.store is not None:
+            self.store.close()
 
     # --------------------- Main menu ---------------------
     def main_menu(self):
         while True:
             self._render_header()
-            print("1) New game")
-            print("2) Load game")
-            print("3) Save game")
-            print("4) List scenes")
-            print("5) Enter scene")
-            print("6) Inventory")
-            print("7) Chronicle")
-            print("8) Relationships")
-            print("9) Memory cost preview")
-            print("10) Memory cost apply")
-            print("11) Check payoffs")
-            print("q) Quit")
-            choice = input("> ").strip().lower()
+            self.console.write("1) New game")
+            self.console.write("2) Load game")
+            self.console.write("3) Save game")
+            self.console.write("4) List scenes")
+            self.console.write("5) Enter scene")
+            self.console.write("6) Inventory")
+            self.console.write("7) Chronicle")
+            self.console.write("8) Relationships")
+            self.console.write("9) Memory cost preview")
+            self.console.write("10) Memory cost apply")
+            self.console.write("11) Check payoffs")
+            self.console.write("q) Quit")
+            choice = self.console.read("> ").strip().lower()
             if choice == '1':
-                if confirm("Start a new game (current progress will be lost in RAM)?", default=False):
-                    self.player = Player() if Player else MinimalPlayer()
-                    # rewire managers
-                    if self.memory_manager:
-                        self.memory_manager.player = self.player
-                    if self.relationship_manager and hasattr(RelationshipManager, 'from_player_data'):
-                        self.relationship_manager = RelationshipManager.from_player_data({'relationships': getattr(self.player, 'relationships', {})})
-                    toast("New game started.", "Game")
+                if confirm("Start a new game (current progress will be lost in RAM)?", default=False, console=self.console):
+                    self.new_game()
+                    self._toast("New game started.", "Game")
             elif choice == '2':
-                saves = self.list_saves()
-                if not saves:
-                    toast("No saves available.", "Load")
-                    continue
-                for i, s in enumerate(saves, start=1):
-                    print(f"{i}) {s}")
-                sel = input('> ').strip()
-                try:
-                    idx = int(sel) - 1
-                    if not (0 <= idx < len(saves)):
-                        toast("Invalid save selection.", "Load")
-                        continue
-                    self.load_game(saves[idx])
-                except Exception:
-                    toast("Invalid selection.", "Load")
+                self.load_menu()
             elif choice == '3':
                 # allow providing filename
-                print("Enter filename to save as (blank -> auto name):")
-                fn = input("> ").strip()
+                self.console.write("Enter filename to save as (blank -> auto name):")
+                fn = self.console.read("> ").strip()
                 self.save_game(fn or None)
             elif choice == '4':
                 self.breadcrumb.append("Scenes")
                 self._render_header()
                 self.list_scenes()
-                input("Press Enter to return.")
+                self.console.read("Press Enter to return.")
                 self.breadcrumb.pop()
             elif choice == '5':
-                print("Enter scene id:")
-                sid = input('> ').strip()
+                self.console.write("Enter scene id:")
+                sid = self.console.read('> ').strip()
                 if sid:
                     self.enter_scene(sid)
             elif choice == '6':
                 self.breadcrumb.append("Inventory")
                 self._render_header()
                 self.show_inventory()
-                input("Press Enter to return.")
+                self.console.read("Press Enter to return.")
                 self.breadcrumb.pop()
             elif choice == '7':
                 self.breadcrumb.append("Chronicle")
                 self._render_header()
                 self.show_chronicle()
-                input("Press Enter to return.")
+                self.console.read("Press Enter to return.")
                 self.breadcrumb.pop()
             elif choice == '8':
                 self.breadcrumb.append("Relationships")
                 self._render_header()
                 self.show_relationships()
-                input("Press Enter to return.")
+                self.console.read("Press Enter to return.")
                 self.breadcrumb.pop()
             elif choice == '9':
                 self.memory_preview()
-                input("Press Enter to return.")
+                self.console.read("Press Enter to return.")
             elif choice == '10':
                 self.memory_apply()
-                input("Press Enter to return.")
+                self.console.read("Press Enter to return.")
             elif choice == '11':
                 self.check_payoffs()
-                input("Press Enter to return.")
+                self.console.read("Press Enter to return.")
             elif choice == 'q':
-                if confirm("Quit game? (progress not saved automatically)", default=False):
-                    toast("Goodbye — may your seeds find payoffs.", "Exit", wait=0.5)
+                note = "autosaved" if self.autosave else "not saved automatically"
+                if confirm(f"Quit game? (progress {note})", default=False, console=self.console):
+                    self._toast("Goodbye — may your seeds find payoffs.", "Exit", wait=0.5)
                     break
             else:
-                toast("Invalid choice.", "Input")
+                self._toast("Invalid choice.", "Input")
 
     def run(self):
         try:
-            self.main_menu()
+            with self.console.capture():
+                self.main_menu()
         except KeyboardInterrupt:
-            print("\nInterrupted — exiting")
+            self.console.write("\nInterrupted — exiting")
+        except EOFError:
+            self.console.write("\nInput closed — exiting")
+        finally:
+            self.close()
+            self.console.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stasis Hunters console game.")
+    parser.add_argument('--headless', action='store_true',
+                        help="scripted input, no screen clears or toast delays")
+    parser.add_argument('--script', help="file of input lines for --headless (default: stdin)")
+    parser.add_argument('--output', help="headless output file (default: stdout, 'none' discards)")
+    parser.add_argument('--journal', action='store_true',
+                        help="journaled saves: append changes instead of rewriting the save")
+    parser.add_argument('--sqlite', action='store_true',
+                        help=f"keep save slots in saves/{STORE_NAME} (SQLite)")
+    parser.add_argument('--seed', type=int, help="session RNG seed (default: random)")
+    parser.add_argument('--record', metavar='LOG', help="record every input (plus seed) for python -m src.replay")
+    parser.add_argument('--codec', choices=('json', 'binary'), default='json',
+                        help="file save format (loading detects either)")
+    parser.add_argument('--no-autosave', action='store_true',
+                        help=f"do not write saves/{AUTOSAVE_NAME} after every choice (headless and recorded runs never autosave)")
+    parser.add_argument('--profile', action='store_true',
+                        help="record hot-path counts and latencies; summary on stderr at exit")
+    parser.add_argument('--cprofile', metavar='FILE',
+                        help="also run under cProfile and dump pstats to FILE (implies --profile)")
+    args = parser.parse_args(argv)
+
+    profiler = None
+    if args.profile or args.cprofile:
+        metrics.enable()
+    if args.cprofile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    console = None
+    sink = None
+    script = None
+    try:
+        if args.headless:
+            if args.output == 'none':
+                sink = None
+            elif args.output:
+                sink = open(args.output, 'w', encoding='utf-8')
+            else:
+                sink = sys.stdout
+            if args.script:
+                script = open(args.script, 'r', encoding='utf-8')
+            console = HeadlessConsole(script or sys.stdin, sink=sink)
+        if args.record:
+            console = RecordingConsole(get_console(console), args.record)
+        save_mode = 'sqlite' if args.sqlite else 'journal' if args.journal else 'json'
+        with metrics.timer("game.init"):
+            # recorded sessions never autosave, so replay sees the same saves folder at every step
+            game = Game(console=console, save_mode=save_mode,
+                        autosave=not (args.no_autosave or args.headless or args.record), save_codec=args.codec,
+                        seed=args.seed)
+        if args.record:
+            console.begin(game)
+        try:
+            game.run()
+        finally:
+            if args.record:
+                console.end(game)
+    finally:
+        if script is not None:
+            script.close()
+        if sink is not None and sink is not sys.stdout:
+            sink.close()
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            sys.stderr.write(f"[Profile] cProfile stats written to {args.cprofile}\n")
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(20)
+        if metrics.enabled():
+            metrics.report()
 
 
 if __name__ == '__main__':
-    Game().run()
+    main()
@@ -0,0 +1,235 @@
+# src/journal.py
+"""
+Append-only journaled saves.
+
+A journal slot is two files in the saves directory:
+  <slot>.snapshot  full player state (same shape as MinimalPlayer.to_dict)
+  <slot>.journal   one compact JSON record per line, appended on every save
+
+Records:
+  ["i+", seed] / ["i-", id]     inventory add / remove
+  ["c+", entry] / ["c-", id]    Chronicle add / remove
+  ["r", npc, value]             relationship affinity set
+  ["f", key, value] / ["f-", key]  flag set / cleared
+  ["p", payoff_id]              payoff triggered
+  ["n", name]                   player renamed
+
+Every record is idempotent, so replaying a journal on top of a snapshot that
+already contains some of it (crash during compaction) gives the same state.
+Loading is snapshot + replay; after `compact_every` records the journal is
+folded into a fresh snapshot.
+"""
+import copy
+import json
+import os
+from typing import Dict, List, Optional
+
+from .fileio import atomic_write
+from .seed import to_record
+
+SNAPSHOT_EXT = ".snapshot"
+JOURNAL_EXT = ".journal"
+_MISSING = object()
+
+
+def _dump(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _player_state(player) -> Dict:
+    return {
+        'name': getattr(player, 'name', 'Player'),
+        'inventory': [to_record(s) for s in getattr(player, 'inventory', [])],
+        'chronicle': [to_record(e) for e in getattr(player.chronicle, 'entries', [])],
+        'relationships': dict(getattr(player, 'relationships', {})),
+        'flags': getattr(player, 'flags', {}),
+    }
+
+
+class SaveJournal:
+    def __init__(self, saves_dir: str, slot: str, compact_every: int = 500):
+        self.saves_dir = saves_dir
+        self.slot = slot
+        self.compact_every = compact_every
+        self.snapshot_path = os.path.join(saves_dir, slot + SNAPSHOT_EXT)
+        self.journal_path = os.path.join(saves_dir, slot + JOURNAL_EXT)
+        self.player = None
+        self.records_since_snapshot = 0
+        self._pending: List[list] = []
+        self._watched = []
+        self._rel_base: Dict = {}
+        self._flags_base: Dict = {}
+        self._payoffs_src = None
+        self._payoffs_seen = 0
+        self._name = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.snapshot_path)
+
+    # ---------------- change tracking ----------------
+    def attach(self, player):
+        """Start tracking `player`; the current state is the baseline for the next commit."""
+        self.detach()
+        self.player = player
+        self._pending = []
+        for container, tag in ((getattr(player, 'inventory', None), "i"),
+                               (getattr(player.chronicle, 'entries', None), "c")):
+            if hasattr(container, 'watchers'):
+                watcher = self._watcher(tag)
+                container.watchers.append(watcher)
+                self._watched.append((container, watcher))
+        self._rebase()
+
+    def detach(self):
+        for container, watcher in self._watched:
+            if watcher in container.watchers:
+                container.watchers.remove(watcher)
+        self._watched = []
+        self.player = None
+
+    def _watcher(self, tag):
+        pending = self._pending
+
+        def on_change(op, item):
+            if op == "+":
+                pending.append([tag + "+", to_record(item)])
+            else:
+                pending.append([tag + "-", item.get('id')])
+        return on_change
+
+    def _rebase(self):
+        player = self.player
+        self._name = getattr(player, 'name', 'Player')
+        self._rel_base = dict(getattr(player, 'relationships', {}))
+        flags = getattr(player, 'flags', {})
+        self._flags_base = {k: copy.deepcopy(v) for k, v in flags.items() if k != 'payoffs_triggered'}
+        self._payoffs_src = flags.get('payoffs_triggered')
+        self._payoffs_seen = len(self._payoffs_src or [])
+
+    def _collect(self) -> List[list]:
+        """Pending container records plus diffs of the small maps (relationships, flags)."""
+        player = self.player
+        records = list(self._pending)
+        del self._pending[:]
+        name = getattr(player, 'name', 'Player')
+        if name != self._name:
+            records.append(["n", name])
+        rels = getattr(player, 'relationships', {})
+        for npc, value in rels.items():
+            if self._rel_base.get(npc) != value:
+                records.append(["r", npc, value])
+        flags = getattr(player, 'flags', {})
+        for key, value in flags.items():
+            if key != 'payoffs_triggered' and self._flags_base.get(key, _MISSING) != value:
+                records.append(["f", key, value])
+        for key in self._flags_base:
+            if key not in flags:
+                records.append(["f-", key])
+        triggered = flags.get('payoffs_triggered') or []
+        start = self._payoffs_seen if triggered is self._payoffs_src else 0
+        records.extend(["p", pid] for pid in triggered[start:])
+        return records
+
+    # ---------------- writing ----------------
+    def commit(self, player=None) -> int:
+        """Append everything that changed since the last commit. Returns records written."""
+        if player is not None and player is not self.player:
+            self.attach(player)
+            self.compact()
+            return 0
+        if self.player is None:
+            raise ValueError("SaveJournal.commit() needs a player to track")
+        if not self.exists() or not self._watched:
+            # first save of this slot, or containers we cannot watch: full snapshot
+            self.compact()
+            return 0
+        records = self._collect()
+        if records:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write("".join(_dump(r) + "\n" for r in records))
+                f.flush()
+            self.records_since_snapshot += len(records)
+        self._rebase()
+        if self.records_since_snapshot >= self.compact_every:
+            self.compact()
+        return len(records)
+
+    def compact(self):
+        """Write a full snapshot atomically, then start an empty journal."""
+        atomic_write(self.snapshot_path, _dump(_player_state(self.player)))
+        open(self.journal_path, 'w', encoding='utf-8').close()
+        del self._pending[:]
+        self.records_since_snapshot = 0
+        self._rebase()
+
+    # ---------------- reading ----------------
+    def _records(self):
+        """Yield journal records; a torn final line (interrupted append) is cut off the file."""
+        if not os.path.exists(self.journal_path):
+            return
+        good = 0
+        torn = False
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                good += len(line)
+                yield rec
+        if torn:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good)
+
+    def load(self) -> Optional[Dict]:
+        """Rebuild the player dict from snapshot + journal replay (None if the slot is missing)."""
+        if not self.exists():
+            return None
+        with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        inventory = {s.get('id'): s for s in state.get('inventory', [])}
+        chronicle = {e.get('id'): e for e in state.get('chronicle', [])}
+        rels = state.get('relationships', {})
+        flags = state.get('flags', {})
+        triggered = flags.setdefault('payoffs_triggered', [])
+        fired = set(triggered)
+        count = 0
+        for rec in self._records():
+            count += 1
+            op = rec[0]
+            if op == "i+":
+                inventory.setdefault(rec[1].get('id'), rec[1])
+            elif op == "i-":
+                inventory.pop(rec[1], None)
+            elif op == "c+":
+                chronicle.setdefault(rec[1].get('id'), rec[1])
+            elif op == "c-":
+                chronicle.pop(rec[1], None)
+            elif op == "r":
+                rels[rec[1]] = rec[2]
+            elif op == "f":
+                flags[rec[1]] = rec[2]
+            elif op == "f-":
+                flags.pop(rec[1], None)
+            elif op == "p":
+                if rec[1] not in fired:
+                    fired.add(rec[1])
+                    triggered.append(rec[1])
+            elif op == "n":
+                state['name'] = rec[1]
+        self.records_since_snapshot = count
+        state['inventory'] = list(inventory.values())
+        state['chronicle'] = list(chronicle.values())
+        state['relationships'] = rels
+        state['flags'] = flags
+        return state
+
+
+def list_slots(saves_dir: str) -> List[str]:
+    if not os.path.isdir(saves_dir):
+        return []
+    return sorted(n[:-len(SNAPSHOT_EXT)] for n in os.listdir(saves_dir) if n.endswith(SNAPSHOT_EXT))
@@ -1,5 +1,7 @@
 # src/memory_cost.py
 from typing import List, Dict
+from . import metrics
+from .containers import IdList, id_set
 
 class MemoryCostManager:
     """
@@ -10,28 +12,36 @@ class MemoryCostManager:
     def __init__(self, player):
         self.player = player
 
+    @metrics.timed("memory.preview")
     def preview_removable(self) -> List[Dict]:
-        chronicle_ids = {e['id'] for e in self.player.chronicle.entries}
+        chronicle_ids = id_set(self.player.chronicle.entries)
         removable = [s for s in self.player.inventory if s.get("id") not in chronicle_ids]
         print("[MemoryCost] Preview removable fragments:")
         for s in removable:
             print(f" - {s.get('id')}: {s.get('desc','')}")
         return removable
 
+    @metrics.timed("memory.apply_removal")
     def apply_removal(self, remove_ids: List[str]) -> Dict:
-        chronicle_ids = {e['id'] for e in self.player.chronicle.entries}
+        """
+        Remove unprotected seeds from the inventory.
+
+        A removal never puts a payoff out of reach: payoffs read only the Chronicle,
+        Chronicle seeds are blocked here, and a removed seed can be picked up again.
+        """
+        inventory = self.player.inventory
+        if not isinstance(inventory, IdList):
+            inventory = self.player.inventory = IdList(inventory)
+        chronicle_ids = id_set(self.player.chronicle.entries)
         removed = []
         blocked = []
-        new_inventory = []
-        for s in self.player.inventory:
-            sid = s.get("id")
-            if sid in remove_ids:
-                if sid in chronicle_ids:
-                    blocked.append(sid)
-                else:
-                    removed.append(sid)
-                    continue
-            new_inventory.append(s)
-        self.player.inventory = new_inventory
+        for sid in dict.fromkeys(remove_ids):     # de-duplicated, request order
+            if sid not in inventory:
+                continue
+            if sid in chronicle_ids:
+                blocked.append(sid)
+            else:
+                removed.append(sid)
+        inventory.remove_many(removed)
         print(f"[MemoryCost] Removed: {removed}; Blocked: {blocked}")
         return {"removed": removed, "blocked": blocked, "remaining_count": len(self.player.inventory)}
@@ -0,0 +1,160 @@
+# src/metrics.py
+"""
+Opt-in counters and latency histograms for the engine's hot paths.
+
+Instrumented functions are wrapped with `@timed("name")`; while metrics are
+disabled (the default) the wrapper only checks a flag and calls through.
+`python -m src.game --profile` enables them and prints a summary at exit;
+`--cprofile FILE` additionally runs the session under cProfile.
+
+    from . import metrics
+    metrics.enable()
+    ...
+    metrics.report()          # table on stderr
+    metrics.snapshot()        # {"timers": {...}, "counters": {...}}
+"""
+import functools
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO
+
+_enabled = False
+_lock = threading.Lock()
+_timers: Dict[str, "Histogram"] = {}
+_counters: Dict[str, int] = {}
+
+
+class Histogram:
+    """Latency histogram with power-of-two microsecond buckets (bucket b holds < 2**b us)."""
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        b = int(seconds * 1e6).bit_length()
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (seconds) of the bucket holding the q-th quantile."""
+        if not self.count:
+            return 0.0
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= q * self.count:
+                return min((1 << b) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self) -> Dict:
+        return {"count": self.count, "total_s": self.total,
+                "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+                "min_us": self.min * 1e6 if self.count else 0.0, "max_us": self.max * 1e6,
+                "p50_us": self.percentile(0.5) * 1e6, "p99_us": self.percentile(0.99) * 1e6,
+                "buckets_us": {str(1 << b): n for b, n in sorted(self.buckets.items())}}
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def observe(name: str, seconds: float):
+    if not _enabled:
+        return
+    with _lock:
+        h = _timers.get(name)
+        if h is None:
+            h = _timers[name] = Histogram()
+        h.add(seconds)
+
+
+def count(name: str, n: int = 1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def timed(name: str):
+    """Decorator: record each call's latency under `name` while metrics are enabled."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started)
+        return wrapper
+    return deco
+
+
+class timer:
+    """Context manager form of `timed` for blocks that are not whole functions."""
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter() if _enabled else None
+        return self
+
+    def __exit__(self, *exc):
+        if self.started is not None:
+            observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def snapshot() -> Dict:
+    with _lock:
+        return {"timers": {k: h.as_dict() for k, h in sorted(_timers.items())},
+                "counters": dict(sorted(_counters.items()))}
+
+
+def summary_lines() -> List[str]:
+    snap = snapshot()
+    lines = [f"{'timer':<28}{'calls':>8}{'total ms':>11}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+    by_total = sorted(snap["timers"].items(), key=lambda kv: kv[1]["total_s"], reverse=True)
+    for name, t in by_total:
+        lines.append(f"{name:<28}{t['count']:>8}{t['total_s'] * 1000:>11.2f}{t['mean_us']:>10.1f}"
+                     f"{t['p50_us']:>10.0f}{t['p99_us']:>10.0f}{t['max_us']:>10.0f}")
+    for name, n in snap["counters"].items():
+        lines.append(f"{name:<28}{n:>8}")
+    return lines
+
+
+def report(stream: Optional[TextIO] = None):
+    stream = stream or sys.stderr
+    stream.write("[Metrics] Hot-path summary\n")
+    for line in summary_lines():
+        stream.write("  " + line + "\n")
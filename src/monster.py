@@ -1,9 +1,18 @@
 # src/monster.py
 import random
 from typing import Dict, List
+from .console import get_console
 
 class Monster:
-    def __init__(self, data: Dict):
+    # combat rules, shared with the batch simulator (src/combat_sim.py)
+    PLAYER_DAMAGE = (6, 12)     # inclusive roll per player attack
+    ENEMY_DAMAGE = (3, 8)       # inclusive roll per enemy attack
+    FLEE_CHANCE = 0.5
+    __slots__ = ("rng", "id", "name", "max_hp", "hp", "attack_pattern", "drops")
+
+    def __init__(self, data: Dict, rng=None):
+        # session RNG (src/rng.py); the global random module if none is given
+        self.rng = rng if rng is not None else random
         self.id = data.get("id")
         self.name = data.get("name", "Monster")
         self.max_hp = data.get("hp", 30)
@@ -20,33 +29,34 @@ class Monster:
 
     def enemy_attack(self, player):
         # simple damage roll (flavor only—player HP system can be added later)
-        dmg = random.randint(3, 8)
+        dmg = self.rng.randint(*self.ENEMY_DAMAGE)
         print(f"[Combat] {self.name} attacks for {dmg} (flavor only).")
 
-    def fight(self, player):
+    def fight(self, player, console=None):
         """
         Very small deterministic loop for console testing.
         Returns list of drop ids if monster defeated.
         """
-        print(f"[Encounter] You engage {self.name} (HP {self.max_hp}).")
+        console = get_console(console)
+        console.write(f"[Encounter] You engage {self.name} (HP {self.max_hp}).")
         while self.is_alive():
-            print("1) Attack  2) Try to Run")
-            choice = input("> ").strip()
+            console.write("1) Attack  2) Try to Run")
+            choice = console.read("> ").strip()
             if choice == "1":
-                dmg = random.randint(6, 12)
+                dmg = self.rng.randint(*self.PLAYER_DAMAGE)
                 self.take_damage(dmg)
                 if not self.is_alive():
-                    print(f"[Combat] You defeated {self.name}!")
+                    console.write(f"[Combat] You defeated {self.name}!")
                     return list(self.drops)
                 self.enemy_attack(player)
             elif choice == "2":
                 # small chance to flee
-                if random.random() < 0.5:
-                    print("[Combat] You successfully fled.")
+                if self.rng.random() < self.FLEE_CHANCE:
+                    console.write("[Combat] You successfully fled.")
                     return []
                 else:
-                    print("[Combat] Failed to flee.")
+                    console.write("[Combat] Failed to flee.")
                     self.enemy_attack(player)
             else:
-                print("[Combat] Invalid choice.")
+                console.write("[Combat] Invalid choice.")
         return list(self.drops)
@@ -0,0 +1,331 @@
+# src/payoff_eval.py
+"""
+Bulk payoff evaluation: which payoffs would fire for each of many saves.
+
+A payoff fires once every one of its required_seeds is in the Chronicle
+(PayoffManager's rule; no requirements means it fires at once). Rather than
+running check_and_trigger per save, which is slow and writes to the player's
+flags, the population is evaluated as bitsets with nothing mutated.
+
+Saves are processed in chunks. Each chunk is stored bit-sliced: every seed
+that some payoff requires gets one bit row across the chunk's players, so a
+payoff's satisfied players are the AND of its required seeds' rows, and
+counts are popcounts. With NumPy the rows are uint64 arrays and payoffs are
+ANDed in batches; without it every row is one Python int, with identical
+results.
+
+    python -m src.payoff_eval saves/ --payoffs new_payoffs.json
+    python -m src.payoff_eval archive/ --per-save fired.jsonl --json report.json --no-numpy
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import repeat
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .content import load_content
+from .save_codec import EXTENSIONS, decode_save
+from .save_manager import player_state_from_save
+from .seed import shared_seed_table
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+# (save id, Chronicle entry ids, payoff ids already in flags["payoffs_triggered"])
+SaveRow = Tuple[str, Iterable[str], Iterable[str]]
+# called per save with (save id, payoffs that would fire, of those the ones not yet triggered)
+PerSave = Callable[[str, List[str], List[str]], None]
+
+
+class PayoffMasks:
+    """payoffs.json compiled to bit positions: one column per required seed, one mask per payoff."""
+
+    def __init__(self, payoffs: Dict[str, Dict]):
+        self.ids: List[str] = []
+        self.columns: Dict[str, int] = {}
+        self.required: List[List[int]] = []      # column numbers per payoff
+        for pid, data in (payoffs or {}).items():
+            cols = sorted({self.columns.setdefault(s, len(self.columns)) for s in data.get("required_seeds", [])})
+            self.ids.append(pid)
+            self.required.append(cols)
+        self.row_of = {pid: i for i, pid in enumerate(self.ids)}
+        self.masks = [sum(1 << c for c in cols) for cols in self.required]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def fires(self, chronicle_ids: Iterable[str]) -> List[str]:
+        """Payoffs one Chronicle satisfies, checked against each payoff's mask."""
+        have = 0
+        for sid in chronicle_ids:
+            c = self.columns.get(sid)
+            if c is not None:
+                have |= 1 << c
+        return [pid for pid, mask in zip(self.ids, self.masks) if have & mask == mask]
+
+
+class PopulationReport:
+    """Per-payoff counts over every evaluated save."""
+
+    def __init__(self, masks: PayoffMasks, engine: str):
+        self.masks = masks
+        self.engine = engine
+        self.saves = 0
+        self.would_fire = [0] * len(masks)     # requirements met
+        self.new = [0] * len(masks)            # requirements met, not yet in payoffs_triggered
+        self.seconds = 0.0
+
+    def as_dict(self) -> Dict:
+        n = self.saves or 1
+        return {"engine": self.engine, "saves": self.saves, "payoffs": len(self.masks),
+                "seconds": self.seconds,
+                "results": {pid: {"would_fire": self.would_fire[i], "rate": self.would_fire[i] / n,
+                                  "new": self.new[i], "required": len(self.masks.required[i])}
+                            for i, pid in enumerate(self.masks.ids)}}
+
+
+def _chunks(rows: Iterable[SaveRow], size: int) -> Iterator[List[SaveRow]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _per_save_lists(masks: PayoffMasks, chunk: Sequence[SaveRow], pairs: Iterable[Tuple[int, int, bool]],
+                    per_save: PerSave):
+    """pairs: (payoff row, player index, is new) -> one per_save call per save, payoffs in file order."""
+    fired: List[List[Tuple[int, bool]]] = [[] for _ in chunk]
+    for p, i, is_new in pairs:
+        fired[i].append((p, is_new))
+    for (sid, _, _), hits in zip(chunk, fired):
+        hits.sort()
+        per_save(sid, [masks.ids[p] for p, _ in hits], [masks.ids[p] for p, is_new in hits if is_new])
+
+
+def _eval_chunk_python(masks: PayoffMasks, chunk: Sequence[SaveRow], report: PopulationReport,
+                       per_save: Optional[PerSave]):
+    n = len(chunk)
+    nbytes = (n + 7) // 8
+    columns, row_of = masks.columns, masks.row_of
+    seed_rows: Dict[int, bytearray] = {}
+    done_rows: Dict[int, bytearray] = {}
+    for i, (_, chron, triggered) in enumerate(chunk):
+        byte, bit = i >> 3, 1 << (i & 7)
+        for sid in chron:
+            c = columns.get(sid)
+            if c is not None:
+                row = seed_rows.get(c)
+                if row is None:
+                    row = seed_rows[c] = bytearray(nbytes)
+                row[byte] |= bit
+        for pid in triggered:
+            p = row_of.get(pid)
+            if p is not None:
+                row = done_rows.get(p)
+                if row is None:
+                    row = done_rows[p] = bytearray(nbytes)
+                row[byte] |= bit
+    seeds = {c: int.from_bytes(b, "little") for c, b in seed_rows.items()}
+    done = {p: int.from_bytes(b, "little") for p, b in done_rows.items()}
+    everyone = (1 << n) - 1
+    pairs = []
+    for p, cols in enumerate(masks.required):
+        sat = everyone
+        for c in cols:
+            sat &= seeds.get(c, 0)
+            if not sat:
+                break
+        if not sat:
+            continue
+        new = sat & ~done.get(p, 0)
+        report.would_fire[p] += bin(sat).count("1")
+        report.new[p] += bin(new).count("1")
+        if per_save is not None:
+            while sat:
+                low = sat & -sat
+                pairs.append((p, low.bit_length() - 1, bool(new & low)))
+                sat ^= low
+    if per_save is not None:
+        _per_save_lists(masks, chunk, pairs, per_save)
+
+
+def _popcount_rows(rows):
+    """Set bits per row of a 2-D uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(rows).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(rows.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+
+def _eval_chunk_numpy(masks: PayoffMasks, chunk: Sequence[SaveRow], report: PopulationReport,
+                      per_save: Optional[PerSave], batch: int):
+    n = len(chunk)
+    words = (n + 63) // 64
+    columns, row_of = masks.columns, masks.row_of
+    # flat (row, player) lists built with C-level map(); ids outside the tables map to -1
+    seed_cols: List[int] = []
+    seed_lens: List[int] = []
+    done_rows: List[int] = []
+    done_lens: List[int] = []
+    for _, chron, triggered in chunk:
+        before = len(seed_cols)
+        seed_cols.extend(map(columns.get, chron, repeat(-1)))
+        seed_lens.append(len(seed_cols) - before)
+        before = len(done_rows)
+        done_rows.extend(map(row_of.get, triggered, repeat(-1)))
+        done_lens.append(len(done_rows) - before)
+
+    def bit_rows(rows, lens, nrows):
+        # one spare row at the end (the seed rows keep "every player" there)
+        out = np.zeros((nrows + 1, words), dtype="<u8")
+        rows = np.array(rows, dtype=np.int64)
+        players = np.repeat(np.arange(n, dtype=np.int64), lens)
+        keep = rows >= 0
+        rows, players = rows[keep], players[keep]
+        if rows.size:
+            np.bitwise_or.at(out, (rows, players >> 6), np.left_shift(np.uint64(1), (players & 63).astype(np.uint64)))
+        return out
+
+    seeds = bit_rows(seed_cols, seed_lens, len(columns))
+    # every real player's bit set: the AND identity, and the answer for payoffs without requirements
+    everyone = np.full(words, np.iinfo(np.uint64).max, dtype="<u8")
+    if n % 64:
+        everyone[-1] = np.uint64((1 << (n % 64)) - 1)
+    seeds[-1] = everyone
+    done = bit_rows(done_rows, done_lens, len(masks))[:-1]
+
+    # payoffs grouped by requirement count, so each group is one gather + AND-reduce
+    groups: Dict[int, List[int]] = {}
+    for p, cols in enumerate(masks.required):
+        groups.setdefault(len(cols), []).append(p)
+    pairs = []
+    for k, plist in groups.items():
+        req = np.array([masks.required[p] or [len(columns)] for p in plist], dtype=np.int64).reshape(len(plist), -1)
+        for start in range(0, len(plist), batch):
+            prow = np.array(plist[start:start + batch], dtype=np.int64)
+            sat = np.bitwise_and.reduce(seeds[req[start:start + batch]], axis=1)
+            new = sat & ~done[prow]
+            for p, fire, fresh in zip(prow.tolist(), _popcount_rows(sat).tolist(), _popcount_rows(new).tolist()):
+                report.would_fire[p] += fire
+                report.new[p] += fresh
+            if per_save is not None:
+                bits = np.unpackbits(sat.view(np.uint8), axis=1, bitorder="little")[:, :n]
+                new_bits = np.unpackbits(new.view(np.uint8), axis=1, bitorder="little")[:, :n]
+                ps, players = np.nonzero(bits)
+                pairs.extend(zip(prow[ps].tolist(), players.tolist(), new_bits[ps, players].astype(bool).tolist()))
+    if per_save is not None:
+        _per_save_lists(masks, chunk, pairs, per_save)
+
+
+def evaluate(rows: Iterable[SaveRow], payoffs: Dict[str, Dict], use_numpy: bool = True, chunk_size: int = 16384,
+             batch: int = 1024, per_save: Optional[PerSave] = None) -> PopulationReport:
+    """
+    Evaluate every payoff against every save in `rows` (streamed, chunk_size saves at a time).
+    `per_save`, if given, is called once per save with the payoff ids it would fire.
+    """
+    masks = payoffs if isinstance(payoffs, PayoffMasks) else PayoffMasks(payoffs)
+    engine = "numpy" if use_numpy and np is not None else "python"
+    report = PopulationReport(masks, engine)
+    started = time.perf_counter()
+    for chunk in _chunks(rows, max(1, chunk_size)):
+        if engine == "numpy":
+            _eval_chunk_numpy(masks, chunk, report, per_save, max(1, batch))
+        else:
+            _eval_chunk_python(masks, chunk, report, per_save)
+        report.saves += len(chunk)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def save_row(save_id: str, state: Dict) -> SaveRow:
+    """A player state (player_state_from_save shape) as an evaluator row."""
+    chron = [e.get("id") if isinstance(e, dict) else e for e in state.get("chronicle", [])]
+    return save_id, chron, (state.get("flags") or {}).get("payoffs_triggered", [])
+
+
+def iter_save_files(paths: Iterable[str]) -> Iterator[str]:
+    """Save files under `paths` (files as given, folders walked recursively), in a stable order."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def load_rows(paths: Iterable[str], seeds_index: Optional[Dict] = None, skipped: Optional[List[str]] = None
+              ) -> Iterator[SaveRow]:
+    """Decode save files of either codec and either layout into evaluator rows."""
+    for path in iter_save_files(paths):
+        try:
+            with open(path, "rb") as f:
+                doc = decode_save(f.read(), seeds_index)
+            if not isinstance(doc, dict):
+                raise ValueError("not a save document")
+        except Exception as e:
+            if skipped is not None:
+                skipped.append(f"{path}: {e}")
+            continue
+        yield save_row(path, player_state_from_save(doc))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate payoffs.json against many saves at once (read-only).")
+    parser.add_argument("paths", nargs="+", help="save files or folders (walked recursively)")
+    parser.add_argument("--data", default=os.path.join(os.path.dirname(__file__), "..", "data"))
+    parser.add_argument("--payoffs", help="payoffs.json to evaluate (default: the content's own)")
+    parser.add_argument("--chunk", type=int, default=16384, help="saves evaluated per bitset chunk")
+    parser.add_argument("--no-numpy", action="store_true", help="force the pure-Python engine")
+    parser.add_argument("--per-save", metavar="FILE", help="write one JSON line per save with the payoffs it fires")
+    parser.add_argument("--json", dest="json_out", help="write the full report to this file")
+    parser.add_argument("--top", type=int, default=20, help="payoffs listed in the summary")
+    args = parser.parse_args(argv)
+
+    content = load_content(os.path.normpath(args.data))
+    if args.payoffs:
+        with open(args.payoffs, "r", encoding="utf-8") as f:
+            payoffs = json.load(f)
+    else:
+        payoffs = content["files"].get("payoffs.json") or {}
+    skipped: List[str] = []
+    out = open(args.per_save, "w", encoding="utf-8") if args.per_save else None
+    try:
+        per_save = None
+        if out is not None:
+            def per_save(sid, fired, new):
+                out.write(json.dumps({"save": sid, "fires": fired, "new": new}) + "\n")
+        report = evaluate(load_rows(args.paths, shared_seed_table(content), skipped), payoffs,
+                          use_numpy=not args.no_numpy, chunk_size=args.chunk, per_save=per_save)
+    finally:
+        if out is not None:
+            out.close()
+
+    for line in skipped:
+        print(f"[PayoffEval] Skipped {line}", file=sys.stderr)
+    data = report.as_dict()
+    print(f"[PayoffEval] {report.saves} save(s) x {len(report.masks)} payoff(s) in {report.seconds:.2f}s "
+          f"({report.engine} engine, {len(skipped)} skipped)")
+    ranked = sorted(data["results"].items(), key=lambda kv: (-kv[1]["would_fire"], kv[0]))
+    for pid, res in ranked[:max(0, args.top)]:
+        print(f"  {pid:<24} fires for {res['would_fire']:>8} ({res['rate']:7.2%}), new for {res['new']:>8}")
+    never = sum(1 for _, res in ranked if not res["would_fire"])
+    if never:
+        print(f"  {never} payoff(s) fire for no save")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,43 @@
 # src/payoff_manager.py
 import json
 import os
+import weakref
 from typing import Dict, List
 
+from . import metrics
+
+class _PlayerPayoffState:
+    """Per-player progress: which Chronicle ids were seen and how many requirements remain."""
+    __slots__ = ("entries", "generation", "seen", "seen_ids", "remaining", "ready", "pending",
+                 "fired", "fired_src", "fired_len")
+
+    def __init__(self, entries, remaining: Dict[str, int]):
+        self.entries = entries          # the Chronicle entry list this state was built from
+        self.generation = 0             # entries.generation at build time (IdList removals)
+        self.seen = 0                   # how many entries have been folded in
+        self.seen_ids = set()
+        self.remaining = remaining      # payoff id -> unmet requirement count
+        self.ready = {pid for pid, n in remaining.items() if n == 0}
+        self.pending = set(self.ready)  # ready but not yet checked against triggered flags
+        self.fired = set()              # mirror of player.flags['payoffs_triggered']
+        self.fired_src = None
+        self.fired_len = 0
+
+
 class PayoffManager:
     """
     Loads payoffs from data/payoffs.json and can check a player's Chronicle
     for unlocked payoffs. Keeps track of triggered payoffs on player.flags['payoffs_triggered'].
+
+    Requirements are indexed by seed id, and each player keeps remaining-requirement
+    counters, so a check only touches payoffs that mention newly mirrored seeds.
     """
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, payoffs: Dict = None):
         self.data_dir = data_dir
-        self.payoffs = self._load_payoffs()
+        # payoffs may be handed over from the content bundle to avoid re-reading the file
+        self.payoffs = payoffs if payoffs is not None else self._load_payoffs()
+        self._build_index()
+        self._states = weakref.WeakKeyDictionary()
 
     def _load_payoffs(self) -> Dict:
         pfile = os.path.join(self.data_dir, "payoffs.json")
@@ -21,6 +48,44 @@ class PayoffManager:
             print(f"[PayoffManager] Failed to load payoffs.json: {e}")
             return {}
 
+    def _build_index(self):
+        self._required = {}     # payoff id -> frozenset of required seed ids
+        self._order = {}        # payoff id -> position in payoffs.json (stable trigger order)
+        self._by_seed = {}      # seed id -> [payoff ids requiring it]
+        for pos, (pid, pdata) in enumerate(self.payoffs.items()):
+            reqs = frozenset(pdata.get("required_seeds", []))
+            self._required[pid] = reqs
+            self._order[pid] = pos
+            for sid in reqs:
+                self._by_seed.setdefault(sid, []).append(pid)
+
+    def _state(self, player) -> _PlayerPayoffState:
+        """Return the player's state, folding in only Chronicle entries added since the last call."""
+        entries = player.chronicle.entries
+        state = self._states.get(player)
+        generation = getattr(entries, 'generation', 0)
+        if (state is None or state.entries is not entries or len(entries) < state.seen
+                or state.generation != generation):
+            # first sight of this player, or the Chronicle was replaced (load / new game)
+            state = _PlayerPayoffState(entries, {pid: len(r) for pid, r in self._required.items()})
+            state.generation = generation
+            self._states[player] = state
+        if len(entries) > state.seen:
+            fresh = entries.newest(len(entries) - state.seen) if hasattr(entries, 'newest') else entries[state.seen:]
+            for e in fresh:
+                sid = e['id']
+                if sid in state.seen_ids:
+                    continue
+                state.seen_ids.add(sid)
+                for pid in self._by_seed.get(sid, ()):
+                    state.remaining[pid] -= 1
+                    if state.remaining[pid] == 0:
+                        state.ready.add(pid)
+                        state.pending.add(pid)
+            state.seen = len(entries)
+        return state
+
+    @metrics.timed("payoff.check")
     def check_and_trigger(self, player) -> List[Dict]:
         """
         Check all payoffs; if requirements met and not yet triggered, trigger them
@@ -28,24 +93,38 @@ class PayoffManager:
         Returns list of triggered payoff dicts.
         """
         triggered = player.flags.get("payoffs_triggered", [])
-        chronicle_ids = {e['id'] for e in player.chronicle.entries}
+        state = self._state(player)
+        if triggered is not state.fired_src or len(triggered) != state.fired_len:
+            # flags were loaded or edited outside this manager: resync once
+            state.fired = set(triggered)
+            state.pending = state.ready - state.fired
         newly_triggered = []
-        for pid, pdata in self.payoffs.items():
-            if pid in triggered:
-                continue
-            reqs = set(pdata.get("required_seeds", []))
-            if reqs.issubset(chronicle_ids):
+        if state.pending:
+            for pid in sorted(state.pending - state.fired, key=self._order.__getitem__):
+                pdata = self.payoffs[pid]
                 print(f"[Payoff] Payoff unlocked: {pdata.get('title')} ({pid})")
                 triggered.append(pid)
+                state.fired.add(pid)
                 newly_triggered.append(pdata)
+            state.pending.clear()
+            metrics.count("payoff.fired", len(newly_triggered))
+        state.fired_src = triggered
+        state.fired_len = len(triggered)
         player.flags["payoffs_triggered"] = triggered
         return newly_triggered
 
-    def list_locked(self, player) -> List[Dict]:
-        chronicle_ids = {e['id'] for e in player.chronicle.entries}
+    def list_locked(self, player, graph=None) -> List[Dict]:
+        """
+        Payoffs whose requirements are not yet in the Chronicle. With a ContentGraph,
+        each entry also says whether it is still attainable through play.
+        """
+        state = self._state(player)
         locked = []
-        for pid, pdata in self.payoffs.items():
-            reqs = set(pdata.get("required_seeds", []))
-            if not reqs.issubset(chronicle_ids):
-                locked.append({"id": pid, "title": pdata.get("title"), "missing": list(reqs - chronicle_ids)})
+        for pid, left in state.remaining.items():
+            if left:
+                entry = {"id": pid, "title": self.payoffs[pid].get("title"),
+                         "missing": list(self._required[pid] - state.seen_ids)}
+                if graph is not None:
+                    entry["attainable"] = graph.is_attainable(pid, state.seen_ids)
+                locked.append(entry)
         return locked
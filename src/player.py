@@ -1,22 +1,28 @@
 # src/player.py
-from typing import List, Dict
+from typing import Dict, Optional
+
 from .chronicle import Chronicle
+from .containers import IdList
+from .seed import resolve_entry, resolve_seed, to_record
 
 class Player:
+    # slotted: a hosted process keeps one of these per session
+    __slots__ = ("name", "inventory", "relationships", "chronicle", "flags", "__weakref__")
+
     def __init__(self, name="Player"):
         self.name = name
-        self.inventory: List[Dict] = []      # list of seed dicts (id, desc, ...)
+        self.inventory = IdList()      # ordered Seed references (src/seed.py), O(1) lookup by id
         self.relationships = {}
         self.chronicle = Chronicle()
         self.flags = {}   # storage for arbitrary flags (e.g. triggered payoffs)
 
 
     def add_seed(self, seed):
-        # seed: dict with id, desc, essential_for_payoff, mirror_on_pickup
-        if any(s['id'] == seed['id'] for s in self.inventory):
+        # seed: Seed (or dict) with id, desc, essential_for_payoff, mirror_on_pickup
+        if seed['id'] in self.inventory:
             print(f"[Inventory] {seed['id']} already collected.")
             return False
-        self.inventory.append(seed)
+        self.inventory.add(seed)
         print(f"[Inventory] Picked up seed {seed['id']}.")
         if seed.get("mirror_on_pickup") or seed.get("essential_for_payoff"):
             # mirror essential or flagged seeds
@@ -31,3 +37,23 @@ class Player:
         for s in self.inventory:
             print(f"{s['id']}: {s.get('desc','(no desc)')}")
         print("-----------------")
+
+    # ---- save boundary: plain dicts out, shared Seed references in ----
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'inventory': [to_record(s) for s in self.inventory],
+            'chronicle': [to_record(e) for e in self.chronicle.entries],
+            'relationships': self.relationships,
+            'flags': self.flags,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, seeds: Optional[Dict] = None) -> "Player":
+        """Rebuild from a save payload; entries matching `seeds` (the content table) become references."""
+        p = cls(name=data.get('name', 'Player'))
+        p.inventory = IdList(resolve_seed(s, seeds) for s in data.get('inventory', []))
+        p.chronicle.entries = IdList(resolve_entry(e, seeds) for e in data.get('chronicle', []))
+        p.relationships = dict(data.get('relationships', {}))
+        p.flags = dict(data.get('flags', {}))
+        return p
@@ -1,24 +1,186 @@
 # src/relationship.py
-from typing import Dict, List
+"""
+Affinities plus data-driven threshold events per NPC.
+
+data/relationships.json maps an NPC name (or "*" for every NPC) to events:
+
+    {"*":    [{"id": "romance", "threshold": 5, "direction": "up", "flag": "romance"}],
+     "Hana": [{"id": "rivalry", "threshold": -3, "direction": "down", "flag": "rival",
+               "text": "Hana no longer hides her contempt."}]}
+
+"up" fires when affinity rises from below the threshold to at least it, "down"
+when it falls from above to at most it. Events fire once per player unless
+`"repeat": true`. `flag` sets (or with `"clear": true` clears) a per-NPC flag;
+such an event only fires when it changes the flag, so a clear never fires for
+a flag that was never set. Make set/clear pairs repeatable so the flag can be
+earned and lost more than once.
+Flags are also level-triggered once: on the first change of an NPC's affinity
+after the manager is built (each load), a flag-setting "up" event fires if the
+affinity is already at or past its threshold and the player has never had the
+flag (older or hand-edited saves, a threshold lowered in content). A flag an
+event cleared stays cleared.
+Each NPC's events are compiled into sorted threshold arrays, so a change
+costs O(log thresholds + fired) however many beats are defined.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+EVENTS_FLAG = "relationship_events"     # player.flags key: ids of once-only events already fired
+NPC_FLAGS_FLAG = "relationship_flags"   # player.flags key: {npc: {flag: bool}}
+
+
+class _NpcTable:
+    """Events of one NPC, split by direction and sorted by threshold."""
+    __slots__ = ("up_keys", "up", "down_keys", "down")
+
+    def __init__(self, events: List[Dict]):
+        up = sorted((e for e in events if e["direction"] == "up"), key=lambda e: e["threshold"])
+        down = sorted((e for e in events if e["direction"] == "down"), key=lambda e: e["threshold"])
+        self.up_keys = [e["threshold"] for e in up]
+        self.up = up
+        self.down_keys = [e["threshold"] for e in down]
+        self.down = down
+
+    def reached(self, level: int) -> List[Dict]:
+        """"up" events at or below `level`, lowest threshold first."""
+        return self.up[:bisect_right(self.up_keys, level)]
+
+    def crossed(self, old: int, new: int) -> List[Dict]:
+        """Events crossed moving old -> new, in the order they were passed."""
+        if new > old:
+            # old < threshold <= new
+            return self.up[bisect_right(self.up_keys, old):bisect_right(self.up_keys, new)]
+        if new < old:
+            # new <= threshold < old, passed from the top down
+            hit = self.down[bisect_left(self.down_keys, new):bisect_left(self.down_keys, old)]
+            hit.reverse()
+            return hit
+        return []
+
+
+class RelationshipTriggers:
+    """Compiled relationships.json; read-only, so one instance can serve every session."""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data if data is not None else {"*": [RelationshipManager.default_romance_event()]}
+        self._events: Dict[str, List[Dict]] = {}
+        for npc, events in (data or {}).items():
+            good = []
+            for e in events or []:
+                if (not isinstance(e, dict) or not e.get("id") or e.get("direction") not in ("up", "down")
+                        or not isinstance(e.get("threshold"), (int, float))):
+                    print(f"[Relation] Ignoring malformed trigger for {npc}: {e}")
+                    continue
+                good.append(e)
+            self._events[npc] = good
+        self._tables: Dict[str, _NpcTable] = {}
+
+    def table(self, npc: str) -> _NpcTable:
+        t = self._tables.get(npc)
+        if t is None:
+            t = self._tables[npc] = _NpcTable(self._events.get("*", []) + self._events.get(npc, []))
+        return t
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._events.values())
+
 
 class RelationshipManager:
     """
-    Simple affinity manager. Stores affinities and romance flags.
-    Thresholds are intentionally small for easier testing; tweak as needed.
+    Stores affinities and fires threshold events (see module docstring).
+    Without relationships.json the only event is the classic romance flag at ROMANCE_THRESHOLD.
     """
     ROMANCE_THRESHOLD = 5
 
-    def __init__(self, affinities: Dict[str, int]=None, romance_flags: Dict[str, bool]=None):
+    def __init__(self, affinities: Dict[str, int]=None, romance_flags: Dict[str, bool]=None,
+                 triggers: Optional[RelationshipTriggers] = None, flags: Optional[Dict] = None):
         self.affinities = affinities if affinities is not None else {}
         self.romance_flags = romance_flags if romance_flags is not None else {}
+        self.triggers = triggers if triggers is not None else RelationshipTriggers()
+        # player.flags (when given) holds fired once-only events and NPC flags, so saves keep them;
+        # the keys are only created when the first event fires, so untouched saves stay unchanged
+        self._flags = flags if flags is not None else {}
+        self._fired_set = set(self.fired)
+        self._caught_up = set()         # NPCs whose missing level-triggered flags were checked
+        for npc, fl in self.npc_flags.items():
+            if fl.get("romance"):
+                self.romance_flags[npc] = True
 
-    def change_affinity(self, npc_name: str, delta: int):
-        cur = self.affinities.get(npc_name, 0) + delta
+    @property
+    def fired(self) -> List[str]:
+        """Ids ("npc:event") of once-only events already fired."""
+        return self._flags.get(EVENTS_FLAG, [])
+
+    @property
+    def npc_flags(self) -> Dict[str, Dict[str, bool]]:
+        return self._flags.get(NPC_FLAGS_FLAG, {})
+
+    @classmethod
+    def default_romance_event(cls) -> Dict:
+        return {"id": "romance", "threshold": cls.ROMANCE_THRESHOLD, "direction": "up", "flag": "romance",
+                "text": "{npc} romance flag SET."}
+
+    def change_affinity(self, npc_name: str, delta: int) -> List[Dict]:
+        """Apply one delta; returns the events it fired."""
+        old = self.affinities.get(npc_name, 0)
+        cur = old + delta
         self.affinities[npc_name] = cur
         print(f"[Relation] {npc_name} affinity -> {cur}")
-        if cur >= self.ROMANCE_THRESHOLD and not self.romance_flags.get(npc_name, False):
-            self.romance_flags[npc_name] = True
-            print(f"[Relation] {npc_name} romance flag SET.")
+        return self._cross(npc_name, old, cur)
+
+    def apply_deltas(self, deltas: Iterable[Tuple[str, int]]) -> List[Dict]:
+        """
+        Apply a multi-NPC effect map ({npc: delta} items) as one batch: deltas for the
+        same NPC are summed, thresholds are checked once per NPC, one summary line is printed.
+        """
+        totals: Dict[str, int] = {}
+        for npc, delta in deltas:
+            totals[npc] = totals.get(npc, 0) + delta
+        if not totals:
+            return []
+        fired, parts = [], []
+        for npc, delta in totals.items():
+            old = self.affinities.get(npc, 0)
+            cur = old + delta
+            self.affinities[npc] = cur
+            parts.append(f"{npc} {delta:+d} ({cur})")
+            fired.extend(self._cross(npc, old, cur))
+        print(f"[Relation] {', '.join(parts)}")
+        return fired
+
+    def _missing_flags(self, npc: str, table: _NpcTable, level: int) -> List[Dict]:
+        """Flag-setting "up" events already reached whose flag the player has never had."""
+        known = self.npc_flags.get(npc, {})
+        return [e for e in table.reached(level)
+                if e.get("flag") and not e.get("clear") and e["flag"] not in known
+                and not (e["flag"] == "romance" and self.romance_flags.get(npc))]
+
+    def _cross(self, npc: str, old: int, cur: int) -> List[Dict]:
+        fired = []
+        table = self.triggers.table(npc)
+        events = table.crossed(old, cur)
+        if npc not in self._caught_up:
+            self._caught_up.add(npc)
+            events = self._missing_flags(npc, table, min(old, cur)) + events
+        for event in events:
+            key = f"{npc}:{event['id']}"
+            repeat = event.get("repeat", False)
+            if not repeat and key in self._fired_set:
+                continue
+            flag = event.get("flag")
+            value = not event.get("clear", False)
+            if flag and self.has_flag(npc, flag) == value:
+                continue    # nothing to change: no clear before a set, no second set
+            if not repeat:
+                self._fired_set.add(key)
+                self._flags.setdefault(EVENTS_FLAG, []).append(key)
+            if flag:
+                self._flags.setdefault(NPC_FLAGS_FLAG, {}).setdefault(npc, {})[flag] = value
+                if flag == "romance":
+                    self.romance_flags[npc] = value
+            print(f"[Relation] {event.get('text', '{npc}: ' + event['id']).format(npc=npc)}")
+            fired.append(dict(event, npc=npc))
+        return fired
 
     def get_affinity(self, npc_name: str) -> int:
         return self.affinities.get(npc_name, 0)
@@ -26,11 +188,15 @@ class RelationshipManager:
     def get_romances(self) -> List[str]:
         return [n for n, v in self.romance_flags.items() if v]
 
+    def has_flag(self, npc_name: str, flag: str) -> bool:
+        return bool(self.npc_flags.get(npc_name, {}).get(flag))
+
     def to_dict(self) -> Dict:
-        return {"affinities": self.affinities, "romance_flags": self.romance_flags}
+        return {"affinities": self.affinities, "romance_flags": self.romance_flags,
+                "events": list(self.fired), "npc_flags": self.npc_flags}
 
     @classmethod
-    def from_player_data(cls, player_data: Dict):
+    def from_player_data(cls, player_data: Dict, triggers: Optional[RelationshipTriggers] = None):
         affin = player_data.get("relationships", {})
         romance = player_data.get("romance_flags", {})
-        return cls(affinities=affin, romance_flags=romance)
+        return cls(affinities=affin, romance_flags=romance, triggers=triggers, flags=player_data.get("flags"))
@@ -0,0 +1,129 @@
+# src/renderer.py
+"""
+Buffered ANSI terminal renderer behind the interactive Console.
+
+Output is collected into a frame buffer and written with a single write()
+when the game next waits (input, toast pause, exit), instead of one syscall
+per print. Screen clears are ANSI escape codes rather than a `clear`/`cls`
+child process. `header()` remembers the header block it last drew and, while
+that block is still at the top of the screen, rewrites only the lines that
+changed and erases the body below it.
+"""
+import atexit
+import os
+import shutil
+import sys
+import threading
+from typing import List, Optional, TextIO
+
+CSI = "\x1b["
+HOME = CSI + "H"
+CLEAR_SCREEN = CSI + "2J"
+CLEAR_LINE_END = CSI + "K"
+CLEAR_BELOW = CSI + "J"
+
+
+def _goto(row: int) -> str:
+    return f"{CSI}{row};1H"
+
+
+class _BufferWriter:
+    """File-like front end so redirected print() calls land in the frame buffer."""
+
+    def __init__(self, renderer: "TerminalRenderer"):
+        self._renderer = renderer
+
+    def write(self, s: str) -> int:
+        self._renderer.write(s)
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+class TerminalRenderer:
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream            # None: whatever sys.stdout is outside capture()
+        self.frames = 0                 # flushed frames (one write each)
+        self._buf: List[str] = []
+        self._lock = threading.Lock()
+        self._outer: Optional[TextIO] = None
+        self._header: List[str] = []    # header lines currently on screen
+        self._rows_below = 0            # terminal rows used since the header was drawn
+        self._header_valid = False
+        if os.name == "nt":
+            os.system("")               # once: switches the Windows console to VT mode
+        atexit.register(self.flush)
+
+    def _target(self) -> TextIO:
+        return self.stream or self._outer or sys.stdout
+
+    # ---- frame buffer ----
+    def write(self, text: str):
+        if not text:
+            return
+        with self._lock:
+            self._buf.append(text)
+            if self._header_valid:
+                cols = max(1, shutil.get_terminal_size().columns)
+                self._rows_below += sum(len(line) // cols for line in text.split("\n")) + text.count("\n")
+
+    def input_echoed(self):
+        """The user's Enter moved the cursor down a line (keeps scroll tracking honest)."""
+        with self._lock:
+            self._rows_below += 1
+
+    def flush(self):
+        with self._lock:
+            if not self._buf:
+                return
+            frame = "".join(self._buf)
+            self._buf = []
+            self.frames += 1
+        out = self._target()
+        out.write(frame)
+        out.flush()
+
+    # ---- screen control ----
+    def clear(self):
+        with self._lock:
+            self._buf.append(HOME + CLEAR_SCREEN)
+            self._header_valid = False
+
+    def header(self, lines: List[str]):
+        """Draw the header block at the top of a fresh screen, redrawing only changed lines."""
+        rows = shutil.get_terminal_size().lines
+        with self._lock:
+            fits = len(self._header) + self._rows_below < rows - 1
+            if self._header_valid and fits and len(lines) == len(self._header):
+                parts = [_goto(i + 1) + new + CLEAR_LINE_END
+                         for i, (old, new) in enumerate(zip(self._header, lines)) if old != new]
+                parts.append(_goto(len(lines) + 1) + CLEAR_BELOW)
+            else:
+                parts = [HOME + CLEAR_SCREEN] + [line + "\n" for line in lines]
+            self._buf.extend(parts)
+            self._header = list(lines)
+            self._rows_below = 0
+            self._header_valid = True
+
+    # ---- stdout routing ----
+    def capture(self):
+        return _Capture(self)
+
+
+class _Capture:
+    def __init__(self, renderer: TerminalRenderer):
+        self.renderer = renderer
+
+    def __enter__(self):
+        r = self.renderer
+        self._saved = sys.stdout
+        r._outer = self._saved
+        sys.stdout = _BufferWriter(r)
+        return r
+
+    def __exit__(self, *exc):
+        sys.stdout = self._saved
+        self.renderer.flush()
+        self.renderer._outer = None
+        return False
@@ -0,0 +1,268 @@
+# src/replay.py
+"""
+Session recording and max-speed replay.
+
+Every line the game reads (main menu, scene choices, combat, confirms, the
+anchor mini-game) goes through `Console.read`, so `RecordingConsole` wraps
+any console and logs those lines. A log is JSON lines:
+
+    {"replay": 3, "seed": ..., "content": "<content hash>", "save_mode": ..., "codec": ...,
+     "autosave": false}
+    "5"
+    "2"
+    {"saves": {"files": {name: base64}, "mtimes": {name: ns}, "slots": [[slot, doc, saved_at], ...]}}
+    "1"
+    ...
+    {"end": "<player state hash>", "inputs": N}
+
+Each input is appended and flushed as it is read, so a crashed session still
+leaves a usable log (without the end line). `replay()` feeds the inputs to
+a headless Game with the same seed and options, with no sleeps or clears, in a
+throwaway saves folder, and compares the final player state hash.
+
+The first time the session lists, reads or writes a save that already existed,
+its bytes (save file plus journal snapshot, or SQLite slot) are logged as a
+"saves" line, so the log grows with the saves the session used, not with the
+player's save history. Replay restores all of them first; saves no session
+step touched are never listed (menus page newest first), so load menus show
+the same slots and loads read the same bytes. Recorded sessions never
+autosave, so autosave.json cannot appear mid-session in one run and not in
+the other. Format 1 logs (no saves captured) are refused: a load in them
+cannot be reproduced.
+
+    python -m src.game --record bug.replay
+    python -m src.replay bug.replay [more.replay ...]     # exit 1 on any mismatch
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from .autosave import snapshot_player
+from .console import Console, HeadlessConsole
+from .journal import JOURNAL_EXT, SNAPSHOT_EXT
+from .save_codec import EXTENSIONS as SAVE_EXTENSIONS
+
+REPLAY_FORMAT = 3     # 2: the header carries every save; 3: saves are logged when first touched
+_READABLE_FORMATS = (2, REPLAY_FORMAT)
+_SAVE_FILE_EXTS = SAVE_EXTENSIONS + (JOURNAL_EXT, SNAPSHOT_EXT)
+
+
+def player_state_hash(player) -> str:
+    """SHA-256 over the save-shaped player state (the timestamp is left out)."""
+    state = snapshot_player(player)
+    state.pop('saved_at', None)
+    blob = json.dumps(state, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def capture_saves(game, names) -> Dict:
+    """The current bytes of the named saves: SQLite slots, or save files (plus journal snapshots)."""
+    if game.store is not None:
+        slots = []
+        for slot in names:
+            info = game.store.info(slot)
+            if info is not None:
+                slots.append([slot, game.store.get(slot), info.saved_at])
+        return {"files": {}, "mtimes": {}, "slots": slots}
+    files, mtimes = {}, {}
+    for name in names:
+        related = [name]
+        if name.endswith(JOURNAL_EXT):
+            related.append(name[:-len(JOURNAL_EXT)] + SNAPSHOT_EXT)
+        for fname in related:
+            path = os.path.join(game.saves_dir, fname)
+            if fname.endswith(_SAVE_FILE_EXTS) and os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    files[fname] = base64.b64encode(f.read()).decode('ascii')
+                mtimes[fname] = os.stat(path).st_mtime_ns   # the load menu lists files newest first
+    return {"files": files, "mtimes": mtimes, "slots": []}
+
+
+def restore_saves(saves: Dict, saves_dir: str):
+    """Write a capture_saves() result into saves_dir."""
+    from .save_store import SaveStore, STORE_NAME
+    os.makedirs(saves_dir, exist_ok=True)
+    mtimes = saves.get("mtimes", {})
+    for name, data in saves.get("files", {}).items():
+        path = os.path.join(saves_dir, os.path.basename(name))
+        with open(path, 'wb') as f:
+            f.write(base64.b64decode(data))
+        if name in mtimes:
+            os.utime(path, ns=(mtimes[name], mtimes[name]))
+    if saves.get("slots"):
+        store = SaveStore(os.path.join(saves_dir, STORE_NAME))
+        try:
+            for slot, doc, saved_at in saves["slots"]:
+                store.put(slot, doc, saved_at)
+        finally:
+            store.close()
+
+
+class RecordingConsole(Console):
+    """Delegates to `inner` and appends every line read to a replay log."""
+
+    def __init__(self, inner: Console, path: str):
+        self.inner = inner
+        self.path = path
+        self.headless = getattr(inner, 'headless', False)
+        self.count = 0
+        self._log = None
+        self._early: List[str] = []     # reads before begin() are written right after the header
+        self._touched = set()           # save names already captured (or created by this session)
+
+    def begin(self, game):
+        """Write the header; call once the Game exists (its seed and content hash are known)."""
+        self._log = open(self.path, 'w', encoding='utf-8')
+        header = {"replay": REPLAY_FORMAT, "seed": game.rng.seed_value, "content": game.content.get('hash'),
+                  "save_mode": game.save_mode, "codec": game.save_codec.name,
+                  "autosave": bool(game.autosave)}
+        self._log.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for line in self._early:
+            self._append(line)
+        self._early = []
+        self._log.flush()
+        game.save_observer = self._saves_touched
+
+    def _saves_touched(self, game, names):
+        """Log the bytes of saves the session lists, reads or writes for the first time."""
+        fresh = [name for name in dict.fromkeys(names) if name not in self._touched]
+        if not fresh or self._log is None:
+            return
+        self._touched.update(fresh)
+        saves = capture_saves(game, fresh)
+        if saves["files"] or saves["slots"]:
+            self._log.write(json.dumps({"saves": saves}, separators=(",", ":")) + "\n")
+            self._log.flush()
+
+    def end(self, game):
+        game.save_observer = None
+        if self._log is None:
+            return
+        self._log.write(json.dumps({"end": player_state_hash(game.player), "inputs": self.count},
+                                   separators=(",", ":")) + "\n")
+        self._log.close()
+        self._log = None
+
+    def _append(self, line: str):
+        self._log.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    def read(self, prompt: str = "") -> str:
+        line = self.inner.read(prompt)
+        self.count += 1
+        if self._log is None:
+            self._early.append(line)
+        else:
+            self._append(line)
+            self._log.flush()
+        return line
+
+    def write(self, *parts, sep: str = " ", end: str = "\n"):
+        self.inner.write(*parts, sep=sep, end=end)
+
+    def clear(self):
+        self.inner.clear()
+
+    def header(self, lines):
+        self.inner.header(lines)
+
+    def flush(self):
+        self.inner.flush()
+
+    def pause(self, seconds: float):
+        self.inner.pause(seconds)
+
+    def clock(self) -> float:
+        return self.inner.clock()
+
+    def capture(self):
+        return self.inner.capture()
+
+
+def load_log(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or not isinstance(lines[0], dict) or "replay" not in lines[0]:
+        raise ValueError(f"{path} is not a replay log")
+    if lines[0]["replay"] not in _READABLE_FORMATS:
+        raise ValueError(f"{path}: replay format {lines[0]['replay']} does not record the saves the session "
+                         f"could load, so it cannot be replayed reliably; record it again")
+    log = dict(lines[0])
+    log["inputs"] = [line for line in lines[1:] if isinstance(line, str)]
+    saves = {"files": {}, "mtimes": {}, "slots": []}
+    events = [line["saves"] for line in lines[1:] if isinstance(line, dict) and "saves" in line]
+    for part in [log.get("saves")] + events:
+        if part:
+            saves["files"].update(part.get("files", {}))
+            saves["mtimes"].update(part.get("mtimes", {}))
+            saves["slots"].extend(part.get("slots", []))
+    log["saves"] = saves
+    tail = lines[-1]
+    log["end"] = tail.get("end") if isinstance(tail, dict) and len(lines) > 1 else None
+    return log
+
+
+class ReplayResult(NamedTuple):
+    path: str
+    ok: bool
+    expected: Optional[str]
+    actual: str
+    inputs: int
+    seconds: float
+    content_changed: bool
+
+
+def replay(path: str, saves_dir: Optional[str] = None, sink=None) -> ReplayResult:
+    """Re-run a recorded session headlessly and compare the final state hash."""
+    from .game import Game
+    log = load_log(path)
+    console = HeadlessConsole(log["inputs"], sink=sink)
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="replay-") as tmp:
+        saves_dir = saves_dir or tmp
+        restore_saves(log["saves"], saves_dir)
+        game = Game(console=console, save_mode=log["save_mode"], save_codec=log["codec"],
+                    autosave=log["autosave"], seed=log["seed"], saves_dir=saves_dir)
+        game.run()
+        actual = player_state_hash(game.player)
+    elapsed = time.perf_counter() - started
+    expected = log["end"]
+    return ReplayResult(path, expected is None or expected == actual, expected, actual, console.consumed,
+                        elapsed, log.get("content") != game.content.get("hash"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded sessions and verify the final player state.")
+    parser.add_argument("logs", nargs="+", help="replay logs written by python -m src.game --record")
+    parser.add_argument("--saves", help="saves folder for the replay (default: a temporary folder)")
+    parser.add_argument("--verbose", action="store_true", help="show the game output")
+    args = parser.parse_args(argv)
+    failed = 0
+    for path in args.logs:
+        try:
+            res = replay(path, saves_dir=args.saves, sink=sys.stdout if args.verbose else None)
+        except ValueError as e:
+            failed += 1
+            print(f"[Replay] {e}")
+            continue
+        note = " (content changed since recording)" if res.content_changed else ""
+        if res.expected is None:
+            print(f"[Replay] {path}: {res.inputs} input(s) in {res.seconds * 1000:.1f} ms, "
+                  f"no end hash recorded (session crashed?){note}")
+        elif res.ok:
+            print(f"[Replay] {path}: OK, {res.inputs} input(s) in {res.seconds * 1000:.1f} ms{note}")
+        else:
+            failed += 1
+            print(f"[Replay] {path}: MISMATCH after {res.inputs} input(s){note}")
+            print(f"  expected {res.expected}")
+            print(f"  actual   {res.actual}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+# src/rng.py
+import hashlib
+import os
+import random
+from typing import Optional, Tuple
+
+
+def _derive(seed: int, path: Tuple[str, ...]) -> int:
+    h = hashlib.sha256(str(seed).encode("ascii"))
+    for key in path:
+        h.update(b"/" + key.encode("utf-8"))
+    return int.from_bytes(h.digest()[:16], "big")
+
+
+class SessionRNG(random.Random):
+    """
+    Random stream owned by one game session instead of the global `random` module.
+
+    `spawn(key)` derives an independent child stream from (master seed, key path) only,
+    not from how much of the parent has been consumed, so workers given
+    `master.spawn(i)` reproduce the same sequences no matter which process runs
+    them or in what order. Pickles with its position, for handing to worker pools.
+    """
+
+    def __init__(self, seed: Optional[int] = None, path: Tuple[str, ...] = ()):
+        self.seed_value = int.from_bytes(os.urandom(8), "big") if seed is None else int(seed)
+        self.path = tuple(path)
+        super().__init__(_derive(self.seed_value, self.path))
+
+    def spawn(self, *keys) -> "SessionRNG":
+        return SessionRNG(self.seed_value, self.path + tuple(str(k) for k in keys))
+
+    def reseed(self, seed: int):
+        """Restart this stream from a new master seed (objects holding it keep working)."""
+        self.seed_value = int(seed)
+        self.path = ()
+        self.seed(_derive(self.seed_value, self.path))
+
+    def __reduce__(self):
+        return (self.__class__, (self.seed_value, self.path), self.getstate())
+
+    def __repr__(self) -> str:
+        return f"SessionRNG(seed={self.seed_value}, path={'/'.join(self.path) or '-'})"
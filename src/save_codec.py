@@ -0,0 +1,236 @@
+# src/save_codec.py
+"""
+Save codecs: turn a save payload (Game._save_payload shape) into bytes and back.
+
+  json    the historical format (pretty-printed UTF-8 JSON, .json)
+  binary  compact encoding (.sav): magic + version + flags, then a per-save
+          string table and a tagged value tree with varint integers. Inventory
+          seeds and Chronicle mirrors that match the content table exactly are
+          stored as a bare id reference and rebuilt from seeds.json on load.
+          The body is zlib-compressed unless the codec is built with compress=False.
+
+`decode_save` sniffs the format, so loaders accept either.
+"""
+import json
+import struct
+import zlib
+from typing import Dict, List, Optional
+
+BINARY_MAGIC = b"SHSV"
+BINARY_VERSION = 1
+_FLAG_ZLIB = 0x01
+
+# value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _SEED, _MIRROR = range(10)
+_DOUBLE = struct.Struct(">d")
+
+
+class CodecError(ValueError):
+    pass
+
+
+# ---------------- varints ----------------
+def _put_varint(out: bytearray, n: int):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf: bytes, pos: int):
+    result = shift = 0
+    while True:
+        try:
+            b = buf[pos]
+        except IndexError:
+            raise CodecError("truncated varint") from None
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+class JsonCodec:
+    name = "json"
+    extension = ".json"
+
+    def encode(self, state: Dict) -> bytes:
+        return json.dumps(state, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def decode(self, data: bytes) -> Dict:
+        return json.loads(data.decode("utf-8"))
+
+
+class BinaryCodec:
+    name = "binary"
+    extension = ".sav"
+
+    def __init__(self, seeds_index: Optional[Dict[str, Dict]] = None, compress: bool = True, level: int = 6):
+        self.seeds = seeds_index or {}
+        self.compress = compress
+        self.level = level
+
+    # ---- encoding ----
+    def encode(self, state: Dict) -> bytes:
+        strings: Dict[str, int] = {}
+        body = bytearray()
+        self._value(state, body, strings, None)
+        table = bytearray()
+        _put_varint(table, len(strings))
+        for s in strings:                       # dicts keep insertion order = index order
+            raw = s.encode("utf-8")
+            _put_varint(table, len(raw))
+            table += raw
+        payload = bytes(table + body)
+        flags = 0
+        if self.compress:
+            payload = zlib.compress(payload, self.level)
+            flags |= _FLAG_ZLIB
+        return BINARY_MAGIC + bytes((BINARY_VERSION, flags)) + payload
+
+    @staticmethod
+    def _str(s: str, out: bytearray, strings: Dict[str, int]):
+        idx = strings.get(s)
+        if idx is None:
+            idx = strings[s] = len(strings)
+        _put_varint(out, idx)
+
+    def _value(self, v, out: bytearray, strings: Dict[str, int], section: Optional[str]):
+        if v is None:
+            out.append(_NONE)
+        elif v is True:
+            out.append(_TRUE)
+        elif v is False:
+            out.append(_FALSE)
+        elif isinstance(v, int):
+            out.append(_INT)
+            _put_varint(out, (v << 1) if v >= 0 else ((-v) << 1) - 1)   # zigzag
+        elif isinstance(v, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(v)
+        elif isinstance(v, str):
+            out.append(_STR)
+            self._str(v, out, strings)
+        elif isinstance(v, dict):
+            if section is not None and self._content_ref(v, out, strings, section):
+                return
+            out.append(_DICT)
+            _put_varint(out, len(v))
+            for k, item in v.items():
+                self._str(str(k), out, strings)
+                # inventory / chronicle members are the only content-resolvable dicts
+                self._value(item, out, strings, k if section is None and k in ("inventory", "chronicle") else None)
+        elif isinstance(v, (list, tuple)) or hasattr(v, "__iter__"):
+            items = list(v)
+            out.append(_LIST)
+            _put_varint(out, len(items))
+            for item in items:
+                self._value(item, out, strings, section)
+        else:
+            raise CodecError(f"cannot encode {type(v).__name__}")
+
+    def _content_ref(self, entry: Dict, out: bytearray, strings: Dict[str, int], section: str) -> bool:
+        seed = self.seeds.get(entry.get("id"))
+        if seed is None:
+            return False
+        if section == "inventory" and entry == seed:
+            out.append(_SEED)
+        elif section == "chronicle" and entry == {"id": seed["id"], "desc": seed.get("desc", "")}:
+            out.append(_MIRROR)
+        else:
+            return False
+        self._str(entry["id"], out, strings)
+        return True
+
+    # ---- decoding ----
+    def decode(self, data: bytes) -> Dict:
+        if data[:len(BINARY_MAGIC)] != BINARY_MAGIC or len(data) < len(BINARY_MAGIC) + 2:
+            raise CodecError("not a binary save")
+        version, flags = data[len(BINARY_MAGIC)], data[len(BINARY_MAGIC) + 1]
+        if version != BINARY_VERSION:
+            raise CodecError(f"unsupported binary save version {version}")
+        payload = data[len(BINARY_MAGIC) + 2:]
+        if flags & _FLAG_ZLIB:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as e:
+                raise CodecError(f"corrupt binary save: {e}") from None
+        count, pos = _get_varint(payload, 0)
+        strings: List[str] = []
+        for _ in range(count):
+            n, pos = _get_varint(payload, pos)
+            strings.append(payload[pos:pos + n].decode("utf-8"))
+            pos += n
+        try:
+            state, pos = self._read(payload, pos, strings)
+        except IndexError:
+            raise CodecError("truncated binary save") from None
+        if not isinstance(state, dict):
+            raise CodecError("binary save does not hold a save payload")
+        return state
+
+    def _read(self, buf: bytes, pos: int, strings: List[str]):
+        tag = buf[pos]
+        pos += 1
+        if tag == _NONE:
+            return None, pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _INT:
+            z, pos = _get_varint(buf, pos)
+            return (z >> 1) if not z & 1 else -((z + 1) >> 1), pos
+        if tag == _FLOAT:
+            return _DOUBLE.unpack_from(buf, pos)[0], pos + 8
+        if tag == _STR:
+            i, pos = _get_varint(buf, pos)
+            return strings[i], pos
+        if tag == _LIST:
+            n, pos = _get_varint(buf, pos)
+            items = []
+            for _ in range(n):
+                item, pos = self._read(buf, pos, strings)
+                items.append(item)
+            return items, pos
+        if tag == _DICT:
+            n, pos = _get_varint(buf, pos)
+            d = {}
+            for _ in range(n):
+                k, pos = _get_varint(buf, pos)
+                d[strings[k]], pos = self._read(buf, pos, strings)
+            return d, pos
+        if tag in (_SEED, _MIRROR):
+            i, pos = _get_varint(buf, pos)
+            sid = strings[i]
+            seed = self.seeds.get(sid)
+            if seed is None:
+                # content no longer has this seed: keep the id rather than fail the load
+                print(f"[SaveCodec] Seed {sid} is not in the content table; loaded without details.")
+                return {"id": sid}, pos
+            if tag == _SEED:
+                return dict(seed), pos
+            return {"id": sid, "desc": seed.get("desc", "")}, pos
+        raise CodecError(f"unknown value tag {tag}")
+
+
+CODECS = {"json": JsonCodec, "binary": BinaryCodec}
+EXTENSIONS = tuple(c.extension for c in CODECS.values())
+
+
+def get_codec(name: str, seeds_index: Optional[Dict[str, Dict]] = None):
+    if name == "binary":
+        return BinaryCodec(seeds_index)
+    if name == "json":
+        return JsonCodec()
+    raise ValueError(f"unknown save codec {name!r}; use one of {', '.join(CODECS)}")
+
+
+def detect(data: bytes) -> str:
+    return "binary" if data[:len(BINARY_MAGIC)] == BINARY_MAGIC else "json"
+
+
+def decode_save(data: bytes, seeds_index: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Decode a save written by any codec."""
+    return get_codec(detect(data), seeds_index).decode(data)
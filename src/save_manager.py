@@ -1,32 +1,189 @@
 # src/save_manager.py
+import copy
 import json
 import os
 import hashlib
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
+
+from . import metrics
+from .fileio import atomic_write
+from .seed import to_record
+
+SIGNATURE_FORMAT = 2            # 1: SHA-256 over the whole payload, 2: Merkle tree
+MERKLE_SECTIONS = ("name", "inventory", "chronicle", "relationships")
+
+
+def _canonical(obj) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _leaf_key(section: str, index: int, item):
+    """Stable identity of a leaf across saves: entry id, NPC name, else position."""
+    if isinstance(item, dict) and "id" in item:
+        return (section, item["id"])
+    if section == "relationships":
+        return (section, item[0])
+    return (section, index)
+
+
+def _leaf_items(protected: Dict) -> Dict[str, List]:
+    """The values each Merkle section hashes, in signing order."""
+    player = protected.get("player", {})
+    rels = player.get("relationships", {}) or {}
+    return {
+        "name": [player.get("name")],
+        "inventory": list(player.get("inventory", [])),
+        "chronicle": list(protected.get("chronicle_entries", [])),
+        "relationships": [[npc, rels[npc]] for npc in sorted(rels)],
+    }
+
+
+def player_state_from_save(doc: Dict) -> Dict:
+    """
+    Normalize either save format to the Game payload shape
+    (name, inventory, chronicle, relationships, flags[, saved_at]):
+    plain Game saves pass through, signed SaveManager files are unwrapped.
+    """
+    if "protected_payload" in doc:
+        protected = doc.get("protected_payload") or {}
+        player = protected.get("player") or {}
+        state = {
+            "name": player.get("name", "Player"),
+            "inventory": list(player.get("inventory", [])),
+            "chronicle": list(protected.get("chronicle_entries", [])),
+            "relationships": dict(player.get("relationships", {})),
+            "flags": dict((doc.get("extra") or {}).get("flags", {})),
+        }
+    else:
+        state = {
+            "name": doc.get("name", "Player"),
+            "inventory": list(doc.get("inventory", [])),
+            "chronicle": list(doc.get("chronicle", [])),
+            "relationships": dict(doc.get("relationships", {})),
+            "flags": dict(doc.get("flags", {})),
+        }
+    if doc.get("saved_at"):
+        state["saved_at"] = doc["saved_at"]
+    return state
+
+
+def _describe(section: str, item) -> str:
+    if isinstance(item, dict) and item.get("id"):
+        return item["id"]
+    if section == "relationships" and isinstance(item, list) and item:
+        return str(item[0])
+    return repr(item)
+
 
 class SaveManager:
     """
-    Saves player state to JSON and appends a SHA-256 signature over the
-    canonical JSON payload (player + chronicle_entries) to help detect tampering.
+    Saves player state to JSON with a signature over the protected payload
+    (player + chronicle_entries) to help detect tampering.
+
+    Format 2 signs a Merkle tree: every inventory seed, Chronicle entry and
+    relationship is a leaf, so re-saving only rehashes the leaves that changed
+    (hashes are cached between saves), and the stored leaf hashes let
+    verification name the exact entry that was edited. Format 1 saves (one
+    SHA-256 over the whole payload) still verify.
+
+    With a `store` (src/save_store.SaveStore) the signed document is kept in
+    the store under `slot` (default: save file name without extension)
+    instead of a file.
     """
-    def __init__(self, save_path="saves/save.json"):
+    def __init__(self, save_path="saves/save.json", signature_format: int = SIGNATURE_FORMAT,
+                 store=None, slot: str = None):
         self.save_path = save_path
+        self.signature_format = signature_format
+        self.store = store
+        self.slot = slot or os.path.splitext(os.path.basename(save_path))[0]
+        self.tampered: List[str] = []     # entries that failed the last verification
+        self._leaf_cache: Dict = {}       # leaf key -> (value as last hashed, digest)
+        self._node_cache: Dict = {}       # (left, right) -> parent digest
         os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
 
+    @metrics.timed("save.signature")
     def _compute_signature(self, payload_obj: Dict) -> str:
         """
-        Compute SHA-256 hex signature for a JSON-serializable object.
+        Format 1: SHA-256 hex signature for a JSON-serializable object.
         We canonicalize by dumping with sort_keys=True and separators to stabilize representation.
         """
-        payload_bytes = json.dumps(payload_obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-        return hashlib.sha256(payload_bytes).hexdigest()
+        return hashlib.sha256(_canonical(payload_obj)).hexdigest()
+
+    # ---------------- Merkle signature (format 2) ----------------
+    def _leaf_hashes(self, protected: Dict) -> Dict[str, List[bytes]]:
+        """Leaf digests per section; unchanged entries come from the cache of the previous call."""
+        old, new = self._leaf_cache, {}
+        leaves = {}
+        for section, items in _leaf_items(protected).items():
+            tag = section.encode("utf-8") + b"\0"
+            digests = []
+            for i, item in enumerate(items):
+                key = _leaf_key(section, i, item)
+                hit = old.get(key)
+                if hit is not None and hit[0] == item:
+                    digest = hit[1]
+                else:
+                    digest = hashlib.sha256(b"\x00" + tag + _canonical(item)).digest()
+                    hit = (copy.deepcopy(item), digest)
+                new[key] = hit
+                digests.append(digest)
+            leaves[section] = digests
+        self._leaf_cache = new
+        return leaves
+
+    def _tree_root(self, digests: List[bytes], cache: Dict) -> bytes:
+        """Pairwise tree; an odd node is carried up. Appends only touch the rightmost path."""
+        if not digests:
+            return hashlib.sha256(b"\x02").digest()
+        level = digests
+        old = self._node_cache
+        while len(level) > 1:
+            nxt = []
+            for i in range(0, len(level) - 1, 2):
+                pair = (level[i], level[i + 1])
+                parent = cache.get(pair) or old.get(pair)
+                if parent is None:
+                    parent = hashlib.sha256(b"\x01" + pair[0] + pair[1]).digest()
+                cache[pair] = parent
+                nxt.append(parent)
+            if len(level) % 2:
+                nxt.append(level[-1])
+            level = nxt
+        return level[0]
+
+    def _merkle_root(self, leaves: Dict[str, List[bytes]]) -> str:
+        cache: Dict = {}
+        roots = [self._tree_root(leaves.get(section, []), cache) for section in MERKLE_SECTIONS]
+        self._node_cache = cache
+        return hashlib.sha256(b"\x03" + b"".join(roots)).hexdigest()
+
+    @metrics.timed("save.signature")
+    def _merkle_signature(self, protected: Dict) -> Tuple[str, Dict[str, List[str]]]:
+        leaves = self._leaf_hashes(protected)
+        return self._merkle_root(leaves), {s: [d.hex() for d in leaves[s]] for s in MERKLE_SECTIONS}
 
+    def _locate_tampering(self, protected: Dict, stored: Dict[str, List[str]],
+                          actual: Dict[str, List[str]]) -> List[str]:
+        found = []
+        items = _leaf_items(protected)
+        for section in MERKLE_SECTIONS:
+            want, got = stored.get(section) or [], actual[section]
+            for i, (a, b) in enumerate(zip(want, got)):
+                if a != b:
+                    found.append(f"{section}[{i}] {_describe(section, items[section][i])}")
+            if len(want) != len(got):
+                found.append(f"{section}: {len(got)} entries, signed with {len(want)}")
+        return found
+
+    @metrics.timed("signed.save")
     def save(self, player, extra=None):
         """
         Save the canonical payload (what we consider protected), then attach a signature.
         The saved file has keys:
+          - format: 2 (absent in format 1 saves)
           - protected_payload: { player: {...}, chronicle_entries: [...] }
-          - signature: "<hex>"
+          - signature: "<hex>"  (Merkle root in format 2)
+          - merkle: { section: [leaf hex, ...] }  (format 2 only)
           - extra: optional developer extras
         """
         protected = {
@@ -35,35 +192,56 @@ class SaveManager:
                 "inventory": [{"id": s['id'], "desc": s.get('desc','')} for s in player.inventory],
                 "relationships": player.relationships
             },
-            "chronicle_entries": player.chronicle.entries
-        }
-        signature = self._compute_signature(protected)
-        to_write = {
-            "protected_payload": protected,
-            "signature": signature
+            "chronicle_entries": [to_record(e) for e in player.chronicle.entries]
         }
+        if self.signature_format >= 2:
+            signature, leaves = self._merkle_signature(protected)
+            to_write = {
+                "format": 2,
+                "protected_payload": protected,
+                "signature": signature,
+                "merkle": leaves
+            }
+        else:
+            signature = self._compute_signature(protected)
+            to_write = {
+                "protected_payload": protected,
+                "signature": signature
+            }
         if extra:
             to_write["extra"] = extra
-        with open(self.save_path, "w", encoding="utf-8") as f:
-            json.dump(to_write, f, indent=2, ensure_ascii=False)
-        print(f"\n[SaveManager] Game saved to {self.save_path}")
+        if self.store is not None:
+            self.store.put(self.slot, to_write)
+        else:
+            atomic_write(self.save_path, json.dumps(to_write, indent=2, ensure_ascii=False))
+        print(f"\n[SaveManager] Game saved to {self._location()}")
         print(f"[SaveManager] Signature: {signature}")
 
     def load_raw(self):
         """
         Load the save file (no verification). Returns dict or None.
         """
-        if not os.path.exists(self.save_path):
+        if self.store is not None:
+            state = self.store.get(self.slot)
+        elif os.path.exists(self.save_path):
+            with open(self.save_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        else:
+            state = None
+        if state is None:
             print("[SaveManager] No save found.")
             return None
-        with open(self.save_path, "r", encoding="utf-8") as f:
-            state = json.load(f)
-        print(f"[SaveManager] Loaded save from {self.save_path}")
+        print(f"[SaveManager] Loaded save from {self._location()}")
         return state
 
+    def _location(self) -> str:
+        return f"{self.store.db_path}:{self.slot}" if self.store is not None else self.save_path
+
+    @metrics.timed("signed.verify")
     def load_and_verify(self) -> Tuple[bool, Dict]:
         """
         Load and verify the signature. Returns (is_valid, protected_payload_or_None).
+        For format 2 saves that fail, self.tampered names the offending entries.
         """
         state = self.load_raw()
         if not state:
@@ -73,12 +251,30 @@ class SaveManager:
         if protected is None or signature is None:
             print("[SaveManager] Save missing protected payload or signature.")
             return False, None
-        expected = self._compute_signature(protected)
-        ok = (expected == signature)
+        self.tampered = []
+        if state.get("format", 1) >= 2:
+            expected, actual = self._merkle_signature(protected)
+            stored = state.get("merkle") or {}
+            ok = (expected == signature)
+            if not ok:
+                try:
+                    signed_root = self._merkle_root({s: [bytes.fromhex(h) for h in stored.get(s) or []]
+                                                     for s in MERKLE_SECTIONS})
+                except (TypeError, ValueError):
+                    signed_root = None
+                if signed_root != signature:
+                    self.tampered = ["merkle leaf table does not match the signature"]
+                else:
+                    self.tampered = self._locate_tampering(protected, stored, actual)
+        else:
+            expected = self._compute_signature(protected)
+            ok = (expected == signature)
         if ok:
             print("[SaveManager] Signature verification OK.")
         else:
             print("[SaveManager] Signature mismatch! Save may be tampered with.")
             print(f"Expected: {expected}")
             print(f"Found:    {signature}")
+            for where in self.tampered:
+                print(f"[SaveManager] Tampered: {where}")
         return ok, protected
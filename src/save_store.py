@@ -0,0 +1,188 @@
+# src/save_store.py
+"""
+SQLite save store: every slot is one row of saves/saves.db.
+
+Slot metadata (player name, saved_at, inventory/Chronicle counts, triggered
+payoffs) lives in indexed columns, and triggered payoff ids in their own
+indexed table, so listing, sorting and filtering slots never touches the
+payloads; a payload is read only when a slot is loaded. The database runs in
+WAL mode so an autosave or a second game process can read while one writes.
+
+    python -m src.save_store --import saves/     # copy existing *.json saves in
+    python -m src.save_store --list --sort chronicle_count
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .save_manager import player_state_from_save
+
+STORE_NAME = "saves.db"
+SORT_COLUMNS = ("saved_at", "player_name", "chronicle_count", "inventory_count", "payoff_count", "slot")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slots (
+    slot            TEXT PRIMARY KEY,
+    player_name     TEXT NOT NULL,
+    saved_at        TEXT NOT NULL,
+    inventory_count INTEGER NOT NULL,
+    chronicle_count INTEGER NOT NULL,
+    payoff_count    INTEGER NOT NULL,
+    payload         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS slots_player ON slots(player_name);
+CREATE INDEX IF NOT EXISTS slots_saved_at ON slots(saved_at);
+CREATE INDEX IF NOT EXISTS slots_chronicle ON slots(chronicle_count);
+CREATE INDEX IF NOT EXISTS slots_payoffs ON slots(payoff_count);
+CREATE TABLE IF NOT EXISTS slot_payoffs (
+    slot      TEXT NOT NULL REFERENCES slots(slot) ON DELETE CASCADE,
+    payoff_id TEXT NOT NULL,
+    PRIMARY KEY (slot, payoff_id)
+);
+CREATE INDEX IF NOT EXISTS slot_payoffs_payoff ON slot_payoffs(payoff_id);
+"""
+
+
+class SlotInfo(NamedTuple):
+    slot: str
+    player_name: str
+    saved_at: str
+    inventory_count: int
+    chronicle_count: int
+    payoff_count: int
+
+
+class SaveStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def _row(slot: str, doc: Dict, saved_at: Optional[str] = None):
+        state = player_state_from_save(doc)
+        payoffs = list(dict.fromkeys((state.get('flags') or {}).get('payoffs_triggered') or []))
+        saved_at = saved_at or state.get('saved_at') or datetime.utcnow().isoformat()
+        row = (slot, state.get('name') or 'Player', saved_at, len(state.get('inventory') or []),
+               len(state.get('chronicle') or []), len(payoffs),
+               json.dumps(doc, ensure_ascii=False, separators=(",", ":")))
+        return row, payoffs
+
+    def _put_many(self, items: Iterable):
+        with self._lock, self._db:
+            for slot, doc, saved_at in items:
+                row, payoffs = self._row(slot, doc, saved_at)
+                self._db.execute("INSERT OR REPLACE INTO slots VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+                self._db.execute("DELETE FROM slot_payoffs WHERE slot = ?", (slot,))
+                self._db.executemany("INSERT INTO slot_payoffs VALUES (?, ?)", [(slot, p) for p in payoffs])
+
+    def put(self, slot: str, doc: Dict, saved_at: Optional[str] = None):
+        """Store a save document (Game payload or signed SaveManager file) under `slot`."""
+        self._put_many([(slot, doc, saved_at)])
+
+    def get(self, slot: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT payload FROM slots WHERE slot = ?", (slot,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def info(self, slot: str) -> Optional[SlotInfo]:
+        """Metadata of one slot (payload not read), or None."""
+        with self._lock:
+            row = self._db.execute("SELECT slot, player_name, saved_at, inventory_count, chronicle_count,"
+                                   " payoff_count FROM slots WHERE slot = ?", (slot,)).fetchone()
+        return SlotInfo(*row) if row else None
+
+    def __contains__(self, slot: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM slots WHERE slot = ?", (slot,)).fetchone() is not None
+
+    def delete(self, slot: str) -> bool:
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM slots WHERE slot = ?", (slot,)).rowcount > 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM slots").fetchone()[0]
+
+    def list(self, sort: str = "saved_at", descending: bool = True, limit: Optional[int] = None,
+             offset: int = 0, player: Optional[str] = None, payoff: Optional[str] = None) -> List[SlotInfo]:
+        """Slot metadata only (payloads are not read), optionally filtered by player or payoff."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"cannot sort by {sort!r}; use one of {', '.join(SORT_COLUMNS)}")
+        sql = ("SELECT slot, player_name, saved_at, inventory_count, chronicle_count, payoff_count"
+               " FROM slots")
+        where, args = [], []
+        if player is not None:
+            where.append("player_name = ?")
+            args.append(player)
+        if payoff is not None:
+            where.append("slot IN (SELECT slot FROM slot_payoffs WHERE payoff_id = ?)")
+            args.append(payoff)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {sort} {'DESC' if descending else 'ASC'}, slot"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            args += [limit, offset]
+        with self._lock:
+            return [SlotInfo(*r) for r in self._db.execute(sql, args)]
+
+    def import_json(self, paths: Iterable[str]) -> int:
+        """Copy JSON save files in (slot = file name without .json). Returns slots imported."""
+        items = []
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    doc = json.load(f)
+                if not isinstance(doc, dict):
+                    raise ValueError("not a save document")
+            except Exception as e:
+                print(f"[SaveStore] Skipped {path}: {e}")
+                continue
+            saved_at = datetime.utcfromtimestamp(os.path.getmtime(path)).isoformat()
+            items.append((os.path.splitext(os.path.basename(path))[0], doc, doc.get('saved_at') or saved_at))
+        self._put_many(items)
+        return len(items)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the SQLite save store.")
+    parser.add_argument("--db", default=os.path.join(os.path.dirname(__file__), "..", "saves", STORE_NAME))
+    parser.add_argument("--import", dest="import_dir", metavar="DIR", help="import every DIR/*.json save")
+    parser.add_argument("--list", action="store_true", help="list slots")
+    parser.add_argument("--sort", default="saved_at", choices=SORT_COLUMNS)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+    store = SaveStore(os.path.normpath(args.db))
+    try:
+        if args.import_dir:
+            n = store.import_json(sorted(glob.glob(os.path.join(args.import_dir, "*.json"))))
+            print(f"[SaveStore] Imported {n} save(s) into {store.db_path}")
+        if args.list:
+            for info in store.list(sort=args.sort, limit=args.limit):
+                print(f"{info.slot:30} {info.player_name:16} {info.saved_at:26} "
+                      f"chronicle={info.chronicle_count} payoffs={info.payoff_count}")
+            print(f"[SaveStore] {store.count()} slot(s)")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
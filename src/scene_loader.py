@@ -0,0 +1,144 @@
+# src/scene_loader.py
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class SceneIndex:
+    """
+    Dict-like, lazily loaded view over the scene files listed in the content manifest.
+
+    A scene's JSON is only read when it is first requested; the resulting scene
+    objects live in a size-bounded LRU, so resident memory does not grow with the
+    number of scene files. `warm_chapter` prefetches a chapter's scenes on a
+    small background thread pool.
+    """
+
+    def __init__(self, data_dir: str, manifest: Dict[str, Dict], build: Callable[[Dict], object],
+                 max_scenes: int = 256, warm_workers: int = 4):
+        self.data_dir = data_dir
+        self._manifest = manifest          # sid -> {"path", "title", "chapter"}
+        self._chapters: Dict[object, List[str]] = {}
+        for sid, meta in manifest.items():
+            self._chapters.setdefault(meta.get("chapter"), []).append(sid)
+        self._build = build                # raw scene dict -> Scene (or the dict itself)
+        self.max_scenes = max(1, max_scenes)
+        self.warm_workers = warm_workers
+        self._cache: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, Future] = {}   # sid -> load in flight (get or warm)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.loads = 0                     # files actually parsed (cache misses)
+
+    # ---- mapping interface (no loading) ----
+    def __contains__(self, sid) -> bool:
+        return sid in self._manifest
+
+    def __len__(self) -> int:
+        return len(self._manifest)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._manifest)
+
+    def keys(self):
+        return self._manifest.keys()
+
+    def title(self, sid: str) -> str:
+        meta = self._manifest.get(sid)
+        return meta.get("title", sid) if meta else sid
+
+    def chapter(self, sid: str):
+        meta = self._manifest.get(sid)
+        return meta.get("chapter") if meta else None
+
+    def chapter_ids(self, chapter) -> List[str]:
+        return list(self._chapters.get(chapter, ()))
+
+    # ---- loading ----
+    def get(self, sid, default=None):
+        if sid not in self._manifest:
+            return default
+        with self._lock:
+            scene = self._cache.get(sid)
+            if scene is not None:
+                self._cache.move_to_end(sid)
+                return scene
+        scene = self._load(sid)
+        return scene if scene is not None else default
+
+    def __getitem__(self, sid):
+        scene = self.get(sid)
+        if scene is None:
+            raise KeyError(sid)
+        return scene
+
+    def items(self):
+        """Iterate (sid, scene) pairs. Loads every scene; prefer keys()/title() for listings."""
+        for sid in list(self._manifest):
+            scene = self.get(sid)
+            if scene is not None:
+                yield sid, scene
+
+    def values(self):
+        for _, scene in self.items():
+            yield scene
+
+    def _load(self, sid):
+        """Parse a scene once; callers racing on the same sid wait for the load in flight."""
+        with self._lock:
+            scene = self._cache.get(sid)
+            if scene is not None:
+                return scene
+            pending = self._loading.get(sid)
+            if pending is None:
+                pending = self._loading[sid] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return pending.result()
+        scene = None
+        path = os.path.join(self.data_dir, self._manifest[sid]["path"])
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                scene = self._build(json.load(f))
+        except Exception as e:
+            print(f"[Game] Failed to load scene {path}: {e}")
+        finally:
+            with self._lock:
+                if scene is not None:
+                    self.loads += 1
+                    self._cache[sid] = scene
+                    self._cache.move_to_end(sid)
+                    while len(self._cache) > self.max_scenes:
+                        self._cache.popitem(last=False)
+                del self._loading[sid]
+            pending.set_result(scene)
+        return scene
+
+    def cached(self) -> List[str]:
+        with self._lock:
+            return list(self._cache)
+
+    # ---- background warming ----
+    def warm(self, sids):
+        """Load the given scenes in the background; returns the submitted futures."""
+        with self._lock:
+            todo = [sid for sid in sids
+                    if sid in self._manifest and sid not in self._cache and sid not in self._loading]
+            if self._pool is None and todo:
+                self._pool = ThreadPoolExecutor(max_workers=self.warm_workers,
+                                                thread_name_prefix="scene-warm")
+        # never prefetch more than the LRU can hold, or warming would evict itself
+        return [self._pool.submit(self._load, sid) for sid in todo[:self.max_scenes]]
+
+    def warm_chapter(self, chapter):
+        return self.warm(self.chapter_ids(chapter))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
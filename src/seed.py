@@ -1,14 +1,155 @@
 # src/seed.py
-from typing import Dict
+"""
+Seeds as shared, immutable flyweights.
+
+Every session's inventory and Chronicle hold references into one `Seed` table
+built per content bundle (`shared_seed_table`), instead of a dict per pickup
+or per loaded save. `Seed` and `ChronicleEntry` are read-only mappings, so
+code written against seed dicts (`s['id']`, `s.get('desc')`) keeps working.
+Plain dicts only exist at the save boundary: `to_record` converts on the way
+out, `resolve_seed` / `resolve_entry` intern on the way back in.
+"""
+from collections.abc import Mapping
+from typing import Dict, Optional
+
+_CORE = ("id", "desc", "essential_for_payoff", "mirror_on_pickup")
+
+
+class ChronicleEntry(Mapping):
+    """Chronicle record {"id", "desc"}; one shared instance per table seed."""
+    __slots__ = ("id", "desc")
+
+    def __init__(self, seed_id: str, desc: str = ""):
+        object.__setattr__(self, "id", seed_id)
+        object.__setattr__(self, "desc", desc)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ChronicleEntry is immutable")
+
+    def __getitem__(self, key):
+        if key == "id":
+            return self.id
+        if key == "desc":
+            return self.desc
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key == "id":
+            return self.id
+        if key == "desc":
+            return self.desc
+        return default
+
+    def __iter__(self):
+        return iter(("id", "desc"))
+
+    def __len__(self) -> int:
+        return 2
+
+    def to_dict(self) -> Dict:
+        return {"id": self.id, "desc": self.desc}
+
+    def __reduce__(self):
+        return (ChronicleEntry, (self.id, self.desc))
+
+    def __repr__(self) -> str:
+        return f"ChronicleEntry({self.id!r})"
+
+
+class Seed(Mapping):
+    """
+    Immutable seed record (id, desc, essential_for_payoff, mirror_on_pickup,
+    plus any extra content fields), readable like the seeds.json dict it came from.
+    """
+    __slots__ = ("id", "desc", "essential_for_payoff", "mirror_on_pickup", "entry", "_keys", "_extra")
 
-class Seed:
     def __init__(self, data: Dict):
-        self.id = data.get("id")
-        self.desc = data.get("desc", "")
-        self.essential_for_payoff = data.get("essential_for_payoff", False)
-        self.mirror_on_pickup = data.get("mirror_on_pickup", False)
+        data = dict(data)
+        setattr_ = object.__setattr__
+        setattr_(self, "id", data.get("id"))
+        setattr_(self, "desc", data.get("desc", ""))
+        setattr_(self, "essential_for_payoff", data.get("essential_for_payoff", False))
+        setattr_(self, "mirror_on_pickup", data.get("mirror_on_pickup", False))
+        setattr_(self, "_keys", tuple(data))
+        extra = {k: v for k, v in data.items() if k not in _CORE}
+        setattr_(self, "_extra", extra or None)
+        # the Chronicle mirrors this shared entry instead of building a dict per pickup
+        setattr_(self, "entry", ChronicleEntry(self.id, self.desc))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Seed is immutable")
+
+    def __getitem__(self, key):
+        if key in self._keys:
+            return getattr(self, key) if key in _CORE else self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._keys:
+            return getattr(self, key) if key in _CORE else self._extra[key]
+        return default
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
 
     def to_dict(self) -> Dict:
-        return {"id": self.id, "desc": self.desc,
-                "essential_for_payoff": self.essential_for_payoff,
-                "mirror_on_pickup": self.mirror_on_pickup}
+        return {k: self[k] for k in self._keys}
+
+    def __reduce__(self):
+        return (Seed, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"Seed({self.id!r})"
+
+
+def seed_table(items) -> Dict[str, Seed]:
+    """{id: Seed} for a seeds.json list (or dict-shaped file)."""
+    if isinstance(items, dict):
+        items = items.values()
+    return {s["id"]: Seed(s) for s in items or [] if isinstance(s, Mapping) and s.get("id")}
+
+
+_tables: Dict[object, Dict[str, Seed]] = {}
+
+
+def shared_seed_table(content: Dict) -> Dict[str, Seed]:
+    """The seed table for a content bundle, built once per bundle hash and shared by every session."""
+    key = content.get("hash") or id(content)
+    table = _tables.get(key)
+    if table is None:
+        table = seed_table(content["files"].get("seeds.json"))
+        if len(_tables) >= 4:
+            _tables.pop(next(iter(_tables)))
+        _tables[key] = table
+    return table
+
+
+def resolve_seed(item, table: Optional[Dict[str, Seed]] = None):
+    """Saved inventory dict -> the shared table Seed when it matches, else a standalone Seed."""
+    if isinstance(item, Seed) or not isinstance(item, Mapping) or not item.get("id"):
+        return item
+    seed = table.get(item["id"]) if table else None
+    if seed is not None and seed == item:
+        return seed
+    return Seed(item)
+
+
+def resolve_entry(item, table: Optional[Dict[str, Seed]] = None):
+    """Saved Chronicle dict -> the shared entry of its table seed when it matches."""
+    if isinstance(item, ChronicleEntry) or not isinstance(item, Mapping) or set(item) != {"id", "desc"}:
+        return item
+    seed = table.get(item["id"]) if table else None
+    if seed is not None and seed.desc == item["desc"]:
+        return seed.entry
+    return ChronicleEntry(item["id"], item["desc"])
+
+
+def to_record(item):
+    """Plain dict for saving (seeds, Chronicle entries, or dicts passed through)."""
+    return item.to_dict() if isinstance(item, (Seed, ChronicleEntry)) else item
@@ -0,0 +1,294 @@
+# src/server.py
+"""
+Multi-session game server over a telnet-style line protocol (telnet, nc, MUD clients).
+
+Each connection gets its own `Game` (player, session RNG, saves folder), and the
+ordinary menu loop runs unchanged on a session thread. `SessionConsole` turns
+the game's reads and writes into socket I/O on the asyncio event loop:
+
+  - output is buffered per screen and sent when the game waits for input;
+    the session thread blocks until the socket drains (backpressure)
+  - a read waits for the next line, ending the session after --idle-timeout
+  - stray print() calls from managers are routed to the session that made them
+    through a context variable, so sessions never see each other's output
+
+Content is loaded once and shared read-only by every session, and so is one
+scene index: a scene is parsed and compiled once for the whole server, kept in
+one LRU (--scene-cache) and prefetched on one small thread pool. Saves go to
+saves/sessions/<name>/.
+
+    python -m src.server --port 4000
+    nc localhost 4000
+"""
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import io
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from .console import Console
+from .content import load_content
+from .renderer import HOME, CLEAR_SCREEN
+from .rng import SessionRNG
+
+# console of the session running on the current thread (None: the server itself)
+_session_console: contextvars.ContextVar = contextvars.ContextVar("session_console", default=None)
+
+_TELNET_CMD = re.compile(rb"\xff[\xfb-\xfe].|\xff[\xf0-\xfa]", re.S)
+_NAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+NAME_PROMPT = "Player name (letters, digits, - and _): "
+
+
+def player_folder(raw: str, sid: int) -> str:
+    """Saves folder name for a login line (sanitized; guest<N> when empty)."""
+    return _NAME_CHARS.sub("", raw)[:32] or f"guest{sid}"
+
+
+def clean_line(line: bytes) -> str:
+    """Decode one client line, dropping telnet negotiation bytes."""
+    return _TELNET_CMD.sub(b"", line).decode("utf-8", "replace").rstrip("\r\n")
+
+
+class _RoutedStdout(io.TextIOBase):
+    """sys.stdout replacement: print() inside a session goes to that session's console."""
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+
+    def write(self, s):
+        console = _session_console.get()
+        if console is None:
+            return self.fallback.write(s)
+        console.write(s, end="")
+        return len(s)
+
+    def flush(self):
+        if _session_console.get() is None:
+            self.fallback.flush()
+
+
+class SessionConsole(Console):
+    """Console whose I/O is a client connection; every call comes from the session thread."""
+
+    def __init__(self, session: "Session"):
+        self.session = session
+        self._buf = []
+
+    def read(self, prompt: str = "") -> str:
+        self._buf.append(prompt)
+        self.flush()
+        return self.session.readline()
+
+    def write(self, *parts, sep: str = " ", end: str = "\n"):
+        self._buf.append(sep.join(str(p) for p in parts) + end)
+
+    def clear(self):
+        self._buf.append(HOME + CLEAR_SCREEN)
+
+    def header(self, lines):
+        self.clear()
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self._buf:
+            data, self._buf = "".join(self._buf), []
+            self.session.send(data)
+
+    def pause(self, seconds: float):
+        self.flush()
+        if seconds > 0:
+            time.sleep(min(seconds, self.session.server.max_pause))
+
+    def capture(self):
+        # set for the whole session thread by Session.run_game
+        return contextlib.nullcontext()
+
+
+class Session:
+    def __init__(self, server: "GameServer", sid: int, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.server = server
+        self.sid = sid
+        self.reader = reader
+        self.writer = writer
+        self.loop = server.loop
+        self.done = self.loop.create_future()
+        self.console = SessionConsole(self)
+        self.name = None
+
+    # ---- called from the session thread ----
+    def send(self, text: str):
+        asyncio.run_coroutine_threadsafe(self._send(text), self.loop).result()
+
+    def readline(self) -> str:
+        return asyncio.run_coroutine_threadsafe(self._readline(), self.loop).result()
+
+    def run_game(self):
+        from .game import Game
+        _session_console.set(self.console)
+        try:
+            self.name = player_folder(self.console.read(NAME_PROMPT), self.sid)
+            saves_dir = os.path.join(self.server.saves_root, self.name)
+            game = Game(console=self.console, scenes=self.server.scenes,
+                        autosave=self.server.autosave, seed=self.server.rng.spawn("session", self.sid).getrandbits(64),
+                        saves_dir=saves_dir, content=self.server.content)
+            game.run()
+        except (EOFError, ConnectionError, OSError, asyncio.TimeoutError):
+            pass
+        except Exception as e:
+            self.server.log(f"session {self.sid} crashed: {e!r}")
+        finally:
+            self.loop.call_soon_threadsafe(self._finish)
+
+    def _finish(self):
+        if not self.done.done():
+            self.done.set_result(None)
+
+    # ---- event loop side ----
+    async def _send(self, text: str):
+        if self.writer.is_closing():
+            raise ConnectionError("client disconnected")
+        self.writer.write(text.replace("\n", "\r\n").encode("utf-8", "replace"))
+        # a client that stops reading stalls its own session thread, nobody else
+        await asyncio.wait_for(self.writer.drain(), self.server.idle_timeout)
+
+    async def _readline(self) -> str:
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), self.server.idle_timeout)
+        except asyncio.TimeoutError:
+            with contextlib.suppress(Exception):
+                await self._send("\n[Server] Idle timeout, goodbye.\n")
+            raise EOFError("idle timeout")
+        except (asyncio.LimitOverrunError, ValueError):
+            raise EOFError("line too long")
+        if not line:
+            raise EOFError("connection closed")
+        return clean_line(line)
+
+
+class GameServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 4000, max_sessions: int = 2000,
+                 idle_timeout: float = 900.0, saves_root: Optional[str] = None, data_dir: Optional[str] = None,
+                 autosave: bool = False, scene_cache_size: int = 1024, max_pause: float = 1.0,
+                 seed: Optional[int] = None, stack_size: int = 512 * 1024):
+        root = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.saves_root = saves_root or os.path.join(root, 'saves', 'sessions')
+        self.data_dir = data_dir or os.path.join(root, 'data')
+        self.autosave = autosave
+        self.scene_cache_size = scene_cache_size
+        self.max_pause = max_pause
+        self.rng = SessionRNG(seed)
+        self.stack_size = stack_size
+        self.content: Optional[Dict] = None
+        self.scenes = None                 # SceneIndex shared by every session
+        self.sessions: Dict[int, Session] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._next_sid = 0
+        self._stdout = None
+
+    def log(self, msg: str):
+        if self._stdout is not None:
+            self._stdout.fallback.write(f"[Server] {msg}\n")
+            self._stdout.fallback.flush()
+        else:
+            print(f"[Server] {msg}")
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.content = load_content(self.data_dir)
+        from .game import shared_scene_index
+        self.scenes = shared_scene_index(self.content, self.data_dir, max_scenes=self.scene_cache_size)
+        if self.stack_size:
+            # one thread per session: small stacks keep thousands of idle sessions cheap
+            threading.stack_size(self.stack_size)
+        if not isinstance(sys.stdout, _RoutedStdout):
+            self._stdout = _RoutedStdout(sys.stdout)
+            sys.stdout = self._stdout
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.log(f"listening on {self.host}:{self.port} (max {self.max_sessions} sessions, "
+                 f"idle timeout {self.idle_timeout:g}s, content {self.content.get('hash', '')[:12]})")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for session in list(self.sessions.values()):
+            session.writer.close()
+        if self.scenes is not None:
+            self.scenes.close()
+        if self._stdout is not None and sys.stdout is self._stdout:
+            sys.stdout = self._stdout.fallback
+        self._stdout = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"[Server] Server is full, try again later.\r\n")
+            with contextlib.suppress(Exception):
+                await writer.drain()
+            writer.close()
+            return
+        self._next_sid += 1
+        session = Session(self, self._next_sid, reader, writer)
+        writer.transport.set_write_buffer_limits(high=64 * 1024)
+        self.sessions[session.sid] = session
+        peer = writer.get_extra_info("peername")
+        self.log(f"session {session.sid} connected from {peer} ({len(self.sessions)} active)")
+        thread = threading.Thread(target=session.run_game, name=f"session-{session.sid}", daemon=True)
+        thread.start()
+        try:
+            await session.done
+        finally:
+            del self.sessions[session.sid]
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+            self.log(f"session {session.sid} ({session.name or '-'}) closed ({len(self.sessions)} active)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Stasis Hunters sessions over a telnet-style line protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--max-sessions", type=int, default=2000)
+    parser.add_argument("--idle-timeout", type=float, default=900.0, help="seconds without input before disconnect")
+    parser.add_argument("--saves", help="root folder for per-player saves (default: saves/sessions)")
+    parser.add_argument("--autosave", action="store_true", help="autosave every session after each choice")
+    parser.add_argument("--seed", type=int, help="master seed; session N plays with spawn('session', N)")
+    parser.add_argument("--scene-cache", type=int, default=1024, help="scenes kept parsed, shared by all sessions")
+    args = parser.parse_args(argv)
+    server = GameServer(args.host, args.port, args.max_sessions, args.idle_timeout, saves_root=args.saves,
+                        autosave=args.autosave, scene_cache_size=args.scene_cache, seed=args.seed)
+
+    async def run():
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("[Server] Stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
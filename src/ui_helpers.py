@@ -1,28 +1,29 @@
 # src/ui_helpers.py
-import sys
-import time
+from .console import get_console
 
-def paginate_lines(text_lines, page_size=6):
+def paginate_lines(text_lines, page_size=6, console=None):
     """
     Simple paginator: yields chunks of lines. Pause for -- more -- prompt.
     """
+    console = get_console(console)
     for i in range(0, len(text_lines), page_size):
         chunk = text_lines[i:i+page_size]
         for l in chunk:
-            print(l)
+            console.write(l)
         if i + page_size < len(text_lines):
-            input("-- more -- (press Enter) --")
+            console.read("-- more -- (press Enter) --")
 
-def choice_menu(options):
+def choice_menu(options, console=None):
     """
     options: list of tuples (key, text)
     returns chosen key
     """
+    console = get_console(console)
     for idx, (key, text) in enumerate(options, start=1):
-        print(f"{idx}) {text}")
-    print("q) quit  s) save")
+        console.write(f"{idx}) {text}")
+    console.write("q) quit  s) save")
     while True:
-        c = input("> ").strip().lower()
+        c = console.read("> ").strip().lower()
         if c in ("q", "s"):
             return c
         try:
@@ -31,4 +32,4 @@ def choice_menu(options):
                 return options[i-1][0]
         except:
             pass
-        print("Invalid choice.")
+        console.write("Invalid choice.")
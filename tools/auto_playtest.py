@@ -5,12 +5,21 @@ Auto playtest script to ensure milestone:
 - Pick up one optional seed (S05) and one essential seed (S22)
 - Save the game
 - Confirm chronicle entries are present and that the save's signature verifies
+
+With --fuzz it instead runs a parallel, coverage-guided fuzzing campaign over
+every choice in Game.scenes_index (see tools/playtest_helpers.py):
+    python tools/auto_playtest.py --fuzz --steps 1000000 --report fuzz.json
 """
 
 import os
 import sys
 import json
+import time
+import random
+import argparse
 import pathlib
+import multiprocessing
+from collections import Counter
 
 # Ensure repo root is on path so we can import src modules
 HERE = pathlib.Path(__file__).resolve().parent
@@ -19,6 +28,7 @@ sys.path.insert(0, str(REPO_ROOT))
 
 # Import the project modules
 from src.game import Game
+from src.rng import SessionRNG
 from src.scene import Scene
 
 def run_playtest():
@@ -101,9 +111,155 @@ def run_playtest():
     print("\n== Auto Playtest: PASS ==")
     return True
 
+# -------------------- Fuzzer --------------------
+_walker = None
+
+
+def _init_worker(attack_bias):
+    global _walker
+    from tools.playtest_helpers import Walker
+    _walker = Walker(attack_bias=attack_bias)
+
+
+def _fuzz_batch(job):
+    """
+    Run one batch of walks in a worker. Walks that reach features outside `known`
+    are returned as new corpus entries; failures are returned once per failure key.
+    """
+    from tools.playtest_helpers import failure_key
+    rng, n_walks, max_steps, corpus, known, guided = job     # rng: a SessionRNG child stream
+    known = set(known)
+    counts = Counter()
+    new_entries = []
+    failures = {}
+    steps_run = 0
+    for _ in range(n_walks):
+        if corpus and rng.random() < guided:
+            base = rng.choice(corpus)
+            other = rng.choice(corpus)
+            steps = _walker.mutate(base, other, rng, max_steps)
+        else:
+            steps = _walker.random_steps(rng, max_steps)
+        seed = rng.getrandbits(32)
+        features, inputs, failure = _walker.run(steps, seed)
+        steps_run += len(steps)
+        counts.update(features)
+        fresh = features - known
+        if fresh:
+            known |= fresh
+            new_entries.append((steps, seed, sorted(fresh)))
+        if failure:
+            key = failure_key(failure)
+            if key not in failures:
+                failures[key] = (steps, seed, failure)
+    return {'steps': steps_run, 'walks': n_walks, 'counts': counts,
+            'new': new_entries, 'failures': failures}
+
+
+def fuzz(total_steps=100000, workers=None, max_steps=40, walks_per_batch=200,
+         guided=0.7, attack_bias=0.8, master_seed=None, max_failures=10):
+    """Run a fuzzing campaign and return a JSON-serializable report."""
+    from tools.playtest_helpers import Walker, minimize, failure_key
+    workers = workers or os.cpu_count() or 1
+    master = SessionRNG(master_seed)
+    corpus = []            # list of step lists that found new coverage
+    known = set()
+    counts = Counter()
+    failures = {}
+    steps_done = walks_done = batches = 0
+    started = time.perf_counter()
+
+    # average walk is ~max_steps/2 steps; size rounds so every worker stays busy
+    jobs_per_round = workers * 4
+    ctx = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(attack_bias,)) as pool:
+        while steps_done < total_steps:
+            sample = corpus if len(corpus) <= 64 else master.sample(corpus, 64)
+            frozen = frozenset(known)
+            # each batch gets its own child stream, so results do not depend on scheduling
+            jobs = [(master.spawn("batch", batches + j), walks_per_batch, max_steps, sample, frozen, guided)
+                    for j in range(jobs_per_round)]
+            batches += jobs_per_round
+            for res in pool.imap_unordered(_fuzz_batch, jobs):
+                steps_done += res['steps']
+                walks_done += res['walks']
+                counts.update(res['counts'])
+                for steps, seed, fresh in res['new']:
+                    if not known.issuperset(fresh):
+                        known.update(fresh)
+                        corpus.append(steps)
+                for key, val in res['failures'].items():
+                    failures.setdefault(key, val)
+    elapsed = time.perf_counter() - started
+
+    walker = Walker(attack_bias=attack_bias)
+    universe = walker.universe()
+    coverage = {}
+    for kind, total in universe.items():
+        hit = {f.split(':', 1)[1] for f in counts if f.startswith(kind + ':')}
+        coverage[kind] = {'covered': len(hit & total), 'total': len(total),
+                          'missing': sorted(total - hit)}
+
+    failure_reports = []
+    for key, (steps, seed, failure) in list(failures.items())[:max_failures]:
+        small = minimize(walker, steps, seed, key)
+        _, inputs, detail = walker.run(small, seed)
+        failure_reports.append({'error': key, 'detail': detail or failure, 'seed': seed,
+                                'steps': [list(s) for s in small], 'inputs': inputs})
+
+    return {'steps': steps_done, 'walks': walks_done, 'workers': workers,
+            'seconds': round(elapsed, 3),
+            'steps_per_second': round(steps_done / elapsed) if elapsed else None,
+            'corpus_size': len(corpus), 'master_seed': master.seed_value, 'coverage': coverage,
+            'hits': dict(counts.most_common()), 'failures': failure_reports}
+
+
+def print_report(report):
+    print(f"== Fuzz: {report['steps']} steps / {report['walks']} walks on "
+          f"{report['workers']} workers in {report['seconds']}s "
+          f"({report['steps_per_second']} steps/s), corpus {report['corpus_size']}, "
+          f"seed {report['master_seed']} ==")
+    for kind, cov in report['coverage'].items():
+        line = f"  {kind:<8} {cov['covered']}/{cov['total']}"
+        if cov['missing']:
+            line += f"  missing: {', '.join(cov['missing'][:10])}"
+            if len(cov['missing']) > 10:
+                line += f" (+{len(cov['missing']) - 10} more)"
+        print(line)
+    if not report['failures']:
+        print("  no failures")
+    for f in report['failures']:
+        print(f"\n[Fail] {f['error']} (seed {f['seed']}, {len(f['steps'])} step(s))")
+        print(f"  steps:  {f['steps']}")
+        print(f"  script: {' | '.join(f['inputs'])}")
+        print(f"  replay: python -m src.game --headless --seed {f['seed']} --script <script lines>")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stasis Hunters auto playtest / fuzzer.")
+    parser.add_argument('--fuzz', action='store_true', help="run a coverage-guided fuzzing campaign")
+    parser.add_argument('--steps', type=int, default=100000, help="total choice steps to execute")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--max-walk', type=int, default=40, help="maximum steps per walk")
+    parser.add_argument('--batch', type=int, default=200, help="walks per worker batch")
+    parser.add_argument('--guided', type=float, default=0.7, help="share of walks mutated from the corpus")
+    parser.add_argument('--attack-bias', type=float, default=0.8, help="chance of answering 'attack' in combat")
+    parser.add_argument('--seed', type=int, default=None, help="master seed for a reproducible campaign")
+    parser.add_argument('--report', help="write the full JSON report here")
+    args = parser.parse_args(argv)
+
+    if not args.fuzz:
+        return 0 if run_playtest() else 2
+
+    report = fuzz(total_steps=args.steps, workers=args.workers, max_steps=args.max_walk,
+                  walks_per_batch=args.batch, guided=args.guided,
+                  attack_bias=args.attack_bias, master_seed=args.seed)
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report['failures'] else 0
+
+
 if __name__ == "__main__":
-    ok = run_playtest()
-    if not ok:
-        sys.exit(2)
-    else:
-        sys.exit(0)
+    sys.exit(main())
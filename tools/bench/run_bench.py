@@ -0,0 +1,232 @@
+"""
+Engine benchmark suite.
+
+Generates (or reuses) a synthetic world, then times and memory-profiles the
+engine's hot paths against it: Game cold start (with and without a content
+bundle), scene loading, payoff checks, memory-cost removal, Chronicle
+appends and SaveManager save / load+verify. Each benchmark reports
+min/median/mean/max over --repeat runs plus the tracemalloc peak of one
+extra traced run.
+
+    python tools/bench/run_bench.py --scale small --json bench.json
+    python tools/bench/run_bench.py --world /tmp/world --compare bench.json   # exit 1 on regressions
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import pathlib
+import platform
+import statistics
+import tempfile
+import tracemalloc
+import contextlib
+import subprocess
+from typing import Callable, Dict, List, Optional
+
+HERE = pathlib.Path(__file__).resolve().parent
+REPO_ROOT = HERE.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(HERE))
+
+from worldgen import SCALES, generate
+from src.console import HeadlessConsole
+from src.content import BUNDLE_NAME, load_content
+from src.game import Game
+from src.chronicle import Chronicle
+from src.memory_cost import MemoryCostManager
+from src.payoff_manager import PayoffManager
+from src.player import Player
+from src.save_manager import SaveManager
+from src.seed import shared_seed_table
+
+
+class Bench:
+    """One benchmark: `setup()` builds fresh state (untimed), `run(state)` is measured."""
+    def __init__(self, name: str, run: Callable, setup: Optional[Callable] = None, ops: int = 1):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.ops = ops
+
+
+def measure(bench: Bench, repeat: int) -> Dict:
+    times = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            state = bench.setup()
+            started = time.perf_counter()
+            bench.run(state)
+            times.append(time.perf_counter() - started)
+        state = bench.setup()
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        bench.run(state)
+        peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+    median = statistics.median(times)
+    return {"runs": repeat, "ops": bench.ops, "min_s": min(times), "median_s": median,
+            "mean_s": statistics.fmean(times), "max_s": max(times),
+            "per_op_us": median / bench.ops * 1e6, "peak_kb": peak / 1024}
+
+
+def build_benches(world: str, saves: str, ops: int) -> List[Bench]:
+    content = load_content(world)
+    seeds = shared_seed_table(content)
+    seed_list = list(seeds.values())
+    payoffs = content["files"].get("payoffs.json")
+    rng = random.Random(1)
+    picks = rng.sample(seed_list, min(ops, len(seed_list)))
+
+    def new_game(_=None):
+        Game(console=HeadlessConsole(()), data_dir=world, saves_dir=saves).close()
+
+    def drop_bundle():
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(world, BUNDLE_NAME))
+
+    def load_all_scenes(index):
+        for sid in index.keys():
+            index.get(sid)
+
+    def scene_index():
+        g = Game(console=HeadlessConsole(()), data_dir=world, saves_dir=saves, content=content)
+        g.scene_cache_size = len(content["scene_manifest"])
+        return g
+
+    def payoff_state():
+        return PayoffManager(world, payoffs=payoffs), Player()
+
+    def payoff_run(state):
+        pm, player = state
+        for s in picks:
+            player.chronicle.add_entry(s)
+            pm.check_and_trigger(player)
+
+    def full_player():
+        player = Player()
+        for s in seed_list:
+            player.add_seed(s)
+        return player
+
+    def removal_state():
+        player = full_player()
+        return MemoryCostManager(player), [s.id for s in picks]
+
+    def chronicle_run(chronicle):
+        for s in picks:
+            chronicle.add_entry(s)
+
+    def signed_state():
+        manager = SaveManager(os.path.join(saves, "bench_signed.json"))
+        return manager, full_player()
+
+    def signed_warm_state():
+        manager, player = signed_state()
+        manager.save(player)
+        player.chronicle.add_entry({"id": "BENCH", "desc": "one new entry"})
+        return manager, player
+
+    def verify_state():
+        manager, player = signed_state()
+        manager.save(player)
+        return SaveManager(manager.save_path)
+
+    return [
+        Bench("game_init_cold_bundle", lambda _: new_game(), setup=drop_bundle),
+        Bench("game_init", lambda _: new_game(), setup=lambda: load_content(world)),
+        Bench("load_scenes", lambda g: g._load_scenes(), setup=scene_index),
+        Bench("scenes_load_all", lambda g: load_all_scenes(g._load_scenes()), setup=scene_index,
+              ops=max(1, len(content["scene_manifest"]))),
+        Bench("payoff_check_and_trigger", payoff_run, setup=payoff_state, ops=len(picks)),
+        Bench("memory_apply_removal", lambda st: st[0].apply_removal(st[1]), setup=removal_state, ops=len(picks)),
+        Bench("chronicle_add_entry", chronicle_run, setup=Chronicle, ops=len(picks)),
+        Bench("save_manager_save", lambda st: st[0].save(st[1]), setup=signed_state),
+        Bench("save_manager_save_warm", lambda st: st[0].save(st[1]), setup=signed_warm_state),
+        Bench("save_manager_load_verify", lambda m: m.load_and_verify(), setup=verify_state),
+    ]
+
+
+def git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> int:
+    """Print median ratios vs a baseline report; returns the number of regressions."""
+    regressions = 0
+    print(f"\n[Bench] vs baseline {baseline['meta'].get('git_rev') or '?'} (threshold +{threshold:.0%}):")
+    for name, res in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            print(f"  {name:<28} (new)")
+            continue
+        ratio = res["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"  {name:<28} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and memory-profile engine hot paths on a synthetic world.")
+    parser.add_argument("--world", help="existing world folder (default: generate one for --scale)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--ops", type=int, default=1000, help="seeds per payoff / removal / Chronicle benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", help="run just these benchmarks (repeatable)")
+    parser.add_argument("--json", dest="json_out", help="write the report here")
+    parser.add_argument("--compare", help="baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown before failing")
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix="bench-")
+    try:
+        world = args.world
+        if not world:
+            world = os.path.join(tmp, "data")
+            started = time.perf_counter()
+            generate(world, **SCALES[args.scale])
+            print(f"[Bench] Generated {args.scale} world in {time.perf_counter() - started:.1f}s")
+        saves = os.path.join(tmp, "saves")
+        os.makedirs(saves, exist_ok=True)
+        benches = build_benches(world, saves, args.ops)
+        if args.only:
+            benches = [b for b in benches if b.name in args.only]
+        report = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                           "git_rev": git_rev(), "world": args.world or f"generated:{args.scale}",
+                           "scale": None if args.world else SCALES[args.scale], "ops": args.ops,
+                           "repeat": args.repeat, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())},
+                  "results": {}}
+        print(f"{'benchmark':<28}{'median ms':>11}{'min ms':>10}{'per op us':>11}{'peak KB':>10}")
+        for bench in benches:
+            res = measure(bench, args.repeat)
+            report["results"][bench.name] = res
+            print(f"{bench.name:<28}{res['median_s'] * 1000:>11.2f}{res['min_s'] * 1000:>10.2f}"
+                  f"{res['per_op_us']:>11.1f}{res['peak_kb']:>10.0f}")
+        if args.json_out:
+            with open(args.json_out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"[Bench] Report written to {args.json_out}")
+        if args.compare:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+            if compare(report, baseline, args.threshold):
+                return 1
+        return 0
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Synthetic world generator for benchmarks.
+
+Writes a complete data/ folder (seeds.json, payoffs.json, monsters.json,
+scenes.json and scenes/*.json) in the same schemas as the real content, at
+any scale, deterministically from --seed:
+    python tools/bench/worldgen.py --out /tmp/world --scenes 10000 --seeds 100000 \
+        --payoffs 10000 --monsters 1000
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+from typing import Dict
+
+SCALES = {
+    "tiny": {"scenes": 100, "seeds": 1000, "payoffs": 100, "monsters": 10},
+    "small": {"scenes": 1000, "seeds": 10000, "payoffs": 1000, "monsters": 100},
+    "large": {"scenes": 10000, "seeds": 100000, "payoffs": 10000, "monsters": 1000},
+}
+
+NPCS = ["Hana", "Ren", "Mira", "Oskar", "Tamsin", "Vex", "Ilya", "Juno", "Kasimir", "Lark"]
+
+
+def seed_id(i: int) -> str:
+    return f"S{i:06d}"
+
+
+def generate(out_dir: str, scenes: int, seeds: int, payoffs: int, monsters: int,
+             chapters: int = 20, seed: int = 0) -> Dict[str, int]:
+    """Write the world to out_dir (created if missing); returns the counts written."""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out_dir, "scenes"), exist_ok=True)
+
+    seed_list = [{"id": seed_id(i), "desc": f"Fragment {i}: a relic humming with stasis residue.",
+                  "essential_for_payoff": rng.random() < 0.3, "mirror_on_pickup": rng.random() < 0.5}
+                 for i in range(seeds)]
+    payoff_map = {}
+    for i in range(payoffs):
+        pid = f"P{i:05d}"
+        payoff_map[pid] = {"id": pid, "title": f"Payoff {i}",
+                           "required_seeds": sorted({seed_id(rng.randrange(seeds)) for _ in range(rng.randint(1, 5))}),
+                           "canonical": rng.random() < 0.5, "chapter_trigger": rng.randint(1, chapters)}
+    monster_map = {}
+    for i in range(monsters):
+        mid = f"M{i:04d}"
+        monster_map[mid] = {"id": mid, "name": f"Stasis Beast {i}", "hp": rng.randint(10, 150),
+                            "attack_pattern": rng.sample(["bash", "drain", "pulse", "slam", "flicker"], 2),
+                            "drops": [seed_id(rng.randrange(seeds)) for _ in range(rng.randint(0, 2))]}
+
+    for name, data in (("seeds.json", seed_list), ("payoffs.json", payoff_map), ("monsters.json", monster_map)):
+        with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    # a handful of legacy-format scenes, the rest as one file per scene
+    legacy = [{"id": f"legacy{i}", "title": f"Legacy {i}", "desc": "An old-format scene.",
+               "choices": [{"label": "Pick up", "action": "pickup_seed", "seed_id": seed_id(rng.randrange(seeds))},
+                           {"label": "Look around", "action": "text", "text": "Dust settles."}]}
+              for i in range(min(10, scenes))]
+    with open(os.path.join(out_dir, "scenes.json"), "w", encoding="utf-8") as f:
+        json.dump(legacy, f)
+    for i in range(scenes):
+        choices = []
+        for c in range(rng.randint(2, 4)):
+            effects = {"add_seed": seed_id(rng.randrange(seeds))}
+            if rng.random() < 0.5:
+                effects["relationship"] = {rng.choice(NPCS): rng.choice([-2, -1, 1, 2])}
+            if monsters and rng.random() < 0.1:
+                effects["encounter_monster"] = f"M{rng.randrange(monsters):04d}"
+            choices.append({"id": f"c{c}", "text": f"Choice {c}", "effects": effects})
+        scene = {"id": f"scene{i:05d}", "chapter": 1 + i * chapters // max(1, scenes),
+                 "title": f"Scene {i}", "text": [f"Generated scene {i}."], "choices": choices}
+        with open(os.path.join(out_dir, "scenes", f"scene{i:05d}.json"), "w", encoding="utf-8") as f:
+            json.dump(scene, f)
+    return {"scenes": scenes, "seeds": seeds, "payoffs": payoffs, "monsters": monsters}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic data/ folder for benchmarks.")
+    parser.add_argument("--out", required=True, help="output folder (becomes a data/ dir)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--scenes", type=int)
+    parser.add_argument("--seeds", type=int)
+    parser.add_argument("--payoffs", type=int)
+    parser.add_argument("--monsters", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    sizes = dict(SCALES[args.scale])
+    sizes.update({k: getattr(args, k) for k in sizes if getattr(args, k) is not None})
+    counts = generate(args.out, seed=args.seed, **sizes)
+    print(f"[WorldGen] Wrote {args.out}: " + ", ".join(f"{v} {k}" for k, v in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Compare save codecs on size and encode/decode time.
+
+Builds a synthetic save from the real seeds.json (every seed picked up and
+mirrored, plus generated Chronicle entries and relationships) and times each
+codec over it:
+    python tools/codec_bench.py --chronicle 5000 --repeat 20
+"""
+
+import sys
+import json
+import time
+import argparse
+import pathlib
+
+HERE = pathlib.Path(__file__).resolve().parent
+REPO_ROOT = HERE.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.content import load_content, index_by
+from src.save_codec import JsonCodec, BinaryCodec, decode_save
+
+
+class CompactJsonCodec(JsonCodec):
+    name = "json-compact"
+
+    def encode(self, state):
+        return json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def synthetic_save(seeds, chronicle, npcs, payoffs):
+    inventory = [dict(s) for s in seeds.values()]
+    mirrors = [{"id": s["id"], "desc": s.get("desc", "")} for s in seeds.values()]
+    extra = [{"id": f"X{i:05d}", "desc": f"Recovered memory fragment #{i} from the stasis field."}
+             for i in range(chronicle)]
+    return {
+        "name": "Bench",
+        "inventory": inventory,
+        "chronicle": mirrors + extra,
+        "relationships": {f"NPC{i:03d}": (i % 11) - 5 for i in range(npcs)},
+        "flags": {"payoffs_triggered": [f"P{i:02d}" for i in range(payoffs)]},
+        "saved_at": "2025-10-03T12:00:00",
+    }
+
+
+def bench(codec, state, seeds, repeat):
+    t = time.perf_counter()
+    for _ in range(repeat):
+        blob = codec.encode(state)
+    enc = (time.perf_counter() - t) / repeat
+    t = time.perf_counter()
+    for _ in range(repeat):
+        decoded = decode_save(blob, seeds)
+    dec = (time.perf_counter() - t) / repeat
+    if decoded != state:
+        raise SystemExit(f"{codec.name}: round trip changed the save")
+    return {"codec": codec.name, "bytes": len(blob), "encode_ms": enc * 1000, "decode_ms": dec * 1000}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark save codecs.")
+    parser.add_argument("--chronicle", type=int, default=2000, help="generated Chronicle entries")
+    parser.add_argument("--npcs", type=int, default=50)
+    parser.add_argument("--payoffs", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", dest="json_out", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    seeds = index_by(load_content(str(REPO_ROOT / "data"))["files"].get("seeds.json"), "id")
+    state = synthetic_save(seeds, args.chronicle, args.npcs, args.payoffs)
+    codecs = [JsonCodec(), CompactJsonCodec(), BinaryCodec(seeds, compress=False), BinaryCodec(seeds)]
+    codecs[2].name = "binary-raw"
+    results = [bench(c, state, seeds, args.repeat) for c in codecs]
+
+    base = results[0]["bytes"]
+    print(f"{'codec':14} {'bytes':>10} {'ratio':>7} {'encode ms':>10} {'decode ms':>10}")
+    for r in results:
+        print(f"{r['codec']:14} {r['bytes']:>10} {r['bytes'] / base:>7.3f} {r['encode_ms']:>10.2f} {r['decode_ms']:>10.2f}")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"params": vars(args), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
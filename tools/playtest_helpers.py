@@ -0,0 +1,180 @@
+# tools/playtest_helpers.py
+"""
+Helpers for automated playtesting and fuzzing.
+
+A walk is a list of (scene_id, choice_index) steps replayed against a fresh
+player in a headless Game. Walker records which content features a walk
+exercised ("seed:S05", "payoff:P02", "monster:M_Wisps", "effect:add_seed",
+"choice:festival_awaken#0", ...) and the exact console input it consumed, so a
+failing walk can be turned back into a `--headless --script` input file.
+"""
+
+import random
+import sys
+import pathlib
+import traceback
+from typing import Dict, List, Optional, Set, Tuple
+
+HERE = pathlib.Path(__file__).resolve().parent
+REPO_ROOT = HERE.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.game import Game
+from src.console import HeadlessConsole
+
+Step = Tuple[str, int]
+
+
+class WalkFailure(Exception):
+    """Raised by invariant checks when a walk leaves the player in a broken state."""
+
+
+class Walker:
+    """Drives one headless Game instance through many walks."""
+
+    def __init__(self, attack_bias: float = 0.8):
+        self.attack_bias = attack_bias
+        self.rng = random.Random(0)
+        self._consumed: List[str] = []
+        self.console = HeadlessConsole(self._answers())
+        self.game = Game(console=self.console)
+        self.choice_table: List[Step] = []
+        for sid in sorted(self.game.scenes_index):
+            for i, _ in enumerate(self._choices(self.game.scenes_index[sid])):
+                self.choice_table.append((sid, i))
+
+    # ---------------- content introspection ----------------
+    @staticmethod
+    def _choices(scene) -> List[Dict]:
+        if isinstance(scene, dict):
+            return scene.get('choices', [])
+        return getattr(scene, 'choices', [])
+
+    def universe(self) -> Dict[str, Set[str]]:
+        """Every feature the content could produce, grouped by kind (for coverage ratios)."""
+        g = self.game
+        effect_keys = set()
+        for sid, i in self.choice_table:
+            effect_keys.update((self._choices(g.scenes_index[sid])[i].get('effects') or {}).keys())
+        payoffs = g.payoff_manager.payoffs if g.payoff_manager else {}
+        return {
+            'choice': {f"{sid}#{i}" for sid, i in self.choice_table},
+            'effect': effect_keys,
+            'seed': set(g.seeds_index),
+            'payoff': set(payoffs),
+            'monster': set(g.monsters_index),
+        }
+
+    # ---------------- input source ----------------
+    def _answers(self):
+        # Endless answers for prompts raised *inside* a choice (combat, mini-game).
+        while True:
+            line = "1" if self.rng.random() < self.attack_bias else "2"
+            self._consumed.append(line)
+            yield line
+
+    # ---------------- walks ----------------
+    def random_steps(self, rng: random.Random, max_steps: int) -> List[Step]:
+        if not self.choice_table:
+            return []
+        return [rng.choice(self.choice_table) for _ in range(rng.randint(1, max_steps))]
+
+    def mutate(self, steps: List[Step], other: List[Step], rng: random.Random, max_steps: int) -> List[Step]:
+        steps = list(steps)
+        op = rng.randrange(4)
+        if op == 0 or not steps:
+            steps.extend(self.random_steps(rng, max(1, max_steps // 4)))
+        elif op == 1:
+            steps[rng.randrange(len(steps))] = rng.choice(self.choice_table)
+        elif op == 2 and other:
+            cut = rng.randrange(len(steps) + 1)
+            steps = steps[:cut] + other[rng.randrange(len(other)):]
+        else:
+            del steps[rng.randrange(len(steps))]
+        return steps[:max_steps] or self.random_steps(rng, max_steps)
+
+    def run(self, steps: List[Step], seed: int):
+        """
+        Replay `steps` on a fresh player.
+        Returns (features, inputs, failure) where inputs are the main-menu lines that
+        reproduce the walk and failure is None or a short error string.
+        """
+        g = self.game
+        g.new_game()
+        # mini-games and combat roll from the game's session stream, not the global random
+        g.rng.reseed(seed)
+        self.rng.seed(seed)
+        features: Set[str] = set()
+        inputs: List[str] = []
+        failure: Optional[str] = None
+        with self.console.capture():
+            for sid, i in steps:
+                scene = g.scenes_index[sid]
+                choice = self._choices(scene)[i]
+                effects = choice.get('effects') or {}
+                features.add(f"choice:{sid}#{i}")
+                features.update(f"effect:{k}" for k in effects)
+                if effects.get('encounter_monster'):
+                    features.add(f"monster:{effects['encounter_monster']}")
+                del self._consumed[:]
+                try:
+                    g.apply_choice(scene, choice)
+                    check_invariants(g)
+                except Exception as e:
+                    failure = f"{type(e).__name__}: {e}"
+                    if not isinstance(e, WalkFailure):
+                        failure += "\n" + traceback.format_exc(limit=-3)
+                inputs.extend(["5", sid, str(i + 1)] + self._consumed + ["b"])
+                if failure:
+                    break
+        features.update(f"seed:{s.get('id')}" for s in g.player.inventory)
+        features.update(f"chronicle:{e.get('id')}" for e in g.player.chronicle.entries)
+        features.update(f"payoff:{p}" for p in g.player.flags.get('payoffs_triggered', []))
+        return features, inputs, failure
+
+
+def check_invariants(game):
+    """Cheap consistency checks after every step; raises WalkFailure."""
+    player = game.player
+    inv_ids = [s.get('id') for s in player.inventory]
+    if len(inv_ids) != len(set(inv_ids)):
+        raise WalkFailure(f"duplicate inventory ids: {inv_ids}")
+    chron_ids = [e.get('id') for e in player.chronicle.entries]
+    if len(chron_ids) != len(set(chron_ids)):
+        raise WalkFailure(f"duplicate chronicle ids: {chron_ids}")
+    payoffs = game.payoff_manager.payoffs if game.payoff_manager else {}
+    have = set(chron_ids)
+    for pid in player.flags.get('payoffs_triggered', []):
+        missing = set(payoffs.get(pid, {}).get('required_seeds', [])) - have
+        if missing:
+            raise WalkFailure(f"payoff {pid} triggered without {sorted(missing)}")
+
+
+def failure_key(failure: str) -> str:
+    """Group failures by their first line (exception type + message)."""
+    return failure.splitlines()[0]
+
+
+def minimize(walker: Walker, steps: List[Step], seed: int, key: str) -> List[Step]:
+    """Delta-debugging (ddmin) over walk steps, keeping the same failure key."""
+    def fails(candidate):
+        _, _, failure = walker.run(candidate, seed)
+        return failure is not None and failure_key(failure) == key
+
+    n = 2
+    while len(steps) >= 2:
+        chunk = max(1, len(steps) // n)
+        reduced = False
+        for start in range(0, len(steps), chunk):
+            complement = steps[:start] + steps[start + chunk:]
+            if complement and fails(complement):
+                steps = complement
+                n = max(n - 1, 2)
+                reduced = True
+                break
+        if not reduced:
+            if chunk == 1:
+                break
+            n = min(len(steps), n * 2)
+    return steps
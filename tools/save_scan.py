@@ -0,0 +1,340 @@
+# tools/save_scan.py
+"""
+Parallel, resumable analytics over a tree of save files.
+
+Walks one or more folders for saves in either layout (Game.save_game player
+dicts and SaveManager protected_payload files) and either codec (.json /
+binary .sav), decodes them on a process pool and folds every save into one
+set of aggregates: seed pickup rates, Chronicle and inventory sizes, payoff
+trigger rates, per-NPC affinity distributions and relationship flags.
+
+Memory stays flat however many files there are: the tree is walked lazily
+(os.scandir, one folder listing at a time), files go out in rounds of
+batches, and workers return only merged counters. After each round the
+aggregates and the last finished path are checkpointed atomically; rerunning
+the same command resumes after that path (the walk order is sorted, so whole
+finished folders are skipped without listing them).
+
+    python tools/save_scan.py /srv/saves --report scan.json
+    python tools/save_scan.py /srv/saves --checkpoint scan.ckpt --workers 16   # Ctrl-C, rerun to resume
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import pathlib
+import multiprocessing
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+HERE = pathlib.Path(__file__).resolve().parent
+REPO_ROOT = HERE.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.content import load_content
+from src.fileio import atomic_write
+from src.relationship import NPC_FLAGS_FLAG
+from src.save_codec import EXTENSIONS, decode_save, detect
+from src.save_manager import player_state_from_save
+from src.seed import shared_seed_table
+
+CHECKPOINT_VERSION = 1
+
+
+class ScanStats:
+    """Mergeable aggregates; everything is a Counter keyed by content ids or small ints."""
+    HISTOGRAMS = ("chronicle_sizes", "inventory_sizes")
+
+    def __init__(self):
+        self.files = 0
+        self.saves = 0
+        self.skipped = Counter()           # reason -> files
+        self.formats = Counter()           # "json/game", "binary/signed", ...
+        self.chronicle_sizes = Counter()   # entries -> saves
+        self.inventory_sizes = Counter()
+        self.seeds = Counter()             # seed id -> saves that picked it up (inventory or Chronicle)
+        self.payoffs = Counter()           # payoff id -> saves that triggered it
+        self.affinities: Dict[str, Counter] = {}   # npc -> {affinity: saves}
+        self.npc_flags = Counter()         # "npc:flag" -> saves with the flag set
+        self.samples: List[str] = []       # a few skipped paths with their errors
+
+    def add(self, state: Dict, kind: str):
+        self.saves += 1
+        self.formats[kind] += 1
+        chron = [e.get("id") if isinstance(e, dict) else e for e in state.get("chronicle", [])]
+        inv = [e.get("id") if isinstance(e, dict) else e for e in state.get("inventory", [])]
+        self.chronicle_sizes[len(chron)] += 1
+        self.inventory_sizes[len(inv)] += 1
+        self.seeds.update({s for s in chron + inv if s})
+        flags = state.get("flags") or {}
+        self.payoffs.update(set(flags.get("payoffs_triggered", [])))
+        for npc, value in (state.get("relationships") or {}).items():
+            if isinstance(value, (int, float)):
+                self.affinities.setdefault(npc, Counter())[int(value)] += 1
+        for npc, npc_flags in (flags.get(NPC_FLAGS_FLAG) or {}).items():
+            self.npc_flags.update(f"{npc}:{f}" for f, on in npc_flags.items() if on)
+
+    def skip(self, path: str, error: Exception):
+        self.skipped[type(error).__name__] += 1
+        if len(self.samples) < 20:
+            self.samples.append(f"{path}: {error}")
+
+    def merge(self, other: "ScanStats"):
+        self.files += other.files
+        self.saves += other.saves
+        for name in ("skipped", "formats", "chronicle_sizes", "inventory_sizes", "seeds", "payoffs", "npc_flags"):
+            getattr(self, name).update(getattr(other, name))
+        for npc, hist in other.affinities.items():
+            self.affinities.setdefault(npc, Counter()).update(hist)
+        self.samples.extend(other.samples[:max(0, 20 - len(self.samples))])
+
+    def to_dict(self) -> Dict:
+        return {"files": self.files, "saves": self.saves, "skipped": dict(self.skipped),
+                "formats": dict(self.formats), "chronicle_sizes": dict(self.chronicle_sizes),
+                "inventory_sizes": dict(self.inventory_sizes), "seeds": dict(self.seeds),
+                "payoffs": dict(self.payoffs), "npc_flags": dict(self.npc_flags),
+                "affinities": {npc: dict(h) for npc, h in self.affinities.items()}, "samples": self.samples}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScanStats":
+        stats = cls()
+        stats.files, stats.saves = data["files"], data["saves"]
+        for name in ("skipped", "formats", "seeds", "payoffs", "npc_flags"):
+            setattr(stats, name, Counter(data[name]))
+        # JSON turned the int keys into strings
+        for name in cls.HISTOGRAMS:
+            setattr(stats, name, Counter({int(k): v for k, v in data[name].items()}))
+        stats.affinities = {npc: Counter({int(k): v for k, v in h.items()}) for npc, h in data["affinities"].items()}
+        stats.samples = list(data.get("samples", []))
+        return stats
+
+
+def _dist(hist: Dict[int, int]) -> Dict:
+    """mean / percentiles / min / max of a {value: count} histogram."""
+    total = sum(hist.values())
+    if not total:
+        return {"n": 0}
+    values = sorted(hist)
+    out = {"n": total, "mean": sum(v * c for v, c in hist.items()) / total, "min": values[0], "max": values[-1]}
+    marks = [("p50", 0.5), ("p90", 0.9), ("p99", 0.99)]
+    seen = 0
+    for v in values:
+        seen += hist[v]
+        while marks and seen >= marks[0][1] * total:
+            out[marks.pop(0)[0]] = v
+    return out
+
+
+# -------------------- walking --------------------
+def walk_saves(roots: List[str], after: Optional[Tuple] = None) -> Iterator[Tuple[Tuple, str]]:
+    """
+    Yield (key, path) for every save file under `roots` in key order, where key is
+    (root index, *path parts). Only keys greater than `after` are yielded; folders
+    entirely before it are not listed at all.
+    """
+    def visit(folder: str, prefix: Tuple) -> Iterator[Tuple[Tuple, str]]:
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"[SaveScan] Cannot list {folder}: {e}", file=sys.stderr)
+            return
+        for entry in entries:
+            key = prefix + (entry.name,)
+            if entry.is_dir(follow_symlinks=False):
+                if after is None or key >= after[:len(key)]:
+                    yield from visit(entry.path, key)
+            elif entry.name.endswith(EXTENSIONS) and (after is None or key > after):
+                yield key, entry.path
+
+    for i, root in enumerate(roots):
+        if after is None or (i,) >= after[:1]:
+            yield from visit(root, (i,))
+
+
+# -------------------- workers --------------------
+_seeds_index = None
+
+
+def _init_worker(data_dir):
+    global _seeds_index
+    # Ctrl-C is handled by the parent, which checkpoints and stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _seeds_index = shared_seed_table(load_content(data_dir))
+
+
+def _scan_batch(paths: List[str]) -> ScanStats:
+    stats = ScanStats()
+    for path in paths:
+        stats.files += 1
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            doc = decode_save(data, _seeds_index)
+            if not isinstance(doc, dict):
+                raise ValueError("not a save document")
+            kind = f"{detect(data)}/{'signed' if 'protected_payload' in doc else 'game'}"
+            stats.add(player_state_from_save(doc), kind)
+        except Exception as e:
+            stats.skip(path, e)
+    return stats
+
+
+# -------------------- driver --------------------
+def _load_checkpoint(path: str, roots: List[str]) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            ckpt = json.load(f)
+    except FileNotFoundError:
+        return None
+    if ckpt.get("version") != CHECKPOINT_VERSION or ckpt.get("roots") != roots:
+        raise SystemExit(f"[SaveScan] {path} is a checkpoint for {ckpt.get('roots')}; use --restart to discard it")
+    return ckpt
+
+
+def _write_checkpoint(path: str, roots: List[str], last: Optional[Tuple], stats: ScanStats,
+                      elapsed: float, complete: bool):
+    atomic_write(path, json.dumps({"version": CHECKPOINT_VERSION, "roots": roots,
+                                   "last": list(last) if last else None, "complete": complete,
+                                   "elapsed": elapsed, "stats": stats.to_dict()}))
+
+
+def scan(roots: List[str], data_dir: str, workers: Optional[int] = None, batch: int = 500,
+         checkpoint: Optional[str] = None, restart: bool = False, checkpoint_every: float = 10.0) -> Dict:
+    """Scan (or resume scanning) `roots`; returns the aggregate report."""
+    roots = [os.path.abspath(r) for r in roots]
+    workers = workers or os.cpu_count() or 1
+    stats, last, elapsed, complete = ScanStats(), None, 0.0, False
+    ckpt = None if restart or not checkpoint else _load_checkpoint(checkpoint, roots)
+    if ckpt:
+        stats = ScanStats.from_dict(ckpt["stats"])
+        last = tuple(ckpt["last"]) if ckpt["last"] else None
+        elapsed, complete = ckpt["elapsed"], ckpt["complete"]
+        print(f"[SaveScan] Resuming after {stats.files} file(s)" if not complete
+              else "[SaveScan] Checkpoint is complete; reporting it (--restart to rescan)")
+
+    started = time.perf_counter()
+    saved_at = started
+    interrupted = False
+    if not complete:
+        walker = walk_saves(roots, last)
+        # a round keeps every worker busy while bounding how many paths are in flight
+        round_batches = workers * 4
+        ctx = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+        with ctx.Pool(workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+            try:
+                while True:
+                    jobs, round_last = [], None
+                    for _ in range(round_batches):
+                        paths = []
+                        for key, path in walker:
+                            paths.append(path)
+                            round_last = key
+                            if len(paths) >= batch:
+                                break
+                        if not paths:
+                            break
+                        jobs.append(paths)
+                    if not jobs:
+                        complete = True
+                        break
+                    done = ScanStats()
+                    for res in pool.imap_unordered(_scan_batch, jobs):
+                        done.merge(res)
+                    # only whole rounds count, so the checkpoint never covers a path twice or skips one
+                    stats.merge(done)
+                    last = round_last
+                    now = time.perf_counter()
+                    if checkpoint and now - saved_at >= checkpoint_every:
+                        _write_checkpoint(checkpoint, roots, last, stats, elapsed + now - started, False)
+                        saved_at = now
+                    print(f"[SaveScan] {stats.files} file(s), {stats.files / max(now - started, 1e-9):.0f}/s "
+                          f"this run", file=sys.stderr)
+            except KeyboardInterrupt:
+                interrupted = True
+                pool.terminate()
+        elapsed += time.perf_counter() - started
+        if checkpoint:
+            _write_checkpoint(checkpoint, roots, last, stats, elapsed, complete)
+        if interrupted:
+            print(f"[SaveScan] Interrupted; rerun to resume from {checkpoint}" if checkpoint
+                  else "[SaveScan] Interrupted (no --checkpoint, progress lost)", file=sys.stderr)
+    return build_report(stats, load_content(data_dir), roots, elapsed, complete)
+
+
+def build_report(stats: ScanStats, content: Dict, roots: List[str], elapsed: float, complete: bool) -> Dict:
+    n = stats.saves or 1
+    seed_ids = [s.get("id") for s in content["files"].get("seeds.json") or [] if isinstance(s, dict)]
+    payoff_ids = list(content["files"].get("payoffs.json") or {})
+    known = set(seed_ids)
+    return {
+        "roots": roots, "complete": complete, "seconds": round(elapsed, 3),
+        "files": stats.files, "saves": stats.saves, "skipped": dict(stats.skipped),
+        "skipped_samples": stats.samples, "formats": dict(stats.formats),
+        "chronicle_size": _dist(stats.chronicle_sizes),
+        "inventory_size": _dist(stats.inventory_sizes),
+        "seed_pickup_rates": {s: stats.seeds[s] / n for s in seed_ids},
+        "unknown_ids": {s: c for s, c in stats.seeds.most_common() if s not in known},
+        "payoff_trigger_rates": {p: stats.payoffs[p] / n for p in
+                                 payoff_ids + sorted(set(stats.payoffs) - set(payoff_ids))},
+        "relationships": {npc: dict(_dist(h), **{"values": {str(k): v for k, v in sorted(h.items())}})
+                          for npc, h in sorted(stats.affinities.items())},
+        "npc_flag_rates": {k: v / n for k, v in sorted(stats.npc_flags.items())},
+    }
+
+
+def print_report(report: Dict, top: int = 10):
+    print(f"== Save scan: {report['saves']} save(s) in {report['files']} file(s), "
+          f"{sum(report['skipped'].values())} skipped, {report['seconds']}s"
+          f"{'' if report['complete'] else ' (incomplete)'} ==")
+    if report["formats"]:
+        print("  formats:   " + ", ".join(f"{k} {v}" for k, v in sorted(report["formats"].items())))
+    for reason, count in sorted(report["skipped"].items()):
+        print(f"  skipped {reason}: {count}")
+    for name in ("chronicle_size", "inventory_size"):
+        d = report[name]
+        if d.get("n"):
+            print(f"  {name:<15} mean {d['mean']:.1f}  p50 {d['p50']}  p90 {d['p90']}  p99 {d['p99']}  max {d['max']}")
+    seeds = sorted(report["seed_pickup_rates"].items(), key=lambda kv: (-kv[1], kv[0]))
+    if seeds:
+        print("  most picked seeds:  " + ", ".join(f"{s} {r:.1%}" for s, r in seeds[:top]))
+        print("  least picked seeds: " + ", ".join(f"{s} {r:.1%}" for s, r in seeds[::-1][:top]))
+    for pid, rate in sorted(report["payoff_trigger_rates"].items(), key=lambda kv: (-kv[1], kv[0]))[:top]:
+        print(f"  payoff {pid:<20} {rate:7.2%}")
+    for npc, d in report["relationships"].items():
+        print(f"  {npc:<12} affinity mean {d['mean']:+.2f}  p50 {d['p50']:+d}  min {d['min']:+d}  max {d['max']:+d}"
+              f"  ({d['n']} save(s))")
+    for key, rate in report["npc_flag_rates"].items():
+        print(f"  flag {key:<22} {rate:7.2%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate statistics over a tree of save files.")
+    parser.add_argument("roots", nargs="+", help="folders to scan recursively")
+    parser.add_argument("--data", default=str(REPO_ROOT / "data"), help="content folder (seeds for .sav files)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--batch", type=int, default=500, help="files per worker batch")
+    parser.add_argument("--checkpoint", help="progress file; an existing one is resumed")
+    parser.add_argument("--checkpoint-every", type=float, default=10.0, help="seconds between checkpoint writes")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--top", type=int, default=10, help="entries listed per summary line")
+    parser.add_argument("--report", help="write the full JSON report here")
+    args = parser.parse_args(argv)
+
+    missing = [r for r in args.roots if not os.path.isdir(r)]
+    if missing:
+        parser.error(f"not a folder: {', '.join(missing)}")
+    report = scan(args.roots, args.data, workers=args.workers, batch=max(1, args.batch),
+                  checkpoint=args.checkpoint, restart=args.restart, checkpoint_every=args.checkpoint_every)
+    print_report(report, args.top)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if report["complete"] else 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())